@@ -0,0 +1,695 @@
+import asyncio
+import datetime
+import glob
+import importlib.util
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+import xml.etree.ElementTree as ET
+import numpy as np
+import pandas as pd
+
+try:
+    import openpyxl  # Load-time proxy for Excel in the format benchmark
+except ImportError:
+    openpyxl = None
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+HERE = os.path.dirname(os.path.abspath(__file__))
+DB_WRITER_SIZES = [10_000, 100_000, 500_000]
+DECK_SIZES = [10, 100, 500]
+HTTP_REQUESTS = 3000
+HTTP_CONCURRENCY = 16
+
+def load_script(name, file_name):
+    """Imports a repo script by path (hyphenated file names, so not a plain import)"""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, file_name))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def load_v4():
+    return load_script('dashboard_v4', 'dashboard-3.py')
+
+# ==========================================
+# 1. SYNTHETIC TABLES
+# ==========================================
+def make_allocations(n, seed=0):
+    """DB_Allocations-shaped frame with n rows (dates as datetime.date, like create_database_v4)"""
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp.today().normalize()
+    start = today + pd.to_timedelta(rng.integers(-10, 90, n), unit='D')
+    end = start + pd.to_timedelta(rng.integers(30, 180, n), unit='D')
+    return pd.DataFrame({
+        'Project_ID': [f'P{i:05d}' for i in rng.integers(0, max(n // 3, 1), n)],
+        'Resource_ID': [f'R{i:04d}' for i in rng.integers(0, max(n // 10, 1), n)],
+        'Allocation_%': rng.choice([0.5, 1.0], n),
+        'Start_Date': start.date,
+        'End_Date': end.date
+    })
+
+SKILL_NAMES = ['Java Fullstack', 'Python/AI', 'SAP ABAP', 'Data Engineering', 'Cloud/DevOps']
+PORTFOLIOS = ['Digital Transformation', 'Legacy Modernization', 'Data & AI', 'Cloud Infra']
+TEAMS = ['Squad Alpha', 'Squad Beta', 'Squad Gamma', 'Core Ops']
+
+def make_database(n_projects, n_resources=None, allocs_per_project=2.5, n_pipeline=None, seed=0):
+    """Seeded v4 tables at any size, same columns / vocabularies as create_database_v4.
+    Defaults keep the mock's proportions: 0.4 resources, 2.5 allocations and 1.2 pipeline
+    rows per project. Dates are datetime64 (like load_database_v4)."""
+    rng = np.random.default_rng(seed)
+    n_resources = n_resources or max(int(n_projects * 0.4), 1)
+    n_pipeline = int(n_projects * 1.2) if n_pipeline is None else n_pipeline
+    n_alloc = int(n_projects * allocs_per_project)
+    today = pd.Timestamp.today().normalize()
+    quarters = [f"Q{q}-{y}" for y in range(2026, 2034) for q in range(1, 5)]
+    skill_ids = np.array([f'S{i + 1:02d}' for i in range(len(SKILL_NAMES))], dtype=object)
+    days = lambda lo, hi, n: pd.to_timedelta(rng.integers(lo, hi, n), unit='D')
+    pick = lambda values, n: np.asarray(values, dtype=object)[rng.integers(0, len(values), n)]
+
+    pids = np.array([f'P{i:06d}' for i in range(1, n_projects + 1)], dtype=object)
+    rids = np.array([f'R{i:06d}' for i in range(n_resources)], dtype=object)
+    kickoff = today + days(-60, 30, n_projects)
+    df_projects = pd.DataFrame({
+        'Project_ID': pids, 'Project_Name': [f'Project {i}' for i in range(1, n_projects + 1)],
+        'Portfolio': pick(PORTFOLIOS, n_projects), 'Team': pick(TEAMS, n_projects), 'Goal': pick(quarters, n_projects),
+        'Lead': pick(['Suresh', 'Brandi', 'Abhi', 'Stanley'], n_projects), 'PM': pick(['Kalpesh', 'Rail'], n_projects),
+        'Kickoff': kickoff, 'End_Date': kickoff + days(90, 360, n_projects)
+    })
+    df_resources = pd.DataFrame({
+        'Resource_ID': rids, 'Full_Name': [f'Resource {i}' for i in range(n_resources)],
+        'Skill_ID': pick(skill_ids, n_resources), 'Skill_Level': pick(['Junior', 'Standard', 'Senior'], n_resources),
+        'Years_Exp': rng.integers(2, 16, n_resources), 'Manager': pick(['Director A', 'Director B'], n_resources)
+    })
+    a_start = today + days(-30, 60, n_alloc)
+    df_allocations = pd.DataFrame({
+        'Project_ID': pids[rng.integers(0, n_projects, n_alloc)], 'Resource_ID': rids[rng.integers(0, n_resources, n_alloc)],
+        'Allocation_%': rng.choice([0.5, 1.0], n_alloc), 'Start_Date': a_start, 'End_Date': a_start + days(30, 180, n_alloc)
+    })
+    p_month = (rng.integers(2026, 2028, n_pipeline) - 1970) * 12 + rng.integers(0, 12, n_pipeline)
+    p_start, p_end = (pd.to_datetime(m.astype('datetime64[M]')) for m in (p_month, p_month + rng.integers(3, 10, n_pipeline)))
+    df_pipeline = pd.DataFrame({
+        'Pipeline_ID': [f'PIPE-{i:06d}' for i in range(1, n_pipeline + 1)],
+        'Project_ID': [f'NEW-PROJ-{i}' for i in range(1, n_pipeline + 1)],
+        'Portfolio': pick(PORTFOLIOS, n_pipeline), 'Team': pick(TEAMS, n_pipeline), 'Goal': pick(quarters, n_pipeline),
+        'Skill_ID': pick(skill_ids, n_pipeline), 'Skill_Level_Needed': pick(['Standard', 'Senior'], n_pipeline),
+        'Start_Date': p_start, 'End_Date': p_end,
+        'Solution_Architect': 'TBD', 'Product_Owner': 'TBD', 'LTIM_Lead': 'TBD'
+    })
+    df_skills = pd.DataFrame({'Skill_ID': skill_ids, 'Skill_Name': SKILL_NAMES, 'Levels': 'L1, L2, L3'})
+
+    delay = rng.choice([0, 0, 15], n_projects)
+    build = pd.Timestamp(2026, 4, 10)
+    df_milestones = pd.DataFrame({
+        'Project_ID': np.repeat(pids, 2), 'Milestone': np.tile(['Discovery', 'Build'], n_projects),
+        'Baseline_Date': np.ravel(np.column_stack([np.full(n_projects, pd.Timestamp(2026, 2, 15)), np.full(n_projects, build)])),
+        'Forecast_Date': np.ravel(np.column_stack([np.full(n_projects, pd.Timestamp(2026, 2, 15)),
+                                                   build + pd.to_timedelta(delay, unit='D')])),
+        'Progress_Pct': np.tile([1.0, 0.4], n_projects),
+        'Status': np.ravel(np.column_stack([np.full(n_projects, 'Completed', dtype=object),
+                                            np.where(delay > 0, 'Delayed', 'On Track')])),
+        'Comments': np.tile(['Done', 'In Progress'], n_projects), 'Risks_Issues': 'None'
+    })
+    rag = pick(['Red', 'Amber', 'Green'], n_projects)
+    df_updates = pd.DataFrame({
+        'Project_ID': pids, 'Week': 'Wk 05', 'RAG': rag, 'Goal': 'Finalize UAT',
+        'Narrative': np.where(rag == 'Red', 'Critical delay', 'Steady progress'), 'Tasks': '1. Task A\n2. Task B',
+        'Risks': np.where(rag == 'Green', 'None', 'Staffing')
+    })
+    df_sla = pd.DataFrame({'Project_ID': pids, 'Metric': 'Defect SLA', 'Status': 'Met'})
+    budget = rng.integers(50, 501, n_projects) * 1000
+    actuals = (budget * rng.uniform(0.1, 0.6, n_projects)).astype(np.int64)
+    df_financials = pd.DataFrame({
+        'Project_ID': pids, 'Total_Budget': budget, 'Actuals_To_Date': actuals, 'Forecast_To_Complete': budget - actuals,
+        'Budget_Status': pick(['Green', 'Green', 'Amber'], n_projects)
+    })
+    df_config = pd.DataFrame(quarters, columns=['Quarters'])
+    return (df_projects, df_resources, df_allocations, df_pipeline, df_skills, df_milestones, df_updates, df_sla,
+            df_financials, df_config)
+
+# ==========================================
+# 2. DB TAB WRITER: pandas path vs bulk path
+# ==========================================
+def _pandas_db_sheet(writer, df, name):
+    """The previous add_db_sheet: to_excel + table over the range"""
+    df.to_excel(writer, sheet_name=name, index=False)
+    ws = writer.sheets[name]
+    (max_row, max_col) = df.shape
+    ws.add_table(0, 0, max_row, max_col - 1, {'columns': [{'header': col} for col in df.columns]})
+
+def _time_db_write(v4, df, mode):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.xlsx')
+        options = {'constant_memory': True} if mode == 'bulk+constant_memory' else {}
+        t0 = time.perf_counter()
+        writer = pd.ExcelWriter(path, engine='xlsxwriter', engine_kwargs={'options': options})
+        if mode == 'pandas':
+            _pandas_db_sheet(writer, df, 'DB_Allocations')
+        else:
+            v4.write_db_sheet(writer.book, df, 'DB_Allocations', v4.db_sheet_formats(writer.book))
+        writer.close()
+        elapsed = time.perf_counter() - t0
+        size = os.path.getsize(path)
+    return elapsed, size
+
+def bench_db_writer(sizes=DB_WRITER_SIZES):
+    v4 = load_v4()
+    results = []
+    print(f"{'rows':>9} {'mode':<22} {'seconds':>9} {'rows/s':>10} {'MB':>7}")
+    for n in sizes:
+        df = make_allocations(n)
+        for mode in ['pandas', 'bulk', 'bulk+constant_memory']:
+            elapsed, size = _time_db_write(v4, df, mode)
+            results.append({'rows': n, 'mode': mode, 'seconds': elapsed, 'bytes': size})
+            print(f"{n:>9} {mode:<22} {elapsed:>9.2f} {n / elapsed:>10,.0f} {size / 1e6:>7.2f}")
+    return results
+
+# ==========================================
+# 3. PPTX DECKS: one file per slide vs build_deck
+# ==========================================
+def make_slide_specs(ppt, n):
+    """n variations of the Pillar 1 spec"""
+    return [dict(ppt.PILLAR1_SPEC, title=f"Pillar {i + 1}: Demand Forecasting",
+                 kicker=f"Slide {i + 1}: " + ppt.PILLAR1_SPEC["kicker"]) for i in range(n)]
+
+def bench_deck(sizes=DECK_SIZES):
+    ppt = load_script('squadppt_1', 'squadppt-1.py')
+    results = []
+    print(f"{'slides':>7} {'mode':<16} {'seconds':>9} {'slides/s':>9}")
+    for n in sizes:
+        specs = make_slide_specs(ppt, n)
+        with tempfile.TemporaryDirectory() as tmp:
+            # Previous flow: rerun the script per slide (fresh styles, one save each)
+            t0 = time.perf_counter()
+            for i, spec in enumerate(specs):
+                ppt.build_deck([spec], os.path.join(tmp, f'slide_{i}.pptx'))
+            per_slide = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            ppt.build_deck(specs, os.path.join(tmp, 'deck.pptx'))
+            deck = time.perf_counter() - t0
+        for mode, elapsed in [('per-slide', per_slide), ('build_deck', deck)]:
+            results.append({'slides': n, 'mode': mode, 'seconds': elapsed})
+            print(f"{n:>7} {mode:<16} {elapsed:>9.2f} {n / elapsed:>9.1f}")
+    return results
+
+# ==========================================
+# 4. HTTP SERVICE LOAD TEST (portfolio-server.py)
+# ==========================================
+HTTP_TARGETS = [
+    '/api/dashboard', '/api/dashboard?portfolio=Data%20%26%20AI', '/api/dashboard?team=Squad%20Alpha&skill=Python/AI',
+    '/api/heatmap', '/api/heatmap?skill=SAP%20ABAP', '/api/heatmap?portfolio=Cloud%20Infra',
+    '/api/demand', '/api/demand?team=Core%20Ops&from=2026-06&to=2026-12', '/api/demand?skill=Cloud/DevOps'
+]
+
+async def _http_client(port, targets, latencies, revalidate):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    etags = {}
+    for target in targets:
+        t0 = time.perf_counter()
+        extra = f"If-None-Match: {etags[target]}\r\n" if revalidate and target in etags else ''
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n{extra}\r\n".encode())
+        head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1')
+        headers = dict(line.split(': ', 1) for line in head.split('\r\n')[1:] if ': ' in line)
+        await reader.readexactly(int(headers['Content-Length']))
+        if 'ETag' in headers:
+            etags[target] = headers['ETag']
+        latencies.append((time.perf_counter() - t0, head.split(' ', 2)[1]))
+    writer.close()
+
+async def _http_load(server_mod, requests, concurrency, revalidate):
+    server, _ = await server_mod.start_service(port=0, watch=False)
+    port = server.sockets[0].getsockname()[1]
+    per_client = requests // concurrency
+    latencies = []
+    t0 = time.perf_counter()
+    await asyncio.gather(*[_http_client(port, [HTTP_TARGETS[(c + i) % len(HTTP_TARGETS)] for i in range(per_client)],
+                                        latencies, revalidate) for c in range(concurrency)])
+    elapsed = time.perf_counter() - t0
+    server.close()
+    await server.wait_closed()
+    return elapsed, latencies
+
+def bench_http(requests=HTTP_REQUESTS, concurrency=HTTP_CONCURRENCY):
+    """Requests/s over keep-alive connections, server and clients in one event loop (one core)"""
+    server_mod = load_script('portfolio_server', 'portfolio-server.py')
+    results = []
+    print(f"{'mode':<14} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'304s':>6}")
+    for mode, revalidate, cache_entries in [('uncached', False, 0), ('200 (cached)', False, server_mod.CACHE_MAX_ENTRIES),
+                                            ('ETag reval.', True, server_mod.CACHE_MAX_ENTRIES)]:
+        server_mod.CACHE_MAX_ENTRIES = cache_entries
+        elapsed, latencies = asyncio.run(_http_load(server_mod, requests, concurrency, revalidate))
+        lat = np.sort([l for l, _ in latencies]) * 1000
+        not_modified = sum(status == '304' for _, status in latencies)
+        results.append({'mode': mode, 'requests': len(latencies), 'seconds': elapsed,
+                        'p50_ms': float(np.percentile(lat, 50)), 'p99_ms': float(np.percentile(lat, 99))})
+        print(f"{mode:<14} {len(latencies):>9} {len(latencies) / elapsed:>9.0f} {results[-1]['p50_ms']:>8.2f} "
+              f"{results[-1]['p99_ms']:>8.2f} {not_modified:>6}")
+    return results
+
+# ==========================================
+# 5. COMPACT MODEL: memory and engine time vs the DataFrames
+# ==========================================
+MODEL_COPIES = [1, 40, 400]
+
+def scale_database(dfs, copies):
+    """The mock tables repeated `copies` times with suffixed IDs (DB_Skills / DB_Config shared)"""
+    df_p, df_r, df_a, df_pipe, df_s, df_m, df_u, df_sla, df_fin, df_config = dfs
+    def tile(df, ids):
+        parts = []
+        for k in range(copies):
+            part = df.copy()
+            for col in ids:
+                part[col] = part[col].astype(str) + f'-{k}'
+            parts.append(part)
+        return pd.concat(parts, ignore_index=True)
+    return (tile(df_p, ['Project_ID', 'Project_Name']), tile(df_r, ['Resource_ID', 'Full_Name']),
+            tile(df_a, ['Project_ID', 'Resource_ID']), tile(df_pipe, ['Pipeline_ID', 'Project_ID']), df_s,
+            tile(df_m, ['Project_ID']), tile(df_u, ['Project_ID']), tile(df_sla, ['Project_ID']),
+            tile(df_fin, ['Project_ID']), df_config)
+
+def _time(fn, *args):
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+def bench_model(copies=MODEL_COPIES):
+    v4 = load_v4()
+    base = v4.create_database_v4()
+    results = []
+    print(f"{'projects':>9} {'frames MB':>10} {'model MB':>9} {'build s':>8} {'frames s':>9} {'model s':>8}")
+    for k in copies:
+        dfs = scale_database(base, k)
+        t0 = time.perf_counter()
+        model = v4.build_model(dfs)
+        build = time.perf_counter() - t0
+        memory = v4.model_memory(model, dfs)
+        frames = _time(lambda: (v4.compile_dashboard_data(dfs), v4.generate_demand_plan(dfs[3], dfs[4]),
+                                v4.generate_heatmap_data(dfs[1], dfs[2], dfs[4])))
+        compact = _time(v4.compute_frames_from_model, model, False)
+        results.append({'projects': len(dfs[0]), 'frame_bytes': int(memory['frame_bytes'].sum()),
+                        'model_bytes': int(memory['model_bytes'].sum()), 'build_s': build,
+                        'frames_s': frames, 'model_s': compact})
+        r = results[-1]
+        print(f"{r['projects']:>9} {r['frame_bytes'] / 1e6:>10.2f} {r['model_bytes'] / 1e6:>9.2f} {build:>8.3f} "
+              f"{frames:>9.3f} {compact:>8.3f}")
+    return results
+
+# ==========================================
+# 6. CAPACITY QUERIES: month-bucket index vs heatmap rebuild, skill-gap engine, optimizer
+# ==========================================
+QUERY_COPIES = [40, 400, 2000]
+
+def bench_capacity(copies=QUERY_COPIES, repeats=20):
+    v4 = load_v4()
+    planner = load_script('capacity_planner', 'capacity-planner.py')
+    base = v4.create_database_v4()
+    period = (datetime.date.today() + datetime.timedelta(days=62)).strftime('%Y-%m')
+    results = []
+    print(f"{'allocs':>8} {'resources':>9} {'index s':>8} {'heatmap ms':>11} {'free ms':>8} {'point ms':>9} "
+          f"{'1 res ms':>9} {'gaps s':>7} {'assign s':>9}")
+    for k in copies:
+        dfs = scale_database(base, k)
+        model = v4.build_model(dfs)
+        t0 = time.perf_counter()
+        ix = planner.allocation_index(model)
+        build = time.perf_counter() - t0
+        heat = _time(v4.generate_heatmap_data, dfs[1], dfs[2], dfs[4]) * 1000
+        free = _time(lambda: [planner.free_resources(model, ix, period, ['Python/AI'], ['Senior'])
+                              for _ in range(repeats)]) * 1000 / repeats
+        point = _time(lambda: [planner.active_rows(ix, period) for _ in range(repeats)]) * 1000 / repeats
+        one = _time(lambda: [planner.resource_load(model, ix, period, ['R000-0']) for _ in range(repeats)]) * 1000 / repeats
+        gaps = _time(lambda: planner.skill_gap_table(planner.skill_gap_monthly(model, ix)))
+        assign = _time(planner.propose_allocations, model, ix)
+        results.append({'allocations': len(dfs[2]), 'resources': len(dfs[1]), 'index_s': build, 'heatmap_ms': heat,
+                        'free_ms': free, 'point_ms': point, 'resource_ms': one, 'gaps_s': gaps,
+                        'assign_s': assign})
+        print(f"{len(dfs[2]):>8} {len(dfs[1]):>9} {build:>8.3f} {heat:>11.1f} {free:>8.2f} {point:>9.3f} {one:>9.3f} "
+              f"{gaps:>7.3f} {assign:>9.3f}")
+    return results
+
+# ==========================================
+# 7. ENGINE SUITE: every stage at growing sizes, results saved as JSON
+# ==========================================
+SUITE_SCALES = [100, 1_000, 10_000]   # Projects; resources / allocations / pipeline follow make_database
+BENCH_DIR = 'bench_results'
+SUITE_REPEATS = 3                     # timed calls per stage (at least); the best one is kept ...
+SUITE_MIN_TIME_S = 0.5                # ... and cheap stages repeat until they have run this long
+REGRESSION_RATIO = 1.25               # compare flags stages this much slower than the baseline ...
+REGRESSION_FLOOR_S = 0.010            # ... and at least this many seconds slower (timer noise below)
+
+def suite_stages(v4, dfs, tmp):
+    """(stage, rows in, callable) for one data set, in pipeline order"""
+    df_p, df_r, df_a, df_pipe, df_s = dfs[:5]
+    model = {}
+    return [
+        ('demand_plan', len(df_pipe), lambda: v4.generate_demand_plan(df_pipe, df_s)),
+        ('heatmap', len(df_a), lambda: v4.generate_heatmap_data(df_r, df_a, df_s, v4.HEATMAP_PRORATE)),
+        ('dashboard', len(df_p), lambda: v4.compile_dashboard_data(dfs)),
+        ('model_build', sum(len(df) for df in dfs), lambda: model.update(v4.build_model(dfs))),
+        ('model_engines', len(df_p), lambda: v4.compute_frames_from_model(model)),
+        ('workbook', sum(len(df) for df in dfs),
+         lambda: v4.create_workbook_v4(dfs=dfs, output_file=os.path.join(tmp, 'suite.xlsx'))),
+        ('workbook_stream', sum(len(df) for df in dfs),
+         lambda: v4.create_workbook_v4(dfs=dfs, streaming=True, output_file=os.path.join(tmp, 'suite_stream.xlsx')))
+    ]
+
+def _measure(fn, memory=True, repeats=SUITE_REPEATS, min_time=SUITE_MIN_TIME_S):
+    """Best wall s and CPU s of at least `repeats` calls (more until `min_time` s are spent), and
+    (with memory=True) tracemalloc peak MB of one more, traced call"""
+    wall = cpu = float('inf')
+    n, start = 0, time.perf_counter()
+    while n < repeats or time.perf_counter() - start < min_time:
+        t0, c0 = time.perf_counter(), time.process_time()
+        fn()
+        wall, cpu = min(wall, time.perf_counter() - t0), min(cpu, time.process_time() - c0)
+        n += 1
+    peak = None
+    if memory:
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return wall, cpu, peak
+
+def _run_meta():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {'timestamp': datetime.datetime.now().isoformat(timespec='seconds'), 'commit': commit,
+            'python': platform.python_version(), 'pandas': pd.__version__, 'numpy': np.__version__,
+            'machine': platform.machine(), 'cpus': os.cpu_count()}
+
+def bench_suite(scales=SUITE_SCALES, memory=True, out_dir=BENCH_DIR, seed=0, repeats=SUITE_REPEATS):
+    """Times (best of `repeats`) and memory-profiles every stage per scale; writes one JSON file per run"""
+    v4 = load_v4()
+    with tempfile.TemporaryDirectory() as tmp:  # warm-up, so first-call costs do not land on the smallest scale
+        for _, _, fn in suite_stages(v4, make_database(10, seed=seed), tmp):
+            fn()
+    results = []
+    print(f"{'projects':>9} {'stage':<16} {'rows':>9} {'wall s':>8} {'cpu s':>8} {'peak MB':>8}")
+    for n in scales:
+        t0 = time.perf_counter()
+        dfs = make_database(n, seed=seed)
+        results.append({'projects': n, 'stage': 'generate', 'rows': sum(len(df) for df in dfs),
+                        'wall_s': time.perf_counter() - t0, 'cpu_s': None, 'peak_mb': None})
+        with tempfile.TemporaryDirectory() as tmp:
+            stages = suite_stages(v4, dfs, tmp)
+            for stage, rows, fn in stages:
+                wall, cpu, peak = _measure(fn, memory, repeats)
+                results.append({'projects': n, 'stage': stage, 'rows': rows, 'wall_s': wall, 'cpu_s': cpu, 'peak_mb': peak})
+        for r in results[-len(stages) - 1:]:
+            fmt = lambda v, f: format(v, f) if v is not None else '-'
+            print(f"{r['projects']:>9} {r['stage']:<16} {r['rows']:>9} {r['wall_s']:>8.3f} {fmt(r['cpu_s'], '>8.3f'):>8} "
+                  f"{fmt(r['peak_mb'], '>8.1f'):>8}")
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"suite-{datetime.datetime.now():%Y%m%d-%H%M%S-%f}.json")  # µs: runs in one second don't collide
+    with open(path, 'w') as f:
+        json.dump({'meta': dict(_run_meta(), seed=seed, scales=list(scales), repeats=repeats), 'results': results},
+                  f, indent=1)
+    print(f"💾 Saved {path}")
+    return results
+
+def compare_runs(old=None, new=None, out_dir=BENCH_DIR, ratio=REGRESSION_RATIO, floor_s=REGRESSION_FLOOR_S):
+    """Wall time of new vs old per (projects, stage); defaults to the last two runs in out_dir.
+    A stage is flagged only when it moved by more than `ratio` and by more than `floor_s` seconds."""
+    if old is None or new is None:
+        runs = sorted(glob.glob(os.path.join(out_dir, 'suite-*.json')))
+        if len(runs) < 2:
+            raise SystemExit(f"need two runs in {out_dir} to compare (found {len(runs)})")
+        old, new = runs[-2], runs[-1]
+    frames = []
+    for path in (old, new):
+        with open(path) as f:
+            frames.append(pd.DataFrame(json.load(f)['results']).set_index(['projects', 'stage'])['wall_s'])
+    table = pd.concat(frames, axis=1, keys=['old_s', 'new_s']).dropna()
+    table['ratio'] = table['new_s'] / table['old_s']
+    moved = (table['new_s'] - table['old_s']).abs() > floor_s
+    table['flag'] = np.where(moved & (table['ratio'] > ratio), 'REGRESSION',
+                             np.where(moved & (table['ratio'] < 1 / ratio), 'faster', ''))
+    print(f"{os.path.basename(old)} -> {os.path.basename(new)}")
+    print(table.to_string(float_format=lambda v: f"{v:.3f}"))
+    return table
+
+# ==========================================
+# 8. CELL FORMATS: per-cell RAG formats vs range-level conditional formats
+# ==========================================
+FORMAT_SIZE = (5_000, 2_000)   # Dashboard projects, heatmap resources
+REPORT_SHEETS = {'dashboard': '>> DASHBOARD <<', 'heatmap': '>> RES_HEATMAP <<'}
+XLSX_NS = {'m': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+           'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+           'rel': 'http://schemas.openxmlformats.org/package/2006/relationships'}
+
+def sheet_parts(z):
+    """{sheet name: zip path of its XML}, from xl/workbook.xml and its relationships"""
+    targets = {rel.get('Id'): rel.get('Target')
+               for rel in ET.fromstring(z.read('xl/_rels/workbook.xml.rels')).findall('rel:Relationship', XLSX_NS)}
+    parts = {}
+    for sheet in ET.fromstring(z.read('xl/workbook.xml')).findall('m:sheets/m:sheet', XLSX_NS):
+        target = targets[sheet.get(f"{{{XLSX_NS['r']}}}id")]
+        parts[sheet.get('name')] = target.lstrip('/') if target.startswith('/') else 'xl/' + target
+    return parts
+
+def workbook_style_stats(path):
+    """File size, styles table size and per-sheet XML / styled-cell / rule counts of an .xlsx"""
+    with zipfile.ZipFile(path) as z:
+        styles = z.read('xl/styles.xml').decode()
+        count = lambda tag: int((re.search(rf'<{tag} count="(\d+)"', styles) or [0, 0])[1])
+        stats = {'file_kb': os.path.getsize(path) / 1024, 'cell_xfs': count('cellXfs'), 'dxfs': count('dxfs'),
+                 'styles_kb': len(styles) / 1024}
+        parts = sheet_parts(z)
+        for sheet, name in REPORT_SHEETS.items():
+            xml = z.read(parts[name]).decode()
+            stats.update({f'{sheet}_kb': len(xml) / 1024, f'{sheet}_rules': xml.count('<cfRule')})
+    return stats
+
+def bench_formats(n_projects=FORMAT_SIZE[0], n_resources=FORMAT_SIZE[1]):
+    """create_workbook_v4 with and without range_formats: write time, file / styles size and openpyxl load time"""
+    v4 = load_v4()
+    dfs = make_database(n_projects, n_resources)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, options in [('per-cell', {}), ('range', {'range_formats': True})]:
+            path = os.path.join(tmp, f'{mode}.xlsx')
+            v4.start_profiling(memory=False)
+            t0 = time.perf_counter()
+            v4.create_workbook_v4(dfs=dfs, output_file=path, **options)
+            row = {'mode': mode, 'write_s': time.perf_counter() - t0}
+            row.update((f"{rec['stage'][6:].lower()}_s", rec['wall_s']) for rec in v4.finish_profiling(report=False)
+                       if rec['stage'] in ('sheet:DASHBOARD', 'sheet:RES_HEATMAP'))
+            row.update(workbook_style_stats(path))
+            if openpyxl is not None:
+                t0 = time.perf_counter()
+                openpyxl.load_workbook(path).close()
+                row['load_s'] = time.perf_counter() - t0
+            results.append(row)
+    table = pd.DataFrame(results).set_index('mode')
+    print(f"\n{n_projects:,} projects, {n_resources:,} resources (load_s = openpyxl full load, a stand-in for Excel open time)")
+    print(table.T.to_string(float_format=lambda v: f"{v:,.2f}"))
+    return results
+
+# ==========================================
+# 9. HEADLESS REFRESH of an existing workbook
+# ==========================================
+REFRESH_SCALES = [1_000, 5_000]
+
+def add_unreported_project(dfs):
+    """The edit --refresh exists for: a new DB_Projects row with no DB_Updates / DB_Financials row yet"""
+    df_p = dfs[0]
+    row = df_p.iloc[[0]].assign(Project_ID='P_NEW', Project_Name='New project (no update yet)')
+    return (pd.concat([df_p, row], ignore_index=True), *dfs[1:])
+
+def bench_refresh(scales=REFRESH_SCALES):
+    """Reading the DB tabs (pandas read_excel per tab vs one read-only pass) and the full refresh_workbook,
+    on a workbook with one project added by hand (no update row). The VBA macro needs Excel, so it is not timed here."""
+    v4 = load_v4()
+    if v4.openpyxl is None:
+        raise SystemExit("refresh benchmark needs openpyxl")
+    results = []
+    print(f"{'projects':>9} {'cells':>10} {'read_excel s':>13} {'read-only s':>12} {'refresh s':>10}")
+    for n in scales:
+        dfs = add_unreported_project(make_database(n))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'edited.xlsx')
+            v4.create_workbook_v4(dfs=dfs, output_file=path)
+            read_excel = _time(lambda: [v4._read_table(path, table, spec[0]) for table, spec in v4.DB_SCHEMA.items()])
+            read_only = _time(v4.read_workbook_tables, path)
+            refresh = _time(v4.refresh_workbook, path)
+        cells = sum(df.size for df in dfs)
+        results.append({'projects': n, 'cells': cells, 'read_excel_s': read_excel, 'read_only_s': read_only, 'refresh_s': refresh})
+        print(f"{n:>9} {cells:>10,} {read_excel:>13.2f} {read_only:>12.2f} {refresh:>10.2f}")
+    return results
+
+# ==========================================
+# 10. SNAPSHOT STORE: a year of weekly partitions, trend query latency
+# ==========================================
+SNAPSHOT_SCALES = [100, 1_000, 5_000]
+SNAPSHOT_WEEKS = 52
+
+def bench_snapshots(scales=SNAPSHOT_SCALES, weeks=SNAPSHOT_WEEKS, repeats=5):
+    """Writes `weeks` simulated snapshots per scale, then times each trend query (best of `repeats`)"""
+    store = load_script('snapshot_store', 'snapshot-store.py')
+    queries = [('rag', store.rag_transitions, {}), ('drift', store.milestone_drift, {}),
+               ('burn', store.budget_burn, {}), ('burn/Portfolio', store.budget_burn, {'by': 'Portfolio'}),
+               ('rag last 4', store.rag_transitions, {'last': 4})]
+    results = []
+    print(f"{'projects':>9} {'weeks':>6} {'store MB':>9} {'write s':>8} " + ' '.join(f"{name + ' ms':>17}" for name, _, _ in queries))
+    for n in scales:
+        with tempfile.TemporaryDirectory() as root:
+            t0 = time.perf_counter()
+            size = sum(store.write_snapshot(tables, week, root)[1] for week, tables in store.simulate_history(make_database(n), weeks))
+            row = {'projects': n, 'weeks': weeks, 'store_mb': size / 1e6, 'write_s': time.perf_counter() - t0}
+            for name, fn, kwargs in queries:
+                row[f'{name}_ms'] = min(_time(lambda: fn(root=root, **kwargs)) for _ in range(repeats)) * 1000
+        results.append(row)
+        print(f"{n:>9} {weeks:>6} {row['store_mb']:>9.1f} {row['write_s']:>8.1f} "
+              + ' '.join(f"{row[f'{name}_ms']:>17.1f}" for name, _, _ in queries))
+    return results
+
+# ==========================================
+# 11. CONSISTENCY CHECKS: engines agree on awkward data (python benchmark-v4.py check)
+# ==========================================
+CHECK_PROJECTS = 300
+
+def blank_dates(dfs, tables=(2, 3), every=7):
+    """Copy of the tables with every n-th Start_Date or End_Date left blank (default: allocations, pipeline)"""
+    dfs = list(dfs)
+    for i in tables:
+        df = dfs[i].copy()
+        df.loc[df.index[::every], 'Start_Date'] = pd.NaT
+        df.loc[df.index[3::every], 'End_Date'] = pd.NaT
+        dfs[i] = df
+    return tuple(dfs)
+
+def _same_frame(a, b):
+    return a.shape == b.shape and a.astype(str).to_numpy().tolist() == b.astype(str).to_numpy().tolist()
+
+def check_engines(n=CHECK_PROJECTS):
+    """DataFrame engines vs the compact model, with and without blank dates; v2 heatmap on blank dates"""
+    v4, v2 = load_v4(), load_script('dashboard_v2', 'dashboard-2.py')
+    results = []
+    for label, dfs in (('dates', make_database(n)), ('blank dates', blank_dates(make_database(n)))):
+        df_p, df_r, df_a, df_pipe, df_s = dfs[:5]
+        model = v4.compute_frames_from_model(v4.build_model(dfs))
+        frames = (v4.generate_demand_plan(df_pipe, df_s)[0], v4.generate_heatmap_data(df_r, df_a, df_s, v4.HEATMAP_PRORATE)[0])
+        results.append((f'engines / {label}: dashboard', _same_frame(v4.compile_dashboard_data(dfs)[0], model[0])))
+        results.append((f'engines / {label}: demand plan', _same_frame(frames[0], model[3])))
+        results.append((f'engines / {label}: heatmap', _same_frame(frames[1], model[4])))
+    v2_dfs = blank_dates(v2.create_enhanced_database(), tables=(2,), every=3)
+    for prorate in (False, True):
+        heat = v2.generate_heatmap_data(v2_dfs[1], v2_dfs[2], prorate=prorate)[0]
+        results.append((f'engines / blank dates: v2 heatmap (prorate={prorate})', not heat.empty))
+    return results
+
+def edit_database(dfs, seed=1):
+    """Copy of the tables with a week's worth of edits: allocations re-weighted, dropped and
+    added, a few RAGs changed, pipeline rows dropped"""
+    rng = np.random.default_rng(seed)
+    df_p, df_r, df_a, df_pipe = dfs[:4]
+    df_a = df_a.copy()
+    rows = rng.choice(len(df_a), max(len(df_a) // 20, 1), replace=False)
+    df_a.loc[df_a.index[rows], 'Allocation_%'] = rng.choice([0.1, 0.2, 0.3, 0.7], len(rows))
+    df_a = pd.concat([df_a.drop(df_a.index[:3]), df_a.iloc[-5:].assign(**{'Allocation_%': 0.15})], ignore_index=True)
+    df_u = dfs[6].copy()
+    df_u.loc[df_u.index[:5], 'RAG'] = 'Red'
+    return (df_p, df_r, df_a, df_pipe.iloc[7:]) + tuple(dfs[4:6]) + (df_u,) + tuple(dfs[7:])
+
+def check_incremental(n=CHECK_PROJECTS):
+    """update_frames_incremental after edits vs a full rebuild, exact (HEAT_OVER is a strict >)"""
+    v4 = load_v4()
+    results = []
+    for prorate in (False, True):
+        v4.HEATMAP_PRORATE = prorate
+        base = make_database(n)
+        with tempfile.TemporaryDirectory() as tmp:
+            state = os.path.join(tmp, 'state.pkl')
+            v4.update_frames_incremental(base, state)
+            dfs = base
+            for seed in (1, 2, 3):
+                dfs = edit_database(dfs, seed)
+                inc = v4.update_frames_incremental(dfs, state)
+        df_p, df_r, df_a, df_pipe, df_s = dfs[:5]
+        full = (v4.compile_dashboard_data(dfs)[0], v4.generate_demand_plan(df_pipe, df_s)[0],
+                v4.generate_heatmap_data(df_r, df_a, df_s, prorate)[0])
+        for name, a, b in zip(('dashboard', 'demand plan', 'heatmap'), (inc[0], inc[3], inc[4]), full):
+            results.append((f'incremental / prorate={prorate}: {name}', _same_frame(a, b)))
+        months = full[2].columns[3:]
+        results.append((f'incremental / prorate={prorate}: heatmap exact',
+                        np.array_equal(inc[4][months].to_numpy(float), full[2][months].to_numpy(float))))
+    return results
+
+def check_store(n=20):
+    """Trend queries on weeks with a blank RAG / Project_ID: no phantom transitions, drift or burn rows"""
+    store = load_script('snapshot_store', 'snapshot-store.py')
+    dfs = list(make_database(n))
+    df_m, df_u, df_fin = dfs[5], dfs[6], dfs[8]
+    flipped = df_u.copy()
+    flipped.loc[2, 'RAG'] = 'Green' if df_u['RAG'][2] == 'Red' else 'Red'  # the one real transition
+    blank_id = lambda df: df.assign(Project_ID=df['Project_ID'].where(df.index != 1))
+    weeks = [
+        ('2026-W02', df_m, df_u, df_fin),
+        ('2026-W03', df_m, blank_id(flipped.assign(RAG=flipped['RAG'].where(flipped.index != 0))), df_fin),
+        ('2026-W04', blank_id(df_m), flipped, blank_id(df_fin)),
+        ('2026-W05', df_m, flipped, df_fin)]
+    with tempfile.TemporaryDirectory() as root:
+        for week, m, u, fin in weeks:
+            dfs[5], dfs[6], dfs[8] = m, u, fin
+            store.write_snapshot(dfs, week, root)
+        moves = store.rag_transitions(root=root)
+        drift = store.milestone_drift(root=root)
+        burn = store.budget_burn(root=root)
+    return [('store / blank RAG: only the real transition',
+             moves[['Project_ID', 'Week_Key']].astype(str).values.tolist() == [[df_u['Project_ID'][2], '2026-W03']]),
+            ('store / blank Project_ID: milestone drift rows', len(drift) == len(df_m) and drift['Project_ID'].notna().all()),
+            ('store / blank Project_ID: budget burn', burn['Total_Budget'].tolist() == [df_fin['Total_Budget'].sum()])]
+
+CHECKS = [check_engines, check_incremental, check_store]
+
+def run_checks(checks=CHECKS):
+    """Runs every check, prints one line per case; exit status 1 if any failed"""
+    failed = 0
+    for check in checks:
+        for name, ok in check():
+            failed += not ok
+            print(f"{'✅' if ok else '❌'} {name}")
+    print(f"{'❌' if failed else '✅'} {failed} failed")
+    return failed
+
+if __name__ == "__main__":
+    # python benchmark-v4.py [rows ...]  |  deck [slides ...]  |  http [requests [concurrency]]  |  model [copies ...]
+    #                        capacity [copies ...]  |  suite [projects ...] [--no-memory]  |  compare [old.json new.json]
+    #                        formats [projects [resources]]  |  refresh [projects ...]  |  snapshots [projects ...]
+    #                        check
+    if sys.argv[1:2] == ['deck']:
+        bench_deck([int(a) for a in sys.argv[2:]] or DECK_SIZES)
+    elif sys.argv[1:2] == ['http']:
+        bench_http(*[int(a) for a in sys.argv[2:4]])
+    elif sys.argv[1:2] == ['model']:
+        bench_model([int(a) for a in sys.argv[2:]] or MODEL_COPIES)
+    elif sys.argv[1:2] == ['capacity']:
+        bench_capacity([int(a) for a in sys.argv[2:]] or QUERY_COPIES)
+    elif sys.argv[1:2] == ['suite']:
+        bench_suite([int(a) for a in sys.argv[2:] if a != '--no-memory'] or SUITE_SCALES, memory='--no-memory' not in sys.argv)
+    elif sys.argv[1:2] == ['compare']:
+        compare_runs(*sys.argv[2:4])
+    elif sys.argv[1:2] == ['formats']:
+        bench_formats(*[int(a) for a in sys.argv[2:4]])
+    elif sys.argv[1:2] == ['refresh']:
+        bench_refresh([int(a) for a in sys.argv[2:]] or REFRESH_SCALES)
+    elif sys.argv[1:2] == ['snapshots']:
+        bench_snapshots([int(a) for a in sys.argv[2:]] or SNAPSHOT_SCALES)
+    elif sys.argv[1:2] == ['check']:
+        sys.exit(1 if run_checks() else 0)
+    else:
+        sizes = [int(a) for a in sys.argv[1:]] or DB_WRITER_SIZES
+        bench_db_writer(sizes)
@@ -0,0 +1,427 @@
+import argparse
+import datetime
+import importlib.util
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+HERE = os.path.dirname(os.path.abspath(__file__))
+FULL_LOAD = 1.0   # Allocation_% that counts as fully booked in a month
+
+def load_v4():
+    """Imports dashboard-3.py (hyphenated file name, so not a plain import)"""
+    spec = importlib.util.spec_from_file_location('dashboard_v4', os.path.join(HERE, 'dashboard-3.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+v4 = load_v4()
+
+# ==========================================
+# 1. MONTHS & PERIODS
+# ==========================================
+# Months are plain integers (year * 12 + month - 1) so buckets are array positions
+def month_number(value):
+    """'2026-07', datetime.date or datetime64 -> month number"""
+    if isinstance(value, str):
+        year, month = map(int, value.split('-'))
+        return year * 12 + month - 1
+    if isinstance(value, (datetime.date, pd.Timestamp)):
+        return value.year * 12 + value.month - 1
+    return int(np.datetime64(value, 'M').astype(np.int64)) + 1970 * 12
+
+def month_start(number):
+    return datetime.date(number // 12, number % 12 + 1, 1)
+
+def month_label(number):
+    return f"{number // 12}-{number % 12 + 1:02d}"
+
+def parse_period(period):
+    """'Q3-2026', '2026-07' or '2026-07:2026-12' -> (first, last) month numbers, inclusive"""
+    quarter = re.fullmatch(r'Q([1-4])-(\d{4})', period.strip())
+    if quarter:
+        first = int(quarter.group(2)) * 12 + (int(quarter.group(1)) - 1) * 3
+        return first, first + 2
+    lo, _, hi = period.partition(':')
+    try:
+        first, last = month_number(lo.strip()), month_number((hi or lo).strip())
+    except ValueError:
+        raise ValueError(f"period must be Q<n>-YYYY, YYYY-MM or YYYY-MM:YYYY-MM, got {period!r}")
+    if last < first:
+        raise ValueError(f"period {period!r} ends before it starts")
+    return first, last
+
+# ==========================================
+# 2. MONTH-BUCKET INTERVAL INDEX
+# ==========================================
+# Every row is listed in each month it overlaps (same inclusive rule as the engines).
+# Entries are sorted by (month, key), so a bucket is a slice and one key inside it
+# is a binary search; prefix sums turn "total weight for key k in month m" into two lookups.
+def build_month_index(keys, starts, ends, weights=None):
+    """keys: int codes per row (resource or skill code), starts / ends: datetime64[D].
+    Rows with a blank date or an end before the start are left out."""
+    starts = np.asarray(starts, dtype='datetime64[D]')
+    ends = np.asarray(ends, dtype='datetime64[D]')
+    weights = np.ones(len(keys), dtype=np.float32) if weights is None else np.asarray(weights, dtype=np.float32)
+    lo = starts.astype('datetime64[M]').astype(np.int64) + 1970 * 12
+    hi = ends.astype('datetime64[M]').astype(np.int64) + 1970 * 12
+    valid = ~np.isnat(starts) & ~np.isnat(ends) & (lo <= hi)
+    rows = np.flatnonzero(valid)
+    lo, hi = lo[valid], hi[valid]
+    first = int(lo.min()) if len(rows) else 0
+    n_months = int(hi.max()) - first + 1 if len(rows) else 0
+
+    # Expand each row into one entry per month it covers
+    spans = hi - lo + 1
+    entry_row = np.repeat(rows, spans)
+    step = np.arange(len(entry_row)) - np.repeat(np.cumsum(spans) - spans, spans)
+    entry_month = np.repeat(lo, spans) + step
+
+    # Share of the month's days the row covers (for prorated utilization)
+    m_start = (entry_month - 1970 * 12).astype('datetime64[M]').astype('datetime64[D]')
+    m_stop = (entry_month - 1970 * 12 + 1).astype('datetime64[M]').astype('datetime64[D]')
+    days = np.minimum(ends[entry_row] + 1, m_stop) - np.maximum(starts[entry_row], m_start)
+    share = days.astype(np.int64) / (m_stop - m_start).astype(np.int64)
+
+    entry_key = np.asarray(keys)[entry_row]
+    order = np.lexsort((entry_key, entry_month))
+    entry_month, entry_row, entry_key, share = entry_month[order], entry_row[order], entry_key[order], share[order]
+    weight = weights[entry_row].astype(np.float64)
+    offsets = np.zeros(n_months + 1, dtype=np.int64)
+    np.cumsum(np.bincount(entry_month - first, minlength=n_months), out=offsets[1:])
+    return {
+        'first': first, 'n_months': n_months, 'offsets': offsets,
+        'row': entry_row.astype(np.int32), 'key': entry_key.astype(np.int32), 'share': share.astype(np.float32),
+        'weight_sum': np.concatenate([[0.0], np.cumsum(weight)]),
+        'prorated_sum': np.concatenate([[0.0], np.cumsum(weight * share)])
+    }
+
+def _bucket(ix, month):
+    """(start, stop) of month's entries ((0, 0) outside the indexed span)"""
+    b = month - ix['first']
+    if b < 0 or b >= ix['n_months']:
+        return 0, 0
+    return int(ix['offsets'][b]), int(ix['offsets'][b + 1])
+
+def active_rows(ix, month):
+    """Rows overlapping one month, in key order"""
+    a, b = _bucket(ix, month_number(month) if not isinstance(month, (int, np.integer)) else month)
+    return ix['row'][a:b]
+
+def rows_between(ix, first, last):
+    """Rows overlapping any month in [first, last], each once, in table order"""
+    parts = [ix['row'][slice(*_bucket(ix, m))] for m in range(first, last + 1)]
+    return np.unique(np.concatenate(parts)) if parts else np.array([], dtype=np.int32)
+
+def key_load(ix, keys, first, last, prorate=False):
+    """len(keys) x months matrix of summed weights: two binary searches per key and month"""
+    keys = np.asarray(keys)
+    sums = ix['prorated_sum'] if prorate else ix['weight_sum']
+    out = np.zeros((len(keys), last - first + 1))
+    for j, m in enumerate(range(first, last + 1)):
+        a, b = _bucket(ix, m)
+        if a == b:
+            continue
+        bucket = ix['key'][a:b]
+        lo = a + np.searchsorted(bucket, keys, 'left')
+        hi = a + np.searchsorted(bucket, keys, 'right')
+        out[:, j] = sums[hi] - sums[lo]
+    return out
+
+# ==========================================
+# 3. CAPACITY QUERIES ON THE COMPACT MODEL
+# ==========================================
+def allocation_index(model):
+    """Month index over DB_Allocations keyed on resource code, weighted by Allocation_%"""
+    alloc = model['tables']['DB_Allocations']
+    return build_month_index(model['index']['alloc_resource'], alloc['Start_Date'], alloc['End_Date'],
+                             alloc['Allocation_%'])
+
+def pipeline_index(model):
+    """Month index over DB_Pipeline keyed on skill code (one head per row)"""
+    pipe = model['tables']['DB_Pipeline']
+    return build_month_index(pipe['Skill_ID'], pipe['Start_Date'], pipe['End_Date'])
+
+def skill_codes(model, skills):
+    """Skill codes for Skill_IDs or Skill_Names (unknown skills raise)"""
+    skill_tab = model['tables']['DB_Skills']
+    by_name = dict(zip(np.asarray(skill_tab['Skill_Name'], dtype=object), skill_tab['Skill_ID']))
+    codes = [by_name.get(s, model['dims']['skill'].get_indexer([s])[0]) for s in skills]
+    unknown = [s for s, c in zip(skills, codes) if c < 0]
+    if unknown:
+        raise ValueError(f"unknown skill(s): {', '.join(unknown)}")
+    return np.array(codes, dtype=np.int32)
+
+def resource_load(model, ix, period, resources=None, prorate=None):
+    """Resource x month load for a period ('Q3-2026', '2026-07:2026-09', ...).
+    resources: Resource_IDs (default: all). Columns are 'YYYY-MM'."""
+    prorate = v4.HEATMAP_PRORATE if prorate is None else prorate
+    first, last = parse_period(period)
+    codes = np.arange(model['owned']['resource']) if resources is None else \
+        model['dims']['resource'].get_indexer(resources)
+    load = key_load(ix, codes, first, last, prorate)
+    ids = model['dims']['resource'].take(codes) if resources is None else pd.Index(resources)
+    return pd.DataFrame(load, columns=[month_label(m) for m in range(first, last + 1)], index=ids.rename('Resource_ID'))
+
+def free_resources(model, ix, period, skills=None, levels=None, min_free=0.0, prorate=None):
+    """Resources with spare capacity in every month of the period, most free first.
+    Free = FULL_LOAD - peak monthly load; rows need free > min_free."""
+    res = model['tables']['DB_Resources']
+    keep = res['Resource_ID'] >= 0
+    if skills:
+        keep &= np.isin(res['Skill_ID'], skill_codes(model, skills))
+    if levels:
+        keep &= np.isin(np.asarray(res['Skill_Level'], dtype=object), levels)
+    rows = np.flatnonzero(keep)
+    codes = res['Resource_ID'][rows]
+    prorate = v4.HEATMAP_PRORATE if prorate is None else prorate
+    peak = key_load(ix, codes, *parse_period(period), prorate).max(axis=1, initial=0.0)
+
+    skill_rows = v4._follow(model['index']['skill_row'], res['Skill_ID'][rows])
+    df = pd.DataFrame({
+        'Resource_ID': model['dims']['resource'].take(codes),
+        'Full_Name': v4._values(res['Full_Name'], rows),
+        'Skill': v4._values(model['tables']['DB_Skills']['Skill_Name'], skill_rows),
+        'Level': v4._values(res['Skill_Level'], rows),
+        'Manager': v4._values(res['Manager'], rows),
+        'Peak_Load': peak,
+        'Free': FULL_LOAD - peak
+    })
+    return df[df['Free'] > min_free].sort_values(['Free', 'Resource_ID'], ascending=[False, True]).reset_index(drop=True)
+
+def demand_in(model, ix, period, skills=None):
+    """Pipeline heads per skill and month for a period (skills: IDs or names, default all)"""
+    first, last = parse_period(period)
+    codes = skill_codes(model, skills) if skills else np.arange(model['owned']['skill'])
+    heads = key_load(ix, codes, first, last)
+    names = v4._values(model['tables']['DB_Skills']['Skill_Name'], v4._follow(model['index']['skill_row'], codes))
+    return pd.DataFrame(heads.astype(np.int64), columns=[month_label(m) for m in range(first, last + 1)],
+                        index=pd.Index(names, name='Skill'))
+
+# ==========================================
+# 4. SKILL-GAP ENGINE (free capacity - pipeline demand)
+# ==========================================
+GAP_HORIZON = 24                  # Months netted from the current month
+GAP_WINDOWS = [30, 60, 90, 180]   # Days ahead summarised in the gap table
+
+def _level_lookup(levels, column):
+    """Codes of a Skill_Level Categorical re-mapped onto the shared level list"""
+    return v4._follow(pd.Index(levels).get_indexer(column.categories), column.codes)
+
+def skill_gap_monthly(model, ix=None, start=None, months=GAP_HORIZON, prorate=None):
+    """Free FTE, pipeline heads and net gap per (Skill_ID, Skill_Level) per month.
+    Free = sum over the group's resources of max(FULL_LOAD - load, 0); demand matches
+    Skill_Level_Needed exactly. Returns a frame with a (Skill_ID, Skill, Level, Measure)
+    row index, Measure in Free / Demand / Gap, and 'YYYY-MM' columns."""
+    prorate = v4.HEATMAP_PRORATE if prorate is None else prorate
+    first = month_number(start or datetime.date.today())
+    last = first + months - 1
+    ix = allocation_index(model) if ix is None else ix
+    res, pipe = model['tables']['DB_Resources'], model['tables']['DB_Pipeline']
+    levels = sorted(set(res['Skill_Level'].categories) | set(pipe['Skill_Level_Needed'].categories), key=str)
+    n_levels = len(levels)
+
+    # Supply: one row per resource (first DB_Resources row), grouped on skill x level
+    rows = model['index']['resource_row'][:model['owned']['resource']]
+    r_skill, r_level = res['Skill_ID'][rows], _level_lookup(levels, res['Skill_Level'])[rows]
+    free = np.clip(FULL_LOAD - key_load(ix, np.arange(len(rows)), first, last, prorate), 0, None)
+    r_group = np.where((r_skill >= 0) & (r_level >= 0), r_skill.astype(np.int64) * n_levels + r_level, -1)
+
+    # Demand: pipeline rows keyed on the same skill x level code
+    p_skill, p_level = pipe['Skill_ID'], _level_lookup(levels, pipe['Skill_Level_Needed'])
+    p_group = np.where((p_skill >= 0) & (p_level >= 0), p_skill.astype(np.int64) * n_levels + p_level, -1)
+    groups = np.union1d(r_group[r_group >= 0], p_group[p_group >= 0])
+    p_key = np.where(p_group >= 0, np.searchsorted(groups, p_group), -1)
+    demand = key_load(build_month_index(p_key, pipe['Start_Date'], pipe['End_Date']), np.arange(len(groups)), first, last)
+    supply = np.zeros((len(groups), months))
+    known = r_group >= 0
+    np.add.at(supply, np.searchsorted(groups, r_group[known]), free[known])
+
+    # Rows: Free / Demand / Gap for each group, groups in skill code then level order
+    skills, level_codes = groups // n_levels, groups % n_levels
+    skill_names = v4._values(model['tables']['DB_Skills']['Skill_Name'], v4._follow(model['index']['skill_row'], skills))
+    measures = ['Free', 'Demand', 'Gap']
+    index = pd.MultiIndex.from_arrays([
+        np.repeat(model['dims']['skill'].take(skills), 3), np.repeat(skill_names, 3),
+        np.repeat(np.asarray(levels, dtype=object)[level_codes], 3), np.tile(measures, len(groups))
+    ], names=['Skill_ID', 'Skill', 'Level', 'Measure'])
+    values = np.stack([supply, demand, supply - demand], axis=1).reshape(-1, months)
+    return pd.DataFrame(values, index=index, columns=[month_label(m) for m in range(first, last + 1)])
+
+def skill_gap_table(monthly, start=None, windows=GAP_WINDOWS):
+    """30/60/90/180-day view of skill_gap_monthly: per (Skill, Level) the worst (lowest)
+    monthly gap over the months each window touches, with free / demand in that month.
+    Negative gaps are shortfalls."""
+    today = start or datetime.date.today()
+    first = month_number(today)
+    gap, free, demand = (monthly.xs(m, level='Measure') for m in ('Gap', 'Free', 'Demand'))
+    table = gap.index.to_frame(index=False)
+    for days in windows:
+        last = month_number(today + datetime.timedelta(days=days))
+        cols = [month_label(m) for m in range(first, last + 1) if month_label(m) in gap.columns]
+        worst = gap[cols].to_numpy().argmin(axis=1)
+        pick = np.arange(len(gap)), worst
+        table[f'Free_{days}d'] = free[cols].to_numpy()[pick]
+        table[f'Demand_{days}d'] = demand[cols].to_numpy()[pick]
+        table[f'Gap_{days}d'] = gap[cols].to_numpy()[pick]
+    return table.sort_values(f'Gap_{windows[-1]}d', kind='stable').reset_index(drop=True)
+
+# ==========================================
+# 5. STAFFING OPTIMIZER (pipeline rows -> proposed DB_Allocations delta)
+# ==========================================
+# Greedy best-fit over a resource x month free-capacity matrix: pipeline rows are taken
+# earliest start first (scarcest skill first on ties), each filled with whole or half
+# allocations from eligible resources whose free capacity covers every month of the window.
+# A row is either fully staffed or left unfilled, and no month ever goes past FULL_LOAD.
+LEVEL_RANK = {'Junior': 0, 'Standard': 1, 'Senior': 2}
+PIPELINE_FTE = 1.0          # Allocation each pipeline row needs in total
+ALLOC_STEPS = [1.0, 0.5]    # Allocation_% pieces the optimizer may hand out
+EPS = 1e-9
+
+def _ranks(column):
+    """LEVEL_RANK per row of a level Categorical (-1 for unknown / blank levels)"""
+    lookup = np.array([LEVEL_RANK.get(c, -1) for c in column.categories], dtype=np.int64)
+    return v4._follow(lookup, column.codes)
+
+def propose_allocations(model, ix=None, start=None, cover_up=True, prorate=None):
+    """Proposed DB_Allocations rows for DB_Pipeline, plus the pipeline rows left unfilled.
+    cover_up=True lets a more senior resource fill a lower Skill_Level_Needed (exact
+    matches are still preferred). Windows are clipped to start's month (default today);
+    rows that ended before it are skipped. Returns (delta, unfilled) DataFrames."""
+    prorate = v4.HEATMAP_PRORATE if prorate is None else prorate
+    first = month_number(start or datetime.date.today())
+    res, pipe = model['tables']['DB_Resources'], model['tables']['DB_Pipeline']
+    p_lo = pipe['Start_Date'].astype('datetime64[M]').astype(np.int64) + 1970 * 12
+    p_hi = pipe['End_Date'].astype('datetime64[M]').astype(np.int64) + 1970 * 12
+    p_rank = _ranks(pipe['Skill_Level_Needed'])
+    todo = np.flatnonzero((pipe['Skill_ID'] >= 0) & (p_rank >= 0) & ~np.isnat(pipe['Start_Date'])
+                          & ~np.isnat(pipe['End_Date']) & (p_hi >= first) & (p_lo <= p_hi))
+    delta_cols = ['Project_ID', 'Resource_ID', 'Allocation_%', 'Start_Date', 'End_Date']
+    if not len(todo):
+        return pd.DataFrame(columns=delta_cols), pd.DataFrame(columns=['Pipeline_ID', 'Reason'])
+
+    # Free capacity per resource (first DB_Resources row per Resource_ID) x month, with the
+    # resources ordered by (skill, level) so every candidate set is a contiguous slice
+    last = int(p_hi[todo].max())
+    ix = allocation_index(model) if ix is None else ix
+    rows = model['index']['resource_row'][:model['owned']['resource']]
+    r_skill, r_rank = res['Skill_ID'][rows].astype(np.int64), _ranks(res['Skill_Level'])[rows]
+    n_ranks = len(LEVEL_RANK)
+    group = np.where((r_skill >= 0) & (r_rank >= 0), r_skill * n_ranks + r_rank, -1)
+    order = np.argsort(group, kind='stable')
+    group, r_rank = group[order], r_rank[order]  # sorted, so a (skill, level) is a searchsorted range
+    free = np.ascontiguousarray(np.clip(FULL_LOAD - key_load(ix, order, first, last, prorate), 0, None).T)  # month x resource
+
+    p_skill = pipe['Skill_ID'].astype(np.int64)
+    lo_idx = np.searchsorted(group, p_skill * n_ranks + p_rank, 'left')
+    hi_idx = np.searchsorted(group, p_skill * n_ranks + (n_ranks - 1 if cover_up else p_rank), 'right')
+
+    # Best free capacity per (skill, level) group x month: rows no group can cover are
+    # rejected without scanning their candidates
+    g_start = np.flatnonzero(np.r_[True, group[1:] != group[:-1]]) if len(group) else np.array([], dtype=np.int64)
+    g_stop = np.r_[g_start[1:], len(group)]
+    g_max = np.maximum.reduceat(free, g_start, axis=1) if len(g_start) else free[:, :0]
+    g_of = np.repeat(np.arange(len(g_start)), g_stop - g_start)
+    smallest = min(ALLOC_STEPS) - EPS
+
+    # Earliest start first; on ties the row with fewer candidates goes first
+    todo = todo[np.lexsort((hi_idx[todo] - lo_idx[todo], np.maximum(p_lo[todo], first)))]
+
+    picks, unfilled = [], []
+    for i in todo:
+        c0, c1 = lo_idx[i], hi_idx[i]
+        a, b = max(int(p_lo[i]), first) - first, int(p_hi[i]) - first + 1
+        if c1 == c0 or g_max[a:b, g_of[c0]:g_of[c1 - 1] + 1].max(axis=1).min() < smallest:
+            unfilled.append((i, "no eligible resource with capacity" if c1 > c0 else "no resource with this skill/level"))
+            continue
+        window = free[a:b, c0:c1].min(axis=0)
+        over = r_rank[c0:c1] > p_rank[i]
+        need, chosen = PIPELINE_FTE, []
+        for step in ALLOC_STEPS:
+            while need >= step - EPS:
+                ok = np.flatnonzero(window >= step - EPS)
+                if not len(ok):
+                    break
+                # Exact level first, then the tightest fit (keeps big gaps for later rows)
+                best = ok[np.lexsort((window[ok] - step, over[ok]))[0]]
+                chosen.append((c0 + best, step))
+                window[best] = -1.0  # one piece per resource per row
+                need -= step
+        if need > EPS:
+            unfilled.append((i, "no eligible resource with capacity"))
+            continue
+        for k, step in chosen:
+            free[a:b, k] -= step
+            g = g_of[k]
+            g_max[a:b, g] = free[a:b, g_start[g]:g_stop[g]].max(axis=1)
+            picks.append((i, order[k], step))
+
+    i, r, step = (np.array(v) for v in zip(*picks)) if picks else (np.array([], dtype=np.int64),) * 3
+    lo = np.maximum(p_lo[i], first) if len(i) else i
+    starts = np.maximum(pipe['Start_Date'][i], (lo - 1970 * 12).astype('datetime64[M]').astype('datetime64[D]')) \
+        if len(i) else np.array([], dtype='datetime64[D]')
+    delta = pd.DataFrame({
+        'Project_ID': v4._values(pipe['Project_ID'], i),
+        'Resource_ID': model['dims']['resource'].take(r.astype(np.int64)) if len(r) else [],
+        'Allocation_%': step.astype(np.float64),
+        'Start_Date': pd.to_datetime(starts).date, 'End_Date': pd.to_datetime(pipe['End_Date'][i]).date
+    }, columns=delta_cols)
+    u = np.array([k for k, _ in unfilled], dtype=np.int64)
+    unfilled = pd.DataFrame({
+        'Pipeline_ID': v4._values(pipe['Pipeline_ID'], u), 'Project_ID': v4._values(pipe['Project_ID'], u),
+        'Skill': v4._values(model['tables']['DB_Skills']['Skill_Name'],
+                            v4._follow(model['index']['skill_row'], pipe['Skill_ID'][u])),
+        'Level': v4._values(pipe['Skill_Level_Needed'], u),
+        'Start_Date': pd.to_datetime(pipe['Start_Date'][u]).date, 'End_Date': pd.to_datetime(pipe['End_Date'][u]).date,
+        'Reason': [reason for _, reason in unfilled]
+    })
+    return delta, unfilled
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Capacity queries over the v4 tables (month-bucket index)")
+    parser.add_argument('command', choices=['free', 'load', 'demand', 'gaps', 'assign'],
+                        help="free: who has spare capacity; load: resource x month load; demand: pipeline heads per skill; "
+                             "gaps: 30/60/90/180-day skill gap table; assign: propose allocations for DB_Pipeline")
+    parser.add_argument('period', nargs='?', help="Q3-2026, 2026-07 or 2026-07:2026-12 (gaps / assign: start month, default today)")
+    parser.add_argument('--skill', action='append', help="Skill name or ID (repeatable)")
+    parser.add_argument('--level', action='append', help="Skill level, e.g. Senior (repeatable; free only)")
+    parser.add_argument('--min-free', type=float, default=0.0, help="Minimum free capacity, e.g. 0.5 (free only)")
+    parser.add_argument('--exact-level', action='store_true', help="assign: only exact Skill_Level matches")
+    parser.add_argument('--out', help="assign: write the proposed DB_Allocations delta to this CSV")
+    parser.add_argument('--source', help="CSV directory, Parquet directory or workbook (default: synthetic data)")
+    args = parser.parse_args()
+
+    dfs = v4.load_database_v4(args.source) if args.source else v4.create_database_v4()
+    model = v4.build_model(dfs)
+    try:
+        if args.command == 'gaps':
+            start = month_start(parse_period(args.period)[0]) if args.period else None
+            print(skill_gap_table(skill_gap_monthly(model, start=start), start).to_string(index=False))
+        elif args.command == 'assign':
+            start = month_start(parse_period(args.period)[0]) if args.period else None
+            t0 = time.perf_counter()
+            delta, unfilled = propose_allocations(model, start=start, cover_up=not args.exact_level)
+            elapsed = time.perf_counter() - t0
+            print(delta.to_string(index=False))
+            if len(unfilled):
+                print(f"\n⚠️ {len(unfilled)} pipeline rows left unfilled:\n" + unfilled.to_string(index=False))
+            if args.out:
+                delta.to_csv(args.out, index=False)
+            print(f"✅ Proposed {len(delta)} allocations ({delta['Allocation_%'].sum():.1f} FTE) in {elapsed:.3f}s"
+                  + (f" -> {args.out}" if args.out else ""))
+        elif not args.period:
+            parser.error(f"{args.command} needs a period")
+        elif args.command == 'demand':
+            print(demand_in(model, pipeline_index(model), args.period, args.skill).to_string())
+        elif args.command == 'load':
+            print(resource_load(model, allocation_index(model), args.period).to_string())
+        else:
+            free = free_resources(model, allocation_index(model), args.period, args.skill, args.level, args.min_free)
+            print(free.to_string(index=False) if len(free) else f"Nobody free in {args.period} for that filter")
+    except ValueError as e:
+        parser.error(str(e))
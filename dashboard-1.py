@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import random
 import datetime
@@ -97,55 +98,112 @@ def create_mock_database():
 # ==========================================
 def compile_dashboard_data(dfs):
     df_p, df_r, df_a, df_m, df_u, df_s = dfs
-    
-    dashboard_rows = []
+    pids = df_p['Project_ID']
 
-    for _, proj in df_p.iterrows():
-        pid = proj['Project_ID']
-        
-        # 1. Get Weekly Update
-        update = df_u[df_u['Project_ID'] == pid].iloc[0]
-        
-        # 2. Aggregate Milestones (The "Rich Text" Logic)
-        proj_miles = df_m[df_m['Project_ID'] == pid].sort_values('Due_Date')
-        mile_lines = []
-        for _, m in proj_miles.iterrows():
-            icon = "✅" if m['Status'] == 'Completed' else "⚠️" if m['Status'] == 'In Progress' else "⚪"
-            date_str = m['Due_Date'][5:] # mm-dd
-            mile_lines.append(f"{icon} {m['Milestone_Name']} ({int(m['Completion_Pct']*100)}%) - {date_str}")
-        roadmap_str = "\n".join(mile_lines)
-        
-        # 3. Aggregate Resources (Join Allocation + Resource Master)
-        proj_alloc = df_a[df_a['Project_ID'] == pid].merge(df_r, on='Resource_ID')
-        team_lines = []
-        total_util = 0
-        for _, r in proj_alloc.iterrows():
-            pct = r['Allocation_Pct']
-            team_lines.append(f"• {r['Name']} ({r['Role']}): {int(pct*100)}%")
-            total_util += pct
-        team_str = "\n".join(team_lines)
-        
-        # 4. Aggregate SLA
-        proj_sla = df_s[df_s['Project_ID'] == pid]
-        sla_status = "Breached" if "Breached" in proj_sla['Status'].values else "Met"
-
-        # Build Row
-        dashboard_rows.append({
-            'Project Name': proj['Project_Name'],
-            'Lead / PM': f"Lead: {proj['Lead']}\nPM: {proj['PM']}",
-            'Overall Status': update['Overall_RAG'],
-            'Milestone Roadmap': roadmap_str,
-            'Resource Plan': team_str,
-            'Total Capacity': total_util, # Sum of allocations (e.g., 2.5 FTE)
-            'Weekly Update': f"GOAL: {update['Goal_This_Week']}\n\nUPDATE: {update['Weekly_Status_Narrative']}\n\nRISK: {update['Top_Risk']}",
-            'SLA': sla_status
-        })
-        
-    return pd.DataFrame(dashboard_rows)
+    # 1. Get Weekly Update (first row per project)
+    update = df_u.drop_duplicates('Project_ID').set_index('Project_ID').reindex(pids)
+
+    # 2. Aggregate Milestones (The "Rich Text" Logic) - one sort, one groupby
+    miles = df_m.sort_values('Due_Date', kind='stable')
+    icon = pd.Series(np.where(miles['Status'] == 'Completed', "✅",
+                              np.where(miles['Status'] == 'In Progress', "⚠️", "⚪")), index=miles.index)
+    pct = (miles['Completion_Pct'] * 100).astype(int).astype(str)
+    mile_lines = icon + " " + miles['Milestone_Name'].astype(str) + " (" + pct + "%) - " + miles['Due_Date'].str[5:] # mm-dd
+    roadmap = mile_lines.groupby(miles['Project_ID'], sort=False).agg("\n".join)
+
+    # 3. Aggregate Resources (Join Allocation + Resource Master once)
+    alloc = df_a.merge(df_r, on='Resource_ID')
+    pct = (alloc['Allocation_Pct'] * 100).astype(int).astype(str)
+    team_lines = "• " + alloc['Name'].astype(str) + " (" + alloc['Role'].astype(str) + "): " + pct + "%"
+    team = team_lines.groupby(alloc['Project_ID'], sort=False).agg("\n".join)
+    total_util = alloc['Allocation_Pct'].groupby(alloc['Project_ID'], sort=False).sum()
+
+    # 4. Aggregate SLA
+    breached = (df_s['Status'] == 'Breached').groupby(df_s['Project_ID']).any()
+    sla_status = np.where(breached.reindex(pids, fill_value=False), "Breached", "Met")
+
+    # Build Rows
+    weekly = ("GOAL: " + update['Goal_This_Week'].astype(str) + "\n\nUPDATE: " + update['Weekly_Status_Narrative'].astype(str)
+              + "\n\nRISK: " + update['Top_Risk'].astype(str))
+    return pd.DataFrame({
+        'Project Name': df_p['Project_Name'].to_numpy(),
+        'Lead / PM': ("Lead: " + df_p['Lead'].astype(str) + "\nPM: " + df_p['PM'].astype(str)).to_numpy(),
+        'Overall Status': update['Overall_RAG'].to_numpy(),
+        'Milestone Roadmap': roadmap.reindex(pids, fill_value="").to_numpy(),
+        'Resource Plan': team.reindex(pids, fill_value="").to_numpy(),
+        'Total Capacity': total_util.reindex(pids, fill_value=0).to_numpy(), # Sum of allocations (e.g., 2.5 FTE)
+        'Weekly Update': weekly.to_numpy(),
+        'SLA': sla_status
+    })
 
 # ==========================================
 # 3. GENERATE EXCEL FILE
 # ==========================================
+EXCEL_EPOCH = pd.Timestamp('1899-12-30')
+
+def db_sheet_formats(wb):
+    """Pre-built cell formats shared by every write_db_sheet call"""
+    return {
+        'date': wb.add_format({'num_format': 'yyyy-mm-dd'}),
+        'datetime': wb.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
+    }
+
+def _typed_columns(df):
+    """Converts each column once to (kind, values) - a plain list with None for blanks"""
+    cols = []
+    for name in df.columns:
+        s = df[name]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            s = s.astype(object)
+        kind = pd.api.types.infer_dtype(s, skipna=True)
+        if kind in ('date', 'datetime', 'datetime64'):
+            s = (pd.to_datetime(s) - EXCEL_EPOCH) / pd.Timedelta(days=1)
+            kind = 'date' if kind == 'date' else 'datetime'
+        elif kind in ('integer', 'floating', 'mixed-integer-float', 'decimal'):
+            kind = 'number'
+        elif kind == 'boolean':
+            kind = 'bool'
+        elif kind not in ('string', 'empty'):
+            kind = 'any'
+        values = s.astype(object).where(s.notna(), None).tolist()
+        cols.append((kind, values))
+    return cols
+
+def write_db_sheet(wb, df, name, formats, table=True):
+    """Bulk DB tab writer: one typed write call per cell, formats built once.
+    Writes row by row when the workbook is in constant_memory mode."""
+    ws = wb.add_worksheet(name)
+    (max_row, max_col) = df.shape
+    headers = [str(col) for col in df.columns]
+    if table and not ws.constant_memory:
+        ws.add_table(0, 0, max_row, max_col - 1, {'columns': [{'header': h} for h in headers]})
+    else:
+        # add_table() isn't available in constant_memory mode; fall back to a filter
+        ws.write_row(0, 0, headers)
+        if table:
+            ws.autofilter(0, 0, max_row, max_col - 1)
+
+    writers = {
+        'number': (ws.write_number, None), 'date': (ws.write_number, formats['date']),
+        'datetime': (ws.write_number, formats['datetime']), 'bool': (ws.write_boolean, None),
+        'string': (ws.write_string, None), 'empty': (ws.write_string, None), 'any': (ws.write, None)
+    }
+    columns = [(col, *writers[kind], values) for col, (kind, values) in enumerate(_typed_columns(df))]
+
+    if ws.constant_memory:
+        # Rows are flushed as soon as the next one starts, so go row-major
+        for row in range(max_row):
+            for col, write, fmt, values in columns:
+                v = values[row]
+                if v is not None:
+                    write(row + 1, col, v, fmt)
+    else:
+        for col, write, fmt, values in columns:
+            for row, v in enumerate(values, 1):
+                if v is not None:
+                    write(row, col, v, fmt)
+    return ws
+
 def create_full_workbook():
     # Get Data
     dfs = create_mock_database()
@@ -199,11 +257,12 @@ def create_full_workbook():
     # ================= 2. THE SOURCE TABS (DATABASE) =================
     # Write the raw data tabs so the user can see "Under the hood"
     sheet_names = ['DB_Projects', 'DB_Resources', 'DB_Allocations', 'DB_Milestones', 'DB_Updates', 'DB_SLA']
+    db_fmts = db_sheet_formats(workbook)
     for i, df in enumerate(dfs):
         s_name = sheet_names[i]
-        df.to_excel(writer, sheet_name=s_name, index=False)
+        ws_db = write_db_sheet(workbook, df, s_name, db_fmts, table=False)
         # Auto-width columns roughly
-        writer.sheets[s_name].set_column(0, len(df.columns)-1, 15)
+        ws_db.set_column(0, len(df.columns)-1, 15)
 
     writer.close()
     print(f"✅ Generated Dynamic Workbook: {OUTPUT_FILE}")
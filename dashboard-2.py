@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import random
 import datetime
@@ -7,6 +8,7 @@ from dateutil.relativedelta import relativedelta
 # CONFIGURATION
 # ==========================================
 OUTPUT_FILE = 'Dynamic_Portfolio_Master_v2.xlsx'
+HEATMAP_PRORATE = False  # True = weight allocations by days covered in each month
 
 # ==========================================
 # 1. HELPER: DATE RANGES
@@ -20,6 +22,41 @@ def get_month_columns(start_date, months=12):
         current += relativedelta(months=1)
     return cols
 
+def _month_index(dates, start_date):
+    """Month offset of each date from start_date (0 = start month)"""
+    d = pd.to_datetime(pd.Series(dates))
+    return ((d.dt.year - start_date.year) * 12 + (d.dt.month - start_date.month)).to_numpy()
+
+def _overlap_matrix(codes, lo, hi, n_rows, n_months, weights=None):
+    """Sums weights of [lo, hi] month intervals into an n_rows x n_months grid.
+    Uses a difference array + cumsum so each interval costs O(1)."""
+    if weights is None:
+        weights = np.ones(len(codes), dtype=np.int64)
+    lo, hi = np.asarray(lo, dtype=np.float64), np.asarray(hi, dtype=np.float64)
+    # Blank Start / End dates come in as NaN month offsets: those rows cover no month
+    keep = ~np.isnan(lo) & ~np.isnan(hi) & (lo <= hi) & (hi >= 0) & (lo < n_months)
+    codes, weights = codes[keep], weights[keep]
+    lo = np.clip(lo[keep], 0, n_months).astype(np.int64)
+    hi = np.clip(hi[keep], -1, n_months - 1).astype(np.int64)
+
+    diff = np.zeros((n_rows, n_months + 1), dtype=weights.dtype)
+    np.add.at(diff, (codes, lo), weights)
+    np.add.at(diff, (codes, hi + 1), -weights)
+    return np.cumsum(diff[:, :n_months], axis=1)
+
+def _prorated_matrix(codes, starts, ends, n_rows, months, weights):
+    """Like _overlap_matrix, but each month gets weight x (days covered / days in month)"""
+    m_start = np.array(months, dtype='datetime64[D]')
+    m_stop = np.array([m + relativedelta(months=1) for m in months], dtype='datetime64[D]')
+    s = pd.to_datetime(pd.Series(starts)).to_numpy(dtype='datetime64[D]')[:, None]
+    e = pd.to_datetime(pd.Series(ends)).to_numpy(dtype='datetime64[D]')[:, None] + 1
+
+    days = (np.minimum(e, m_stop) - np.maximum(s, m_start)).astype(np.int64)
+    frac = np.clip(days, 0, None) / (m_stop - m_start).astype(np.int64)
+    out = np.zeros((n_rows, len(months)))
+    np.add.at(out, codes, frac * weights[:, None])
+    return out
+
 # ==========================================
 # 2. GENERATE MOCK DATABASE
 # ==========================================
@@ -122,89 +159,87 @@ def create_enhanced_database():
 # ==========================================
 def compile_dashboard_data(dfs):
     df_p, df_r, df_a, df_m, df_u, df_s = dfs
-    
-    dashboard_rows = []
+    pids = df_p['Project_ID']
 
-    for _, proj in df_p.iterrows():
-        pid = proj['Project_ID']
-        
-        # 1. Get Weekly Update
-        update = df_u[df_u['Project_ID'] == pid].iloc[0]
-        
-        # 2. Aggregate Milestones
-        proj_miles = df_m[df_m['Project_ID'] == pid].sort_values('Date')
-        mile_lines = []
-        for _, m in proj_miles.iterrows():
-            icon = "✅" if m['Status'] == 'Completed' else "⚠️" if m['Status'] == 'In Progress' else "⚪"
-            date_str = m['Date'][5:]
-            mile_lines.append(f"{icon} {m['Milestone']} ({int(m['Completion_Pct']*100)}%) - {date_str}")
-        roadmap_str = "\n".join(mile_lines)
-        
-        # 3. Aggregate Resources (With Dates)
-        proj_alloc = df_a[df_a['Project_ID'] == pid].merge(df_r, on='Resource_ID')
-        team_lines = []
-        total_util = 0
-        for _, r in proj_alloc.iterrows():
-            pct = r['Allocation_%']
-            s_str = r['Start_Date'].strftime('%b')
-            e_str = r['End_Date'].strftime('%b')
-            team_lines.append(f"• {r['Full_Name']} ({r['Primary_Skill']}): {int(pct*100)}% [{s_str}-{e_str}]")
-            total_util += pct
-        team_str = "\n".join(team_lines)
-        
-        # 4. SLA
-        proj_sla = df_s[df_s['Project_ID'] == pid]
-        sla_status = "Breached" if "Breached" in proj_sla['Status'].values else "Met"
-
-        # Build Row
-        dashboard_rows.append({
-            'Project Name': proj['Project_Name'],
-            'Portfolio': proj['Portfolio'],
-            'Team': proj['Team'],
-            'Lead / PM': f"Lead: {proj['Lead']}\nPM: {proj['PM']}",
-            'Overall Status': update['RAG'],
-            'Milestone Roadmap': roadmap_str,
-            'Resource Plan': team_str,
-            'Total FTE': total_util,
-            'Weekly Update': f"GOAL: {update['Goal_This_Week']}\n\nUPDATE: {update['Narrative']}\n\nTASKS:\n{update['Upcoming_Tasks']}\n\nRISK: {update['Risks']}",
-            'SLA': sla_status
-        })
+    # 1. Get Weekly Update (first row per project)
+    update = df_u.drop_duplicates('Project_ID').set_index('Project_ID').reindex(pids)
+
+    # 2. Aggregate Milestones (one sort, one groupby)
+    miles = df_m.sort_values('Date', kind='stable')
+    icon = pd.Series(np.where(miles['Status'] == 'Completed', "✅",
+                              np.where(miles['Status'] == 'In Progress', "⚠️", "⚪")), index=miles.index)
+    pct = (miles['Completion_Pct'] * 100).astype(int).astype(str)
+    mile_lines = icon + " " + miles['Milestone'].astype(str) + " (" + pct + "%) - " + miles['Date'].str[5:]
+    roadmap = mile_lines.groupby(miles['Project_ID'], sort=False).agg("\n".join)
+
+    # 3. Aggregate Resources (With Dates) - allocations joined to resources once
+    alloc = df_a.merge(df_r, on='Resource_ID')
+    s_str = pd.to_datetime(alloc['Start_Date']).dt.strftime('%b')
+    e_str = pd.to_datetime(alloc['End_Date']).dt.strftime('%b')
+    pct = (alloc['Allocation_%'] * 100).astype(int).astype(str)
+    team_lines = ("• " + alloc['Full_Name'].astype(str) + " (" + alloc['Primary_Skill'].astype(str) + "): "
+                  + pct + "% [" + s_str + "-" + e_str + "]")
+    by_proj = alloc['Project_ID']
+    team = team_lines.groupby(by_proj, sort=False).agg("\n".join)
+    total_util = alloc['Allocation_%'].groupby(by_proj, sort=False).sum()
+
+    # 4. SLA
+    breached = (df_s['Status'] == 'Breached').groupby(df_s['Project_ID']).any()
+    sla_status = np.where(breached.reindex(pids, fill_value=False), "Breached", "Met")
+
+    # Build Rows
+    weekly = ("GOAL: " + update['Goal_This_Week'].astype(str) + "\n\nUPDATE: " + update['Narrative'].astype(str)
+              + "\n\nTASKS:\n" + update['Upcoming_Tasks'].astype(str) + "\n\nRISK: " + update['Risks'].astype(str))
+    df_dashboard = pd.DataFrame({
+        'Project Name': df_p['Project_Name'].to_numpy(),
+        'Portfolio': df_p['Portfolio'].to_numpy(),
+        'Team': df_p['Team'].to_numpy(),
+        'Lead / PM': ("Lead: " + df_p['Lead'].astype(str) + "\nPM: " + df_p['PM'].astype(str)).to_numpy(),
+        'Overall Status': update['RAG'].to_numpy(),
+        'Milestone Roadmap': roadmap.reindex(pids, fill_value="").to_numpy(),
+        'Resource Plan': team.reindex(pids, fill_value="").to_numpy(),
+        'Total FTE': total_util.reindex(pids, fill_value=0).to_numpy(),
+        'Weekly Update': weekly.to_numpy(),
+        'SLA': sla_status
+    })
         
     # Sort by Portfolio then Team
-    df_dashboard = pd.DataFrame(dashboard_rows)
     df_dashboard.sort_values(by=['Portfolio', 'Team'], inplace=True)
     return df_dashboard
 
 # ==========================================
 # 4. CALCULATE MONTHLY HEATMAP
 # ==========================================
-def generate_heatmap_data(df_res, df_alloc):
+def generate_heatmap_data(df_res, df_alloc, prorate=False):
+    """Resource x Month load. prorate=True weights each allocation by the
+    share of days it covers in the month instead of counting any overlap."""
     today = datetime.date.today().replace(day=1)
     months = get_month_columns(today, 12)
-    
-    heatmap_rows = []
-    
-    for _, res in df_res.iterrows():
-        rid = res['Resource_ID']
-        row = {
-            'Resource Name': res['Full_Name'],
-            'Primary Skill': res['Primary_Skill'],
-            'Manager': res['Manager']
-        }
-        
-        my_allocs = df_alloc[df_alloc['Resource_ID'] == rid]
-        
-        for m in months:
-            month_load = 0
-            month_end = m + relativedelta(months=1, days=-1)
-            for _, alloc in my_allocs.iterrows():
-                if alloc['Start_Date'] <= month_end and alloc['End_Date'] >= m:
-                    month_load += alloc['Allocation_%']
-            row[m] = month_load
-            
-        heatmap_rows.append(row)
-        
-    return pd.DataFrame(heatmap_rows), months
+    if df_res.empty:
+        return pd.DataFrame([]), months
+
+    # Load per unique Resource_ID in one pass over the allocations
+    rids = pd.Index(df_res['Resource_ID'].drop_duplicates())
+    codes = rids.get_indexer(df_alloc['Resource_ID'])
+    known = codes >= 0
+    weights = df_alloc['Allocation_%'].to_numpy(dtype=float)[known]
+    starts = df_alloc['Start_Date'][known]
+    ends = df_alloc['End_Date'][known]
+    if prorate:
+        load = _prorated_matrix(codes[known], starts, ends, len(rids), months, weights)
+    else:
+        lo = _month_index(starts, today)
+        hi = _month_index(ends, today)
+        load = _overlap_matrix(codes[known], lo, hi, len(rids), len(months), weights)
+    load = load[rids.get_indexer(df_res['Resource_ID'])]
+
+    df_heat = pd.DataFrame({
+        'Resource Name': df_res['Full_Name'].to_numpy(),
+        'Primary Skill': df_res['Primary_Skill'].to_numpy(),
+        'Manager': df_res['Manager'].to_numpy()
+    })
+    df_month = pd.DataFrame(load, columns=months)
+    return pd.concat([df_heat, df_month], axis=1), months
 
 # ==========================================
 # 5. EXCEL GENERATION
@@ -213,7 +248,7 @@ def create_workbook():
     dfs = create_enhanced_database()
     df_p, df_r, df_a, df_m, df_u, df_s = dfs
     df_dashboard = compile_dashboard_data(dfs)
-    df_heat, month_cols = generate_heatmap_data(df_r, df_a)
+    df_heat, month_cols = generate_heatmap_data(df_r, df_a, prorate=HEATMAP_PRORATE)
     
     writer = pd.ExcelWriter(OUTPUT_FILE, engine='xlsxwriter')
     workbook = writer.book
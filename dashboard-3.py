@@ -1,12 +1,47 @@
+import numpy as np
 import pandas as pd
 import random
 import datetime
+import os
+import re
+import sys
+import time
+import json
+import shutil
+import hashlib
+import tempfile
+import argparse
+import cProfile
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dateutil.relativedelta import relativedelta
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import openpyxl
+    from openpyxl.worksheet.formula import ArrayFormula
+except ImportError:  # Only needed to refresh an existing workbook
+    openpyxl = ArrayFormula = None
+
 # ==========================================
 # CONFIGURATION
 # ==========================================
 OUTPUT_FILE = 'Dynamic_Portfolio_Master_v4.xlsx'
+HEATMAP_PRORATE = False  # True = weight allocations by days covered in each month
+STREAM_CHUNK = 5000  # Rows computed per batch in streaming (constant_memory) mode
+STATE_FILE = 'Dynamic_Portfolio_Master_v4.state.pkl'  # Cache for incremental rebuilds
+CACHE_DIR = '.portfolio_cache'  # Computed dashboard / demand / heatmap frames (Arrow IPC)
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+PROFILE_ENV = 'PORTFOLIO_PROFILE'  # '1' = print the stage profile, a path = also write it as JSON / Chrome trace
+PROFILE_STAGE_ENV = 'PORTFOLIO_PROFILE_STAGE'  # Stage name to run under cProfile
+PROFILE_MEMORY = True  # tracemalloc peaks per stage (slows Python-heavy stages down noticeably)
+PROFILE_TOP = 25  # Functions listed for the cProfile'd stage
 
 # ==========================================
 # 1. HELPER FUNCTIONS
@@ -33,6 +68,41 @@ def get_quarter_list():
             quarters.append(f"Q{q}-{year}")
     return quarters
 
+def _month_index(dates, start_date):
+    """Month offset of each date from start_date (0 = start month)"""
+    d = pd.to_datetime(pd.Series(dates))
+    return ((d.dt.year - start_date.year) * 12 + (d.dt.month - start_date.month)).to_numpy()
+
+def _overlap_matrix(codes, lo, hi, n_rows, n_months, weights=None):
+    """Sums weights of [lo, hi] month intervals into an n_rows x n_months grid.
+    Uses a difference array + cumsum so each interval costs O(1)."""
+    if weights is None:
+        weights = np.ones(len(codes), dtype=np.int64)
+    lo, hi = np.asarray(lo, dtype=np.float64), np.asarray(hi, dtype=np.float64)
+    # Blank Start / End dates come in as NaN month offsets: those rows cover no month
+    keep = ~np.isnan(lo) & ~np.isnan(hi) & (lo <= hi) & (hi >= 0) & (lo < n_months)
+    codes, weights = codes[keep], weights[keep]
+    lo = np.clip(lo[keep], 0, n_months).astype(np.int64)
+    hi = np.clip(hi[keep], -1, n_months - 1).astype(np.int64)
+
+    diff = np.zeros((n_rows, n_months + 1), dtype=weights.dtype)
+    np.add.at(diff, (codes, lo), weights)
+    np.add.at(diff, (codes, hi + 1), -weights)
+    return np.cumsum(diff[:, :n_months], axis=1)
+
+def _prorated_matrix(codes, starts, ends, n_rows, months, weights):
+    """Like _overlap_matrix, but each month gets weight x (days covered / days in month)"""
+    m_start = np.array(months, dtype='datetime64[D]')
+    m_stop = np.array([m + relativedelta(months=1) for m in months], dtype='datetime64[D]')
+    s = pd.to_datetime(pd.Series(starts)).to_numpy(dtype='datetime64[D]')[:, None]
+    e = pd.to_datetime(pd.Series(ends)).to_numpy(dtype='datetime64[D]')[:, None] + 1
+
+    days = (np.minimum(e, m_stop) - np.maximum(s, m_start)).astype(np.int64)
+    frac = np.clip(days, 0, None) / (m_stop - m_start).astype(np.int64)
+    out = np.zeros((n_rows, len(months)))
+    np.add.at(out, codes, frac * weights[:, None])
+    return out
+
 # ==========================================
 # 2. GENERATE MOCK DATABASE
 # ==========================================
@@ -192,97 +262,1113 @@ def create_database_v4():
     return df_projects, df_resources, df_allocations, df_pipeline, df_skills, df_milestones, df_updates, df_sla, df_financials, df_config
 
 # ==========================================
-# 3. ENGINES (Demand Plan & Heatmap)
+# 2b. LOAD REAL DATABASE (CSV / Parquet / v4 workbook)
 # ==========================================
-def generate_demand_plan(df_pipe, df_skills):
-    start_m = datetime.date(2026, 1, 1)
-    months = get_month_columns(start_m, 24)
-    
-    unique_keys = df_pipe[['Portfolio', 'Team', 'Goal', 'Skill_ID', 'Skill_Level_Needed']].drop_duplicates()
-    demand_rows = []
+# Column list, date columns and low-cardinality (categorical) columns per table,
+# in the order create_database_v4 returns them
+DB_SCHEMA = {
+    'DB_Projects': (['Project_ID', 'Project_Name', 'Portfolio', 'Team', 'Goal', 'Lead', 'PM', 'Kickoff', 'End_Date'],
+                    ['Kickoff', 'End_Date'], ['Portfolio', 'Team']),
+    'DB_Resources': (['Resource_ID', 'Full_Name', 'Skill_ID', 'Skill_Level', 'Years_Exp', 'Manager'],
+                     [], ['Skill_ID']),
+    'DB_Allocations': (['Project_ID', 'Resource_ID', 'Allocation_%', 'Start_Date', 'End_Date'],
+                       ['Start_Date', 'End_Date'], []),
+    'DB_Pipeline': (['Pipeline_ID', 'Project_ID', 'Portfolio', 'Team', 'Goal', 'Skill_ID', 'Skill_Level_Needed',
+                     'Start_Date', 'End_Date', 'Solution_Architect', 'Product_Owner', 'LTIM_Lead'],
+                    ['Start_Date', 'End_Date'], ['Portfolio', 'Team', 'Skill_ID']),
+    'DB_Skills': (['Skill_ID', 'Skill_Name', 'Levels'], [], ['Skill_ID']),
+    'DB_Milestones': (['Project_ID', 'Milestone', 'Baseline_Date', 'Forecast_Date', 'Progress_Pct', 'Status',
+                       'Comments', 'Risks_Issues'], ['Baseline_Date', 'Forecast_Date'], []),
+    'DB_Updates': (['Project_ID', 'Week', 'RAG', 'Goal', 'Narrative', 'Tasks', 'Risks'], [], []),
+    'DB_SLA': (['Project_ID', 'Metric', 'Status'], [], []),
+    'DB_Financials': (['Project_ID', 'Total_Budget', 'Actuals_To_Date', 'Forecast_To_Complete', 'Budget_Status'],
+                      [], []),
+    'DB_Config': (['Quarters'], [], [])
+}
+
+def _read_table(source, table, columns):
+    """Reads only `columns` of one table from a workbook or a folder of .parquet/.csv files.
+    Only empty cells are blanks - 'None' / 'NA' are real values in these tables."""
+    text_opts = {'usecols': lambda c: c in columns, 'keep_default_na': False, 'na_values': ['']}
+    if os.path.isfile(source):
+        return pd.read_excel(source, sheet_name=table, **text_opts)
+    path = os.path.join(source, table)
+    if os.path.exists(path + '.parquet'):
+        return pd.read_parquet(path + '.parquet', columns=columns)
+    if os.path.exists(path + '.csv'):
+        return pd.read_csv(path + '.csv', **text_opts)
+    raise FileNotFoundError(f"No {table}.parquet or {table}.csv in {source}")
+
+def _conform(table, df, extra_columns=False):
+    """Schema column order, parsed dates and sorted categories.
+    extra_columns=True keeps columns users added, after the schema ones."""
+    columns, dates, categories = DB_SCHEMA[table]
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise ValueError(f"{table} is missing columns: {', '.join(missing)}")
+    df = df[columns + ([c for c in df.columns if c not in columns] if extra_columns else [])]
+    for col in dates:
+        df[col] = pd.to_datetime(df[col])
+    for col in categories:
+        cat = df[col].astype('category')
+        df[col] = cat.cat.set_categories(sorted(cat.cat.categories))  # sort like plain strings
+    return df
+
+def load_database_v4(source):
+    """Loads the ten v4 tables from real data: a folder of DB_*.csv / DB_*.parquet
+    files or an existing v4 workbook. Returns the same tuple as create_database_v4."""
+    if os.path.isfile(source) and source.endswith('.xlsx') and openpyxl is not None:
+        return read_workbook_tables(source, extra_columns=False)
+    return tuple(_conform(table, _read_table(source, table, columns)) for table, (columns, _, _) in DB_SCHEMA.items())
+
+def _formula_text(value):
+    """'=B2*0.5' for a formula cell read with data_only=False, else None"""
+    if isinstance(value, str):
+        return value if value.startswith('=') else None
+    if ArrayFormula is not None and isinstance(value, ArrayFormula):
+        return value.text
+    return None
+
+def read_workbook_tables(path, extra_columns=True, keep_formulas=False):
+    """Streams the DB_* tabs of a v4 workbook in one read-only pass. Tabs holding formulas
+    are read a second time for the values Excel cached (blank if it never calculated them).
+    Blank rows are dropped and only empty cells are blanks, as in _read_table.
+    Returns the tables in DB_SCHEMA order; see _conform for extra_columns.
+    keep_formulas=True returns (tables, {table: {row: [(column, formula)]}}) with frame row numbers."""
+    if openpyxl is None:
+        raise ImportError("Reading the DB tabs of a workbook needs openpyxl (pip install openpyxl)")
+    wb = openpyxl.load_workbook(path, read_only=True)  # Formula cells come back as their text
+    cached_wb = None
+    try:
+        tables, formulas = [], {}
+        for table in DB_SCHEMA:
+            if table not in wb.sheetnames:
+                raise ValueError(f"{path} has no {table} tab")
+            rows = wb[table].iter_rows(values_only=True)
+            header = list(next(rows, ()))
+            while header and header[-1] is None:
+                header.pop()
+            width = len(header)
+            kept, data, cells = [], [], []
+            for i, row in enumerate(rows):
+                row = row[:width]
+                if any(v is not None for v in row):
+                    found = [(col, f) for col, f in enumerate(map(_formula_text, row)) if f]
+                    if found:
+                        cells.append((len(data), found))
+                    kept.append(i)
+                    data.append(row)
+            if cells:
+                cached_wb = cached_wb or openpyxl.load_workbook(path, read_only=True, data_only=True)
+                cached = [row[:width] for row in cached_wb[table].iter_rows(min_row=2, values_only=True)]
+                found = {}
+                for r, row_cells in cells:
+                    values = list(data[r])
+                    for col, f in row_cells:
+                        value = cached[kept[r]][col] if kept[r] < len(cached) and col < len(cached[kept[r]]) else None
+                        if value == f:  # A text cell that merely starts with '='
+                            continue
+                        values[col] = value
+                        found.setdefault(r, []).append((header[col], f))
+                    data[r] = values
+                if found:
+                    formulas[table] = found
+            tables.append(_conform(table, pd.DataFrame(data, columns=header), extra_columns))
+    finally:
+        wb.close()
+        if cached_wb is not None:
+            cached_wb.close()
+    return (tuple(tables), formulas) if keep_formulas else tuple(tables)
+
+# ==========================================
+# 2c. COMPACT COLUMNAR MODEL
+# ==========================================
+# Each table becomes a dict of typed numpy columns. Key columns hold int32 codes into a
+# shared dimension (owner IDs first, in first-seen order, then dangling foreign keys),
+# other text columns are categoricals, dates are datetime64[D] and allocations float32.
+MODEL_KEYS = {
+    'DB_Projects': {'Project_ID': 'project'},
+    'DB_Resources': {'Resource_ID': 'resource', 'Skill_ID': 'skill'},
+    'DB_Allocations': {'Project_ID': 'project', 'Resource_ID': 'resource'},
+    'DB_Pipeline': {'Skill_ID': 'skill'},
+    'DB_Skills': {'Skill_ID': 'skill'},
+    'DB_Milestones': {'Project_ID': 'project'},
+    'DB_Updates': {'Project_ID': 'project'},
+    'DB_SLA': {'Project_ID': 'project'},
+    'DB_Financials': {'Project_ID': 'project'}
+}
+MODEL_OWNERS = {'project': ('DB_Projects', 'Project_ID'), 'resource': ('DB_Resources', 'Resource_ID'),
+                'skill': ('DB_Skills', 'Skill_ID')}
+MODEL_FLOAT32 = ['Allocation_%']
+
+def _compact_column(values, name, dates):
+    if name in dates:
+        return pd.to_datetime(values).to_numpy(dtype='datetime64[D]')
+    if name in MODEL_FLOAT32:
+        return values.to_numpy(dtype=np.float32)
+    if pd.api.types.is_integer_dtype(values):
+        return pd.to_numeric(values, downcast='integer').to_numpy()
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=np.float64)
+    cat = pd.Categorical(values.astype(object))
+    return cat.set_categories(sorted(cat.categories, key=str))
+
+def _first_rows(codes, n):
+    """Row of the first occurrence of each code 0..n-1 (-1 where absent)"""
+    rows = np.full(n, -1, dtype=np.int64)
+    known = np.flatnonzero(codes >= 0)
+    uniq, first = np.unique(codes[known], return_index=True)
+    rows[uniq] = known[first]
+    return rows
+
+def _csr(codes, n):
+    """(offsets, rows): rows[offsets[c]:offsets[c + 1]] are the rows with code c, in table order"""
+    order = np.argsort(codes, kind='stable')
+    order = order[np.count_nonzero(codes < 0):]
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes[order], minlength=n), out=offsets[1:])
+    return offsets, order
+
+def build_model(dfs):
+    """Compact model of the ten v4 tables:
+    model['dims'][dim]        pd.Index of IDs; code = position
+    model['owned'][dim]       number of IDs present in the owning table (higher codes dangle)
+    model['tables'][table]    {column: int32 codes | Categorical | datetime64[D] | float32 | number}
+    model['index']            precomputed foreign-key lookups (see below)"""
+    frames = dict(zip(DB_SCHEMA, dfs))
+    dims, owned = {}, {}
+    for dim, (table, col) in MODEL_OWNERS.items():
+        ids = pd.Index(frames[table][col].dropna().drop_duplicates())
+        extra = [frames[t][c] for t, keys in MODEL_KEYS.items() for c, d in keys.items() if d == dim and t != table]
+        dangling = pd.Index(pd.concat(extra).dropna().unique()).difference(ids, sort=False) if extra else ids[:0]
+        dims[dim], owned[dim] = ids.append(dangling), len(ids)
+
+    tables = {}
+    for table, df in frames.items():
+        keys, dates = MODEL_KEYS.get(table, {}), DB_SCHEMA[table][1]
+        tables[table] = {col: dims[keys[col]].get_indexer(df[col]).astype(np.int32) if col in keys
+                         else _compact_column(df[col], col, dates) for col in df.columns}
+
+    res, alloc = tables['DB_Resources'], tables['DB_Allocations']
+    n_res, n_proj = len(dims['resource']), len(dims['project'])
+    resource_row = _first_rows(res['Resource_ID'], n_res)
+    index = {
+        # dim code -> first row in the owning table (-1 for dangling codes)
+        'project_row': _first_rows(tables['DB_Projects']['Project_ID'], n_proj),
+        'resource_row': resource_row,
+        'skill_row': _first_rows(tables['DB_Skills']['Skill_ID'], len(dims['skill'])),
+        # resource code -> skill code, allocation row -> resource code / project code
+        'resource_skill': np.where(resource_row >= 0, res['Skill_ID'][resource_row], -1).astype(np.int32),
+        'alloc_resource': alloc['Resource_ID'],
+        'alloc_project': alloc['Project_ID'],
+        # resource / project code -> allocation rows
+        'allocs_by_resource': _csr(alloc['Resource_ID'], n_res),
+        'allocs_by_project': _csr(alloc['Project_ID'], n_proj),
+        # project code -> first update / financial row (the rows the dashboard reports)
+        'first_update': _first_rows(tables['DB_Updates']['Project_ID'], n_proj),
+        'first_financial': _first_rows(tables['DB_Financials']['Project_ID'], n_proj)
+    }
+    return {'dims': dims, 'owned': owned, 'tables': tables, 'index': index}
+
+def _nbytes(value):
+    if isinstance(value, pd.Categorical):
+        return value.codes.nbytes + value.categories.memory_usage(deep=True)
+    if isinstance(value, pd.Index):
+        return value.memory_usage(deep=True)
+    if isinstance(value, tuple):
+        return sum(_nbytes(v) for v in value)
+    return value.nbytes if isinstance(value, np.ndarray) else 0
+
+def model_memory(model, dfs=None):
+    """Bytes per table in the model (dims and indexes as their own rows), next to the
+    deep memory_usage of the source DataFrames when dfs is given"""
+    rows = [{'table': t, 'model_bytes': sum(_nbytes(v) for v in cols.values())} for t, cols in model['tables'].items()]
+    rows.append({'table': 'dims', 'model_bytes': sum(_nbytes(v) for v in model['dims'].values())})
+    rows.append({'table': 'index', 'model_bytes': sum(_nbytes(v) for v in model['index'].values())})
+    report = pd.DataFrame(rows)
+    if dfs is not None:
+        report['frame_bytes'] = [int(df.memory_usage(deep=True).sum()) for df in dfs] + [0, 0]
+    return report
+
+# ==========================================
+# 3. ENGINES (Demand Plan, Heatmap & Dashboard)
+# ==========================================
+DEMAND_KEYS = ['Portfolio', 'Team', 'Goal', 'Skill_ID', 'Skill_Level_Needed']
+DEMAND_START = datetime.date(2026, 1, 1)
+
+def _demand_counts(df_pipe, months, weights=None):
+    """Unique key rows (first-seen order) and their key x month overlap counts"""
+    keys = df_pipe[DEMAND_KEYS]
+
+    # One code per unique key, in first-seen order (same as drop_duplicates)
+    codes = keys.groupby(DEMAND_KEYS, sort=False, dropna=False, observed=True).ngroup().to_numpy()
+    unique_keys = keys.drop_duplicates()
     
-    for _, row in unique_keys.iterrows():
-        sid = row['Skill_ID']
-        s_name = df_skills[df_skills['Skill_ID'] == sid]['Skill_Name'].values[0]
-        
-        res_row = {
-            'Portfolio': row['Portfolio'],
-            'Team': row['Team'],
-            'Goal': row['Goal'],
-            'Skill Required': s_name,
-            'Level': row['Skill_Level_Needed']
-        }
-        
-        subset = df_pipe[
-            (df_pipe['Portfolio'] == row['Portfolio']) & 
-            (df_pipe['Team'] == row['Team']) & 
-            (df_pipe['Goal'] == row['Goal']) &
-            (df_pipe['Skill_ID'] == sid) & 
-            (df_pipe['Skill_Level_Needed'] == row['Skill_Level_Needed'])
-        ]
-        
-        for m in months:
-            m_end = m + relativedelta(months=1, days=-1)
-            count = 0
-            for _, p in subset.iterrows():
-                if p['Start_Date'] <= m_end and p['End_Date'] >= m:
-                    count += 1
-            res_row[m] = count
-            
-        demand_rows.append(res_row)
-    return pd.DataFrame(demand_rows), months
-
-def generate_heatmap_data(df_res, df_alloc, df_skills):
+    # Rows with a blank key never matched the old equality filter
+    valid = keys.notna().all(axis=1).to_numpy()
+    lo = _month_index(df_pipe['Start_Date'], months[0])
+    hi = _month_index(df_pipe['End_Date'], months[0])
+    if weights is not None:
+        weights = weights[valid]
+    return unique_keys, _overlap_matrix(codes[valid], lo[valid], hi[valid], len(unique_keys), len(months), weights)
+
+def _demand_frame(unique_keys, counts, df_skills, months):
+    skill_names = df_skills.drop_duplicates('Skill_ID').set_index('Skill_ID')['Skill_Name']
+    df_demand = pd.DataFrame({
+        'Portfolio': unique_keys['Portfolio'].to_numpy(),
+        'Team': unique_keys['Team'].to_numpy(),
+        'Goal': unique_keys['Goal'].to_numpy(),
+        'Skill Required': unique_keys['Skill_ID'].map(skill_names).to_numpy(),
+        'Level': unique_keys['Skill_Level_Needed'].to_numpy()
+    })
+    df_month = pd.DataFrame(counts, columns=months)
+    return pd.concat([df_demand, df_month], axis=1)
+
+def generate_demand_plan(df_pipe, df_skills):
+    months = get_month_columns(DEMAND_START, 24)
+    if df_pipe.empty:
+        return pd.DataFrame([]), months
+    unique_keys, counts = _demand_counts(df_pipe, months)
+    return _demand_frame(unique_keys, counts, df_skills, months), months
+
+def _heatmap_load(rids, df_alloc, months, prorate=False):
+    """Load per Resource_ID in rids (rows) x months, in one pass over the allocations"""
+    codes = rids.get_indexer(df_alloc['Resource_ID'])
+    known = codes >= 0
+    weights = df_alloc['Allocation_%'].to_numpy(dtype=float)[known]
+    starts = df_alloc['Start_Date'][known]
+    ends = df_alloc['End_Date'][known]
+    if prorate:
+        return _prorated_matrix(codes[known], starts, ends, len(rids), months, weights)
+    lo = _month_index(starts, months[0])
+    hi = _month_index(ends, months[0])
+    return _overlap_matrix(codes[known], lo, hi, len(rids), len(months), weights)
+
+def _heatmap_frame(df_res, df_skills, rids, load, months):
+    load = load[rids.get_indexer(df_res['Resource_ID'])]
+    skill_names = df_skills.drop_duplicates('Skill_ID').set_index('Skill_ID')['Skill_Name']
+    df_heat = pd.DataFrame({
+        'Resource Name': df_res['Full_Name'].to_numpy(),
+        'Primary Skill': df_res['Skill_ID'].map(skill_names).fillna(df_res['Skill_ID']).to_numpy(),
+        'Manager': df_res['Manager'].to_numpy()
+    })
+    df_month = pd.DataFrame(load, columns=months)
+    return pd.concat([df_heat, df_month], axis=1)
+
+def generate_heatmap_data(df_res, df_alloc, df_skills, prorate=False):
+    """Resource x Month load. prorate=True weights each allocation by the
+    share of days it covers in the month instead of counting any overlap."""
     today = datetime.date.today().replace(day=1)
     months = get_month_columns(today, 12)
-    heatmap_rows = []
-    
-    for _, res in df_res.iterrows():
-        sid = res['Skill_ID']
-        s_series = df_skills[df_skills['Skill_ID'] == sid]['Skill_Name']
-        s_name = s_series.values[0] if not s_series.empty else sid
-        
-        row = {'Resource Name': res['Full_Name'], 'Primary Skill': s_name, 'Manager': res['Manager']}
-        my_allocs = df_alloc[df_alloc['Resource_ID'] == res['Resource_ID']]
-        
-        for m in months:
-            load = 0
-            m_end = m + relativedelta(months=1, days=-1)
-            for _, a in my_allocs.iterrows():
-                if a['Start_Date'] <= m_end and a['End_Date'] >= m:
-                    load += a['Allocation_%']
-            row[m] = load
-        heatmap_rows.append(row)
-    return pd.DataFrame(heatmap_rows), months
+    if df_res.empty:
+        return pd.DataFrame([]), months
+    rids = pd.Index(df_res['Resource_ID'].drop_duplicates())
+    load = _heatmap_load(rids, df_alloc, months, prorate)
+    return _heatmap_frame(df_res, df_skills, rids, load, months), months
+
+def compile_dashboard_data(dfs):
+    """Builds the >> DASHBOARD << rows plus total budget / actuals.
+    Each DB table is grouped by Project_ID once instead of filtered per project."""
+    df_p, df_r, df_a, df_pipe, df_s, df_m, df_u, df_sla, df_fin, df_config = dfs
+    pids = df_p['Project_ID']
+
+    # First update / financial row per project (same as .iloc[0])
+    upd = df_u.drop_duplicates('Project_ID').set_index('Project_ID').reindex(pids)
+    fin = df_fin.drop_duplicates('Project_ID').set_index('Project_ID').reindex(pids)
+
+    # Roadmap Logic
+    delay = (pd.to_datetime(df_m['Forecast_Date']) - pd.to_datetime(df_m['Baseline_Date'])).dt.days
+    icon = pd.Series(np.where(df_m['Status'] == 'Completed', "✅", np.where(delay > 0, "⚠️", "🔵")), index=df_m.index)
+    pct = (df_m['Progress_Pct'] * 100).astype(int).astype(str)
+    m_lines = icon + " " + df_m['Milestone'].astype(str) + " (" + pct + "%)"
+    roadmap = m_lines.groupby(df_m['Project_ID'], sort=False).agg("\n".join)
+
+    # Resource Logic (allocations joined to resources & skills once)
+    allocs = df_a.merge(df_r, on='Resource_ID').merge(df_s, on='Skill_ID')
+    t_lines = "• " + allocs['Full_Name'].astype(str) + " (" + allocs['Skill_Name'].astype(str) + ")"
+    team = t_lines.groupby(allocs['Project_ID'], sort=False).agg("\n".join)
+
+    narrative = "GOAL: " + upd['Goal'].astype(str) + "\nRISK: " + upd['Risks'].astype(str)
+    df_dash = pd.DataFrame({
+        'Project': df_p['Project_Name'].to_numpy(), 'Portfolio': df_p['Portfolio'].to_numpy(),
+        'Team': df_p['Team'].to_numpy(), 'Goal': df_p['Goal'].to_numpy(),
+        'Status': upd['RAG'].to_numpy(), 'Budget_Status': fin['Budget_Status'].to_numpy(),
+        'Roadmap': roadmap.reindex(pids, fill_value="").to_numpy(),
+        'Resources': team.reindex(pids, fill_value="").to_numpy(),
+        'Narrative': narrative.to_numpy()
+    }).sort_values(['Portfolio', 'Team'])
+    return df_dash, fin['Total_Budget'].sum(), fin['Actuals_To_Date'].sum()
+
+def budget_totals(df_p, df_fin):
+    """Total budget / actuals over the first financial row of each project"""
+    fin = df_fin.drop_duplicates('Project_ID').set_index('Project_ID').reindex(df_p['Project_ID'])
+    return fin['Total_Budget'].sum(), fin['Actuals_To_Date'].sum()
+
+def _take_groups(df, groups, keys):
+    """Rows of df whose group key is in keys, in their original order"""
+    idx = [groups[k] for k in keys if k in groups]
+    return df.iloc[np.sort(np.concatenate(idx))] if idx else df.iloc[:0]
+
+def iter_dashboard_rows(dfs, chunk_size=STREAM_CHUNK):
+    """Lazy compile_dashboard_data: yields the sorted rows a chunk of projects at a time"""
+    df_p, df_r, df_a, df_pipe, df_s, df_m, df_u, df_sla, df_fin, df_config = dfs
+    order = df_p.sort_values(['Portfolio', 'Team'])
+    by_pid = [df.groupby('Project_ID', sort=False).indices for df in (df_a, df_m, df_u, df_fin)]
+
+    for start in range(0, len(order), chunk_size):
+        proj = order.iloc[start:start + chunk_size]
+        pids = proj['Project_ID'].unique()
+        a, m, u, fin = (_take_groups(df, g, pids) for df, g in zip((df_a, df_m, df_u, df_fin), by_pid))
+        df_dash, _, _ = compile_dashboard_data((proj, df_r, a, df_pipe, df_s, m, u, df_sla, fin, df_config))
+        yield from df_dash.itertuples(index=False)
+
+def iter_heatmap_rows(df_res, df_alloc, df_skills, prorate=False, chunk_size=STREAM_CHUNK):
+    """Lazy generate_heatmap_data: yields plain row tuples a chunk of resources at a time"""
+    by_rid = df_alloc.groupby('Resource_ID', sort=False).indices
+    for start in range(0, len(df_res), chunk_size):
+        res = df_res.iloc[start:start + chunk_size]
+        alloc = _take_groups(df_alloc, by_rid, res['Resource_ID'].unique())
+        df_heat, _ = generate_heatmap_data(res, alloc, df_skills, prorate)
+        yield from df_heat.itertuples(index=False, name=None)
 
 # ==========================================
-# 4. EXCEL ORCHESTRATION
+# 3b. INCREMENTAL REBUILD (per-project fingerprints)
 # ==========================================
-def create_workbook_v4():
-    dfs = create_database_v4()
+STATE_VERSION = 1
+HEAT_COLS = ['Resource_ID', 'Allocation_%', 'Start_Date', 'End_Date']
+
+def _row_hashes(df):
+    """uint64 per row; date-like columns normalised so date / datetime64 sources hash alike"""
+    dates = {c: pd.to_datetime(df[c]) for c in df.columns
+             if pd.api.types.infer_dtype(df[c], skipna=True) in ('date', 'datetime', 'datetime64')}
+    return pd.util.hash_pandas_object(df.assign(**dates), index=False).to_numpy()
+
+def _ordered_hashes(df, by=None):
+    """Row hashes mixed with each row's position (within its `by` group), so order counts"""
+    pos = df.groupby(by, sort=False, observed=True).cumcount().to_numpy() if by else np.arange(len(df))
+    return pd.util.hash_pandas_object(pd.DataFrame({'h': _row_hashes(df), 'pos': pos}), index=False).to_numpy()
+
+def _occurrence_keys(df):
+    """Row hash + occurrence number, so identical rows stay distinct when diffing"""
+    h = _row_hashes(df)
+    n = pd.Series(h).groupby(h).cumcount().to_numpy()
+    return pd.util.hash_pandas_object(pd.DataFrame({'h': h, 'n': n}), index=False).to_numpy()
+
+def project_fingerprints(dfs):
+    """One uint64 per Project_ID over its rows in DB_Projects, DB_Updates,
+    DB_Milestones, DB_Allocations and DB_Financials"""
     df_p, df_r, df_a, df_pipe, df_s, df_m, df_u, df_sla, df_fin, df_config = dfs
-    
+    pids = pd.Index(df_p['Project_ID'].astype(object))
+    parts = {}
+    for name, df in [('proj', df_p), ('upd', df_u), ('mile', df_m), ('alloc', df_a), ('fin', df_fin)]:
+        h = pd.Series(_ordered_hashes(df, 'Project_ID'), index=df['Project_ID'].astype(object).to_numpy())
+        parts[name] = h.groupby(level=0).sum().reindex(pids, fill_value=0)
+    return pd.Series(pd.util.hash_pandas_object(pd.DataFrame(parts), index=False).to_numpy(), index=pids)
+
+def shared_fingerprint(df_r, df_s):
+    """Resources / skills feed every dashboard and heatmap row; any change means a full rebuild"""
+    h = np.concatenate([_ordered_hashes(df_r), _ordered_hashes(df_s)])
+    return int(pd.util.hash_array(np.append(h, np.uint64(HEATMAP_PRORATE))).sum())
+
+def _changed_rows(state, name, df):
+    """(rows gone since last run, rows added) for one slim table, by occurrence key"""
+    keys = _occurrence_keys(df)
+    old, old_keys = state[name], state[name + '_keys']
+    return old[~np.isin(old_keys, keys)], df[~np.isin(keys, old_keys)], keys
+
+def _signed(gone, added):
+    """Stack removed rows (weight -1) and added rows (weight +1)"""
+    delta = pd.concat([gone.astype(object), added.astype(object)], ignore_index=True)
+    return delta, np.concatenate([-np.ones(len(gone), dtype=np.int64), np.ones(len(added), dtype=np.int64)])
+
+def update_frames_incremental(dfs, state_file):
+    """Dashboard, demand plan and heatmap, recomputing only what changed since the run
+    that wrote state_file. Returns (df_dash, total_budget, total_spent, df_demand, df_heat)."""
+    df_p, df_r, df_a, df_pipe, df_s, df_m, df_u, df_sla, df_fin, df_config = dfs
+    state = pd.read_pickle(state_file) if os.path.exists(state_file) else {}
+    shared = shared_fingerprint(df_r, df_s)
+    if state.get('version') != STATE_VERSION or state.get('shared') != shared:
+        state = {}
+    new_state = {'version': STATE_VERSION, 'shared': shared}
+
+    # --- 1. Dashboard rows: only projects whose fingerprint changed ---
+    fps = project_fingerprints(dfs)
+    pids = fps.index
+    if not pids.is_unique:
+        raise ValueError("Incremental mode needs unique Project_IDs in DB_Projects")
+    if 'fingerprints' in state:
+        prev = state['fingerprints'].astype('UInt64').reindex(pids)
+        changed = pids[prev.ne(fps.astype('UInt64')).fillna(True).to_numpy(dtype=bool)]
+        cached = state['dash'].drop(changed, errors='ignore')
+    else:
+        changed, cached = pids, None
+
+    groups = [df.groupby('Project_ID', sort=False, observed=True).indices for df in (df_a, df_m, df_u, df_fin)]
+    proj = df_p[df_p['Project_ID'].isin(changed)]
+    a, m, u, fin = (_take_groups(df, g, changed) for df, g in zip((df_a, df_m, df_u, df_fin), groups))
+    rows, _, _ = compile_dashboard_data((proj, df_r, a, df_pipe, df_s, m, u, df_sla, fin, df_config))
+    rows.index = proj['Project_ID'].astype(object).to_numpy()[rows.index]
+    rows = rows.astype(object) if cached is None else pd.concat([cached, rows.astype(object)])
+
+    df_dash = rows.reindex(pids).reset_index(drop=True).sort_values(['Portfolio', 'Team'])
+    total_budget, total_spent = budget_totals(df_p, df_fin)
+    new_state.update(fingerprints=fps, dash=rows.reindex(pids))
+
+    # --- 2. Heatmap: recompute only resources with added / removed allocation rows ---
+    months = get_month_columns(datetime.date.today(), 12)
+    rids = pd.Index(df_r['Resource_ID'].drop_duplicates())
+    heat_a = df_a[HEAT_COLS]
+    if state.get('heat_months') == months:
+        gone, added, a_keys = _changed_rows(state, 'heat_alloc', heat_a)
+        load = state['heat_load'].copy()
+        touched = pd.Index(pd.concat([gone['Resource_ID'], added['Resource_ID']]).unique()).intersection(rids)
+        # Rebuilt from their current rows, not patched with +/- deltas: float sums would drift
+        # off the exact full-run values and flip the HEAT_OVER / HEAT_FREE comparisons
+        current = heat_a[heat_a['Resource_ID'].isin(touched)]
+        if len(touched):
+            load[rids.get_indexer(touched)] = _heatmap_load(touched, current, months, HEATMAP_PRORATE)
+        n_alloc = len(current)
+    else:
+        a_keys, load, n_alloc = _occurrence_keys(heat_a), _heatmap_load(rids, heat_a, months, HEATMAP_PRORATE), len(heat_a)
+    df_heat = _heatmap_frame(df_r, df_s, rids, load, months) if len(df_r) else pd.DataFrame([])
+    new_state.update(heat_months=months, heat_load=load, heat_alloc=heat_a, heat_alloc_keys=a_keys)
+
+    # --- 3. Demand plan: apply only added / removed pipeline rows ---
+    d_months = get_month_columns(DEMAND_START, 24)
+    pipe = df_pipe[DEMAND_KEYS + ['Start_Date', 'End_Date']]
+    if 'demand' in state:
+        gone, added, p_keys = _changed_rows(state, 'demand_pipe', pipe)
+        delta, sign = _signed(gone, added)
+        counts = state['demand']
+        if len(delta):
+            d_keys, d_counts = _demand_counts(delta, d_months, sign)
+            d_counts = pd.DataFrame(d_counts, index=pd.MultiIndex.from_frame(d_keys), columns=d_months)
+            counts = counts.add(d_counts, fill_value=0).astype(np.int64)
+        n_pipe = len(delta)
+    else:
+        p_keys, n_pipe = _occurrence_keys(pipe), len(pipe)
+        u_keys, u_counts = _demand_counts(pipe, d_months)
+        counts = pd.DataFrame(u_counts, index=pd.MultiIndex.from_frame(u_keys.astype(object)), columns=d_months)
+    if pipe.empty:
+        df_demand = pd.DataFrame([])
+    else:
+        unique_keys = pipe[DEMAND_KEYS].drop_duplicates()
+        counts = counts.reindex(pd.MultiIndex.from_frame(unique_keys.astype(object)), fill_value=0)
+        df_demand = _demand_frame(unique_keys, counts.to_numpy(), df_s, d_months)
+    new_state.update(demand=counts, demand_pipe=pipe, demand_pipe_keys=p_keys)
+
+    pd.to_pickle(new_state, state_file)
+    print(f"♻️ Incremental: {len(changed)}/{len(pids)} projects, {n_alloc} allocation rows, "
+          f"{n_pipe} pipeline rows recomputed")
+    return df_dash, total_budget, total_spent, df_demand, df_heat
+
+# ==========================================
+# 3c. ON-DISK RESULT CACHE (content-addressed, LRU)
+# ==========================================
+def dataset_key(dfs):
+    """Content hash of the ten input tables plus the settings that change the computed frames"""
+    h = hashlib.sha256()
+    for df in dfs:
+        h.update(repr([str(c) for c in df.columns]).encode())
+        h.update(_ordered_hashes(df).tobytes())
+    h.update(repr((HEATMAP_PRORATE, datetime.date.today().replace(day=1))).encode())
+    return h.hexdigest()[:24]
+
+def _write_frame(df, path):
+    """Arrow IPC (feather) needs string labels: month columns are stored as ISO dates"""
+    out = df.reset_index(drop=True)
+    out.columns = [c.isoformat() if isinstance(c, datetime.date) else str(c) for c in out.columns]
+    out.to_feather(path)
+
+def _read_frame(path):
+    df = pd.read_feather(path)
+    labels = []
+    for c in df.columns:
+        try:
+            labels.append(datetime.date.fromisoformat(c))
+        except ValueError:
+            labels.append(c)
+    df.columns = labels
+    return df
+
+def load_cached_frames(key=None, cache_dir=CACHE_DIR):
+    """(df_dash, total_budget, total_spent, df_demand, df_heat) for a dataset_key, or for the
+    most recently stored entry when key is None. None on a cache miss."""
+    if key is None:
+        latest = os.path.join(cache_dir, 'LATEST')
+        if not os.path.exists(latest):
+            return None
+        with open(latest) as f:
+            key = f.read().strip()
+    entry = os.path.join(cache_dir, key)
+    meta_path = os.path.join(entry, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as f:
+        meta = json.load(f)
+    os.utime(meta_path)  # LRU: mark as recently used
+    frames = [_read_frame(os.path.join(entry, f'{name}.arrow')) for name in ('dash', 'demand', 'heat')]
+    return frames[0], meta['total_budget'], meta['total_spent'], frames[1], frames[2]
+
+def store_cached_frames(key, frames, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """Writes one entry atomically, points LATEST at it and evicts least recently used entries"""
+    df_dash, total_budget, total_spent, df_demand, df_heat = frames
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=cache_dir, prefix='.tmp-')
+    for name, df in (('dash', df_dash), ('demand', df_demand), ('heat', df_heat)):
+        _write_frame(df, os.path.join(tmp, f'{name}.arrow'))
+    with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+        json.dump({'total_budget': float(total_budget), 'total_spent': float(total_spent)}, f)
+    entry = os.path.join(cache_dir, key)
+    if os.path.exists(entry):
+        shutil.rmtree(entry, ignore_errors=True)
+    os.replace(tmp, entry)
+    latest = os.path.join(cache_dir, 'LATEST')
+    with open(latest + '.tmp', 'w') as f:
+        f.write(key)
+    os.replace(latest + '.tmp', latest)
+    _evict_lru(cache_dir, max_bytes, keep=key)
+
+def _evict_lru(cache_dir, max_bytes, keep):
+    entries = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        meta_path = os.path.join(path, 'meta.json')
+        if name == keep or not os.path.exists(meta_path):
+            continue
+        size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+        entries.append((os.path.getmtime(meta_path), size, path))
+    keep_size = sum(os.path.getsize(os.path.join(cache_dir, keep, f)) for f in os.listdir(os.path.join(cache_dir, keep)))
+    total = keep_size + sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+def load_or_compute_frames(dfs, cache_dir=CACHE_DIR):
+    """Computed frames for dfs from the cache, computing and storing them on a miss"""
+    key = dataset_key(dfs)
+    frames = load_cached_frames(key, cache_dir)
+    if frames is not None:
+        print(f"⚡ Cache hit: {key}")
+        return frames
+    df_p, df_r, df_a, df_pipe, df_s, df_m, df_u, df_sla, df_fin, df_config = dfs
+    df_dash, total_budget, total_spent = compile_dashboard_data(dfs)
     df_demand, _ = generate_demand_plan(df_pipe, df_s)
-    df_heat, _ = generate_heatmap_data(df_r, df_a, df_s)
+    df_heat, _ = generate_heatmap_data(df_r, df_a, df_s, prorate=HEATMAP_PRORATE)
+    frames = (df_dash.reset_index(drop=True), total_budget, total_spent, df_demand, df_heat)
+    store_cached_frames(key, frames, cache_dir)
+    return frames
+
+# ==========================================
+# 3d. ENGINES ON THE COMPACT MODEL (no merges, no string keys)
+# ==========================================
+def _values(column, rows=None):
+    """Object / numeric array of a model column, optionally taken at rows (-1 gives NaN)"""
+    if rows is not None:
+        column = pd.api.extensions.take(column, rows, allow_fill=True)
+    return np.asarray(column, dtype=object) if isinstance(column, pd.Categorical) else column
+
+def _follow(lookup, codes, missing=-1):
+    """lookup[codes] for an index array; -1 codes give missing"""
+    return pd.api.extensions.take(lookup, codes, allow_fill=True, fill_value=missing)
+
+def _model_months(dates, start_date):
+    """Month offsets of datetime64[D] dates from start_date (NaT -> None mask)"""
+    months = dates.astype('datetime64[M]').astype(np.int64)
+    return months - ((start_date.year - 1970) * 12 + start_date.month - 1), ~np.isnat(dates)
+
+def _skill_names(model, skill_codes):
+    """Skill_Name for skill codes (NaN where the skill is not in DB_Skills)"""
+    return _values(model['tables']['DB_Skills']['Skill_Name'], _follow(model['index']['skill_row'], skill_codes))
+
+def model_demand_plan(model):
+    """generate_demand_plan on the model: keys are grouped on their codes"""
+    months = get_month_columns(DEMAND_START, 24)
+    pipe = model['tables']['DB_Pipeline']
+    if not len(pipe['Skill_ID']):
+        return pd.DataFrame([]), months
+    key_codes = np.column_stack([pipe['Portfolio'].codes, pipe['Team'].codes, pipe['Goal'].codes,
+                                 pipe['Skill_ID'], pipe['Skill_Level_Needed'].codes]).astype(np.int64)
+    _, first, inverse = np.unique(key_codes, axis=0, return_index=True, return_inverse=True)
+    rank = np.empty(len(first), dtype=np.int64)
+    rank[np.argsort(first)] = np.arange(len(first))  # first-seen order, like drop_duplicates
+    codes, first = rank[inverse.ravel()], np.sort(first)
+
+    lo, lo_ok = _model_months(pipe['Start_Date'], months[0])
+    hi, hi_ok = _model_months(pipe['End_Date'], months[0])
+    valid = (key_codes >= 0).all(axis=1) & lo_ok & hi_ok
+    counts = _overlap_matrix(codes[valid], lo[valid], hi[valid], len(first), len(months))
+    df_demand = pd.DataFrame({
+        'Portfolio': _values(pipe['Portfolio'])[first], 'Team': _values(pipe['Team'])[first],
+        'Goal': _values(pipe['Goal'])[first], 'Skill Required': _skill_names(model, pipe['Skill_ID'][first]),
+        'Level': _values(pipe['Skill_Level_Needed'])[first]
+    })
+    return pd.concat([df_demand, pd.DataFrame(counts, columns=months)], axis=1), months
+
+def model_heatmap(model, prorate=False):
+    """generate_heatmap_data on the model: allocation rows already carry resource codes"""
+    months = get_month_columns(datetime.date.today().replace(day=1), 12)
+    res, alloc = model['tables']['DB_Resources'], model['tables']['DB_Allocations']
+    if not len(res['Resource_ID']):
+        return pd.DataFrame([]), months
+    n_res = model['owned']['resource']
+    codes = model['index']['alloc_resource']
+    known = (codes >= 0) & (codes < n_res)
+    weights = alloc['Allocation_%'][known].astype(np.float64)
+    if prorate:
+        load = _prorated_matrix(codes[known], alloc['Start_Date'][known], alloc['End_Date'][known],
+                                n_res, months, weights)
+    else:
+        lo, lo_ok = _model_months(alloc['Start_Date'][known], months[0])
+        hi, hi_ok = _model_months(alloc['End_Date'][known], months[0])
+        ok = lo_ok & hi_ok
+        load = _overlap_matrix(codes[known][ok], lo[ok], hi[ok], n_res, len(months), weights[ok])
+
+    rcodes = res['Resource_ID']
+    skill = _skill_names(model, res['Skill_ID'])
+    df_heat = pd.DataFrame({
+        'Resource Name': _values(res['Full_Name']),
+        'Primary Skill': np.where(pd.isna(skill), _values(model['dims']['skill'].to_numpy(dtype=object), res['Skill_ID']), skill),
+        'Manager': _values(res['Manager'])
+    })
+    load = np.where((rcodes >= 0)[:, None], load[np.maximum(rcodes, 0)], 0.0) if n_res else np.zeros((len(rcodes), len(months)))
+    return pd.concat([df_heat, pd.DataFrame(load, columns=months)], axis=1), months
+
+def _join_lines(lines, codes, n):
+    """'\\n'.join of lines per code 0..n-1, in row order ('' where a code has none)"""
+    offsets, order = _csr(codes, n)
+    lines = lines[order].tolist()
+    return np.array(["\n".join(lines[a:b]) for a, b in zip(offsets[:-1], offsets[1:])], dtype=object)
+
+def model_dashboard(model):
+    """compile_dashboard_data on the model: joins are index lookups on the precomputed keys"""
+    t, idx = model['tables'], model['index']
+    proj, ms, upd, fin, alloc, res = (t[k] for k in ('DB_Projects', 'DB_Milestones', 'DB_Updates', 'DB_Financials',
+                                                      'DB_Allocations', 'DB_Resources'))
+    n_proj = len(model['dims']['project'])
+    pcodes = proj['Project_ID']
+
+    # Roadmap: one line per milestone, grouped on the project code
+    delay = (ms['Forecast_Date'] - ms['Baseline_Date']).astype('timedelta64[D]')
+    late = ~np.isnat(delay) & (delay > np.timedelta64(0, 'D'))
+    icon = np.where(_values(ms['Status']) == 'Completed', "✅", np.where(late, "⚠️", "🔵"))
+    pct = pd.Series(ms['Progress_Pct'] * 100).astype(int).astype(str)
+    m_lines = icon + " " + pd.Series(_values(ms['Milestone'])).astype(str) + " (" + pct + "%)"
+    roadmap = _join_lines(m_lines.to_numpy(), ms['Project_ID'], n_proj)
+
+    # Resources: allocation -> resource row -> skill row, all precomputed
+    rrow = _follow(idx['resource_row'], idx['alloc_resource'])
+    srow = _follow(idx['skill_row'], _follow(res['Skill_ID'], rrow))
+    staffed = (rrow >= 0) & (srow >= 0)
+    names = pd.Series(_values(res['Full_Name'], rrow[staffed])).astype(str)
+    skills = pd.Series(_values(t['DB_Skills']['Skill_Name'], srow[staffed])).astype(str)
+    t_lines = ("• " + names + " (" + skills + ")").to_numpy()
+    team = _join_lines(t_lines, idx['alloc_project'][staffed], n_proj)
+
+    u_rows, f_rows = _follow(idx['first_update'], pcodes), _follow(idx['first_financial'], pcodes)
+    narrative = ("GOAL: " + pd.Series(_values(upd['Goal'], u_rows)).astype(str) +
+                 "\nRISK: " + pd.Series(_values(upd['Risks'], u_rows)).astype(str))
+    budget, spent = _values(fin['Total_Budget'], f_rows), _values(fin['Actuals_To_Date'], f_rows)
+
+    port, team_cat = proj['Portfolio'], proj['Team']
+    blanks_last = [np.where(c.codes < 0, len(c.categories), c.codes) for c in (team_cat, port)]  # like sort_values
+    order = np.lexsort(blanks_last)
+    df_dash = pd.DataFrame({
+        'Project': _values(proj['Project_Name']), 'Portfolio': _values(port), 'Team': _values(team_cat),
+        'Goal': _values(proj['Goal']), 'Status': _values(upd['RAG'], u_rows),
+        'Budget_Status': _values(fin['Budget_Status'], f_rows),
+        'Roadmap': _follow(roadmap, pcodes, ""), 'Resources': _follow(team, pcodes, ""),
+        'Narrative': narrative.to_numpy()
+    }).iloc[order]
+    return df_dash, np.nansum(budget), np.nansum(spent)
+
+def compute_frames_from_model(model, prorate=HEATMAP_PRORATE):
+    """(df_dash, total_budget, total_spent, df_demand, df_heat), like load_or_compute_frames"""
+    df_dash, total_budget, total_spent = model_dashboard(model)
+    df_demand, _ = model_demand_plan(model)
+    df_heat, _ = model_heatmap(model, prorate)
+    return df_dash, total_budget, total_spent, df_demand, df_heat
+
+# ==========================================
+# 4. EXCEL ORCHESTRATION
+# ==========================================
+EXCEL_EPOCH = pd.Timestamp('1899-12-30')
+RAG_COLOURS = {'Red': ('#FFC7CE', '#9C0006'), 'Amber': ('#FFEB9C', '#9C5700'), 'Green': ('#C6EFCE', '#006100')}
+HEAT_OVER = 1.0  # Heatmap months above this are over-allocated (red)
+HEAT_FREE = 0.8  # ... and below this have free capacity (green)
+STYLES = {
+    'navy': {'bold': True, 'fg_color': '#0F2C4C', 'font_color': 'white', 'border': 1, 'align': 'center'},
+    'grey': {'bold': True, 'fg_color': '#444444', 'font_color': 'white', 'border': 1, 'align': 'center'},
+    'rich': {'text_wrap': True, 'valign': 'top', 'border': 1},
+    'cen': {'align': 'center', 'valign': 'top', 'border': 1},
+    'rich_col': {'text_wrap': True, 'valign': 'top'},  # Column formats: borders come from a range rule
+    'cen_col': {'align': 'center', 'valign': 'top'},
+    'grid': {'border': 1},
+    'money': {'num_format': '$#,##0', 'align': 'center', 'border': 1},
+    'share': {'num_format': '0%', 'border': 1},
+    'pct': {'num_format': '0%', 'align': 'center'},
+    'title': {'bold': True, 'font_size': 20, 'font_color': '#0F2C4C'},
+    'link': {'bold': True, 'font_color': 'blue', 'underline': True, 'font_size': 12},
+    'date': {'num_format': 'yyyy-mm-dd'},
+    'datetime': {'num_format': 'yyyy-mm-dd hh:mm:ss'}
+}
+
+def rag_style(rag, cell=True):
+    """Cell format for a RAG value; cell=False gives the fill / font-only conditional (dxf) version"""
+    bg, font = RAG_COLOURS[rag]
+    props = {'bg_color': bg, 'font_color': font, 'bold': True}
+    return {**props, 'align': 'center', 'border': 1} if cell else props
+
+def format_registry(wb):
+    """fmt(props) -> one shared Format per distinct property set, however often it is asked for"""
+    formats = {}
+    def fmt(props):
+        key = tuple(sorted(props.items()))
+        if key not in formats:
+            formats[key] = wb.add_format(props)
+        return formats[key]
+    return fmt
+
+def db_sheet_formats(wb, fmt=None):
+    """Pre-built cell formats shared by every write_db_sheet call"""
+    fmt = fmt or wb.add_format
+    return {'date': fmt(STYLES['date']), 'datetime': fmt(STYLES['datetime'])}
+
+def add_rag_rules(ws, first_row, col, last_row, fmt, rules, otherwise):
+    """RAG colouring of one column as range rules: each listed value, then `otherwise` for any
+    other non-blank cell (earlier rules win)"""
+    if last_row < first_row:
+        return
+    for rag in rules:
+        ws.conditional_format(first_row, col, last_row, col, {'type': 'cell', 'criteria': 'equal to',
+                                                              'value': f'"{rag}"', 'format': fmt(rag_style(rag, cell=False))})
+    ws.conditional_format(first_row, col, last_row, col, {'type': 'no_blanks', 'format': fmt(rag_style(otherwise, cell=False))})
+
+def set_heat_columns(ws, fmt, first_col, n_months):
+    """% column format for the heatmap months. In constant_memory mode it only reaches rows
+    written after it, so streaming sets it before the first row."""
+    ws.set_column(first_col, first_col + n_months - 1, 11, fmt(STYLES['pct']))
+
+def add_heat_rules(ws, fmt, first_col, n_months):
+    """Utilization colouring of the heatmap months: two range rules over the written rows"""
+    last_col = first_col + n_months - 1
+    last_row = ws.dim_rowmax or 0
+    if last_row < 1:
+        return
+    ws.conditional_format(1, first_col, last_row, last_col, {'type': 'cell', 'criteria': '>', 'value': HEAT_OVER,
+                                                             'format': fmt(rag_style('Red', cell=False))})
+    ws.conditional_format(1, first_col, last_row, last_col, {'type': 'cell', 'criteria': '<', 'value': HEAT_FREE,
+                                                             'format': fmt(rag_style('Green', cell=False))})
+
+def dashboard_blanks(rows):
+    """Dashboard rows with missing values as '' - e.g. Status / Narrative of a project that has
+    no DB_Updates row yet, which xlsxwriter can't write as NaN"""
+    for row in rows:
+        if any(pd.isna(v) for v in row):
+            row = row._replace(**{field: '' for field, v in zip(row._fields, row) if pd.isna(v)})
+        yield row
+
+def _typed_columns(df):
+    """Converts each column once to (kind, values) - a plain list with None for blanks"""
+    cols = []
+    for name in df.columns:
+        s = df[name]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            s = s.astype(object)
+        kind = pd.api.types.infer_dtype(s, skipna=True)
+        if kind in ('date', 'datetime', 'datetime64'):
+            d = pd.to_datetime(s)
+            kind = 'date' if kind == 'date' or (d == d.dt.normalize()).all() else 'datetime'
+            s = (d - EXCEL_EPOCH) / pd.Timedelta(days=1)
+        elif kind in ('integer', 'floating', 'mixed-integer-float', 'decimal'):
+            kind = 'number'
+        elif kind == 'boolean':
+            kind = 'bool'
+        elif kind not in ('string', 'empty'):
+            kind = 'any'
+        values = s.astype(object).where(s.notna(), None).tolist()
+        cols.append((kind, values))
+    return cols
+
+def write_db_sheet(wb, df, name, formats, table=True, formulas=None):
+    """Bulk DB tab writer: one typed write call per cell, formats built once.
+    Writes row by row when the workbook is in constant_memory mode.
+    formulas: {row: [(column, formula)]} (read_workbook_tables) written over those cells,
+    with the value as the cached result."""
+    ws = wb.add_worksheet(name)
+    (max_row, max_col) = df.shape
+    headers = [str(col) for col in df.columns]
+    if table and not ws.constant_memory:
+        ws.add_table(0, 0, max_row, max_col - 1, {'columns': [{'header': h} for h in headers]})
+    else:
+        # add_table() isn't available in constant_memory mode; fall back to a filter
+        ws.write_row(0, 0, headers)
+        if table:
+            ws.autofilter(0, 0, max_row, max_col - 1)
+
+    writers = {
+        'number': (ws.write_number, None), 'date': (ws.write_number, formats['date']),
+        'datetime': (ws.write_number, formats['datetime']), 'bool': (ws.write_boolean, None),
+        'string': (ws.write_string, None), 'empty': (ws.write_string, None), 'any': (ws.write, None)
+    }
+    def typed(frame):
+        return [(col, *writers[kind], values) for col, (kind, values) in enumerate(_typed_columns(frame))]
+
+    formulas = formulas or {}
+    def write_formulas(row, columns, offset=0):
+        for label, formula in formulas.get(row, ()):
+            if label not in df.columns:
+                continue
+            col = df.columns.get_loc(label)
+            _, _, fmt, values = columns[col]
+            ws.write_formula(row + 1, col, formula, fmt, values[row - offset] if values[row - offset] is not None else 0)
+
+    if ws.constant_memory:
+        # Rows are flushed as soon as the next one starts: go row-major, a chunk at a time
+        for start in range(0, max_row, STREAM_CHUNK):
+            columns = typed(df.iloc[start:start + STREAM_CHUNK])
+            for row in range(len(columns[0][3])):
+                for col, write, fmt, values in columns:
+                    v = values[row]
+                    if v is not None:
+                        write(start + row + 1, col, v, fmt)
+                if formulas:
+                    write_formulas(start + row, columns, start)
+    else:
+        columns = typed(df)
+        for col, write, fmt, values in columns:
+            for row, v in enumerate(values, 1):
+                if v is not None:
+                    write(row, col, v, fmt)
+        for row in formulas:
+            write_formulas(row, columns)
+    return ws
+
+def write_stream_sheet(wb, name, columns, rows, f_date, setup=None):
+    """Header + an iterable of row tuples, written strictly top to bottom.
+    Headers are plain like to_excel's; NaN / NaT cells are left blank as to_excel leaves them.
+    setup(ws) runs before any row is written (column formats, in constant_memory mode)."""
+    ws = wb.add_worksheet(name)
+    if setup:
+        setup(ws)
+    for col, label in enumerate(columns):
+        if isinstance(label, datetime.date):
+            ws.write_datetime(0, col, label, f_date)
+        else:
+            ws.write(0, col, label)
+    for idx, row in enumerate(rows, 1):
+        ws.write_row(idx, 0, [None if pd.isna(value) else value for value in row])
+    return ws
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+# ==========================================
+# 4a. STAGE PROFILING (wall / CPU / memory / rows per stage)
+# ==========================================
+_PROFILE = {'on': False}
+
+def start_profiling(out=None, cprofile_stage=None, memory=PROFILE_MEMORY):
+    """Turns stage instrumentation on for this process.
+    out: JSON / Chrome trace path written by finish_profiling (None = summary only).
+    cprofile_stage: name of one stage to run under cProfile."""
+    tracing = memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    _PROFILE.update(on=True, out=out, cprofile=cprofile_stage, memory=memory, tracing=tracing,
+                    stages=[], stack=[], origin=time.perf_counter())
+
+def profiling_from_env():
+    """start_profiling() driven by PORTFOLIO_PROFILE / PORTFOLIO_PROFILE_STAGE; True if it was switched on"""
+    value = os.environ.get(PROFILE_ENV, '')
+    stage_name = os.environ.get(PROFILE_STAGE_ENV) or None
+    if value in ('', '0') and not stage_name:
+        return False
+    start_profiling(None if value in ('', '0', '1') else value, stage_name)
+    return True
+
+def stop_profiling():
+    """Drops instrumentation without reporting (forked workers inherit the parent's state)"""
+    if _PROFILE.get('tracing'):
+        tracemalloc.stop()
+    _PROFILE.clear()
+    _PROFILE['on'] = False
+
+@contextmanager
+def stage(name, rows=None):
+    """Records wall time, CPU time, peak traced memory and a row count for the block.
+    Yields the record so rows can be filled in once known. Stages nest; a parent's peak
+    includes its children's. Costs one dict when profiling is off."""
+    rec = {'stage': name, 'rows': rows}
+    if not _PROFILE['on']:
+        yield rec
+        return
+    stack = _PROFILE['stack']
+    if _PROFILE['memory']:
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1]['_peak'] = max(stack[-1]['_peak'], peak)
+        tracemalloc.reset_peak()
+        rec.update(_base=current, _peak=current)
+    rec['depth'] = len(stack)
+    stack.append(rec)
+    prof = cProfile.Profile() if name == _PROFILE['cprofile'] else None
+    start, cpu = time.perf_counter(), time.process_time()
+    if prof:
+        prof.enable()
+    try:
+        yield rec
+    finally:
+        if prof:
+            prof.disable()
+        rec.update(start_s=start - _PROFILE['origin'], wall_s=time.perf_counter() - start, cpu_s=time.process_time() - cpu)
+        stack.pop()
+        if _PROFILE['memory']:
+            peak = max(rec.pop('_peak'), tracemalloc.get_traced_memory()[1])
+            rec['peak_mb'] = (peak - rec.pop('_base')) / (1024 * 1024)
+            if stack:
+                stack[-1]['_peak'] = max(stack[-1]['_peak'], peak)
+        rec['rss_mb'] = peak_rss_mb()
+        _PROFILE['stages'].append(rec)
+        if prof:
+            _report_cprofile(prof, name)
+
+def _report_cprofile(prof, name):
+    """Dumps profile_<stage>.prof next to the --profile output (the temp directory without one)"""
+    out = _PROFILE.get('out')
+    folder = os.path.dirname(os.path.abspath(out)) if out else tempfile.gettempdir()
+    path = os.path.join(folder, f"profile_{re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_')}.prof")
+    prof.dump_stats(path)
+    print(f"🔬 cProfile of '{name}' (top {PROFILE_TOP} by cumulative time, full stats in {path}):")
+    pstats.Stats(prof).sort_stats('cumulative').print_stats(PROFILE_TOP)
+
+def profile_table(stages):
+    """Stage records -> display frame; share is each stage's part of the top-level wall time"""
+    df = pd.DataFrame(stages, columns=['stage', 'depth', 'rows', 'wall_s', 'cpu_s', 'peak_mb', 'rss_mb'])
+    total = df.loc[df['depth'] == 0, 'wall_s'].sum()
+    df['share'] = df['wall_s'] / total if total else 0.0
+    df['stage'] = ['  ' * d + s for d, s in zip(df['depth'], df['stage'])]
+    return df.drop(columns='depth')
+
+def chrome_trace(stages):
+    """Complete ('X') trace events, loadable in chrome://tracing or ui.perfetto.dev"""
+    pid = os.getpid()
+    events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': 'create_workbook_v4'}}]
+    for rec in stages:
+        args = {k: rec[k] for k in ('rows', 'cpu_s', 'peak_mb', 'rss_mb') if rec.get(k) is not None}
+        events.append({'name': rec['stage'], 'cat': 'stage', 'ph': 'X', 'pid': pid, 'tid': 0,
+                       'ts': round(rec['start_s'] * 1e6), 'dur': round(rec['wall_s'] * 1e6), 'args': args})
+    return events
+
+def write_profile(stages, path):
+    """One file for both readers: 'stages' for scripts, 'traceEvents' for the trace viewers"""
+    doc = {'traceEvents': chrome_trace(stages), 'displayTimeUnit': 'ms',
+           'stages': stages,
+           'otherData': {'created': datetime.datetime.now().isoformat(timespec='seconds'),
+                         'python': sys.version.split()[0], 'pandas': pd.__version__, 'pid': os.getpid()}}
+    with open(path, 'w') as f:
+        json.dump(doc, f, indent=1, default=str)
+
+def finish_profiling(report=True):
+    """Prints the stage table, writes the profile file if one was asked for and turns profiling off"""
+    if not _PROFILE['on']:
+        return None
+    stages = sorted(_PROFILE['stages'], key=lambda r: r['start_s'])
+    out, wanted = _PROFILE['out'], _PROFILE['cprofile']
+    stop_profiling()
+    if not stages or not report:
+        return stages
+    table = profile_table(stages)
+    width = table['stage'].str.len().max()
+    print("⏱️  Stage profile:")
+    print(table.to_string(index=False, na_rep='-', justify='left', formatters={'stage': lambda v: v.ljust(width),
+        'rows': lambda v: '-' if pd.isna(v) else f"{int(v):,}", 'wall_s': '{:.3f}'.format, 'cpu_s': '{:.3f}'.format,
+        'peak_mb': '{:.1f}'.format, 'rss_mb': '{:.0f}'.format, 'share': '{:.1%}'.format}))
+    if wanted and wanted not in {rec['stage'] for rec in stages}:
+        print(f"⚠️  No stage named '{wanted}'. Stages: {', '.join(dict.fromkeys(rec['stage'] for rec in stages))}")
+    if out:
+        write_profile(stages, out)
+        print(f"💾 Saved stage profile to {out} (Chrome trace: open in chrome://tracing or ui.perfetto.dev)")
+    return stages
+
+def _load_tables(source):
+    with stage('load_database_v4' if source else 'create_database_v4') as rec:
+        dfs = load_database_v4(source) if source else create_database_v4()
+        rec['rows'] = sum(len(df) for df in dfs)
+    return dfs
+
+def create_workbook_v4(source=None, streaming=False, incremental=False, cached=False, compact=False, dfs=None, output_file=None, frames=None, range_formats=False, formulas=None):
+    """source: folder / workbook for load_database_v4 (None = mock data).
+    streaming=True writes every sheet in constant_memory order, computing the
+    dashboard and heatmap rows lazily instead of building the full frames.
+    incremental=True reuses STATE_FILE and only recomputes what changed.
+    cached=True reads / stores the computed frames in CACHE_DIR.
+    compact=True computes the frames on the columnar model (build_model) instead of the DataFrames.
+    dfs / output_file override the loaded tables and OUTPUT_FILE (used by the batch build).
+    frames: (df_dash, total_budget, total_spent, df_demand, df_heat) computed elsewhere (portfolio-pipeline.py).
+    range_formats=True colours RAG / utilization with column formats and conditional-format ranges
+    instead of choosing a format per cell (also colours the heatmap).
+    formulas: {table: {row: [(column, formula)]}} DB cells to write as formulas (refresh_workbook).
+    frames / compact / cached / incremental are alternative ways to get the frames: pass at most one."""
+    chosen = [name for name, on in (('frames', frames is not None), ('compact', compact), ('cached', cached),
+                                    ('incremental', incremental)) if on]
+    if len(chosen) > 1:
+        raise ValueError(f"Pick one way to compute the frames, got: {', '.join(chosen)}")
+    if dfs is None:
+        dfs = _load_tables(source)
+    output_file = output_file or OUTPUT_FILE
+    df_p, df_r, df_a, df_pipe, df_s, df_m, df_u, df_sla, df_fin, df_config = dfs
     
-    writer = pd.ExcelWriter(OUTPUT_FILE, engine='xlsxwriter')
+    precomputed = frames is not None or cached or incremental or compact
+    if frames is not None:
+        df_dash, total_budget, total_spent, df_demand, df_heat = frames
+    elif compact:
+        with stage('build_model', sum(len(df) for df in dfs)):
+            model = build_model(dfs)
+        with stage('compute_frames_from_model', len(df_p)):
+            df_dash, total_budget, total_spent, df_demand, df_heat = compute_frames_from_model(model)
+    elif cached:
+        with stage('load_or_compute_frames', len(df_p)):
+            df_dash, total_budget, total_spent, df_demand, df_heat = load_or_compute_frames(dfs)
+    elif incremental:
+        with stage('update_frames_incremental', len(df_p)):
+            df_dash, total_budget, total_spent, df_demand, df_heat = update_frames_incremental(dfs, STATE_FILE)
+    else:
+        with stage('generate_demand_plan') as rec:
+            df_demand, _ = generate_demand_plan(df_pipe, df_s)
+            rec['rows'] = len(df_demand)
+        if not streaming:
+            with stage('generate_heatmap_data', len(df_r)):
+                df_heat, _ = generate_heatmap_data(df_r, df_a, df_s, prorate=HEATMAP_PRORATE)
+    if streaming:
+        writer = pd.ExcelWriter(output_file, engine='xlsxwriter', engine_kwargs={'options': {'constant_memory': True}})
+    else:
+        writer = pd.ExcelWriter(output_file, engine='xlsxwriter')
     wb = writer.book
+    fmt = format_registry(wb)
+    f_db = db_sheet_formats(wb, fmt)
 
     # --- FORMATS ---
-    f_navy = wb.add_format({'bold': True, 'fg_color': '#0F2C4C', 'font_color': 'white', 'border': 1, 'align': 'center'})
-    f_grey = wb.add_format({'bold': True, 'fg_color': '#444444', 'font_color': 'white', 'border': 1, 'align': 'center'})
-    f_rich = wb.add_format({'text_wrap': True, 'valign': 'top', 'border': 1})
-    f_cen = wb.add_format({'align': 'center', 'valign': 'top', 'border': 1})
-    f_money = wb.add_format({'num_format': '$#,##0', 'align': 'center', 'border': 1})
+    f_navy = fmt(STYLES['navy'])
+    f_grey = fmt(STYLES['grey'])
+    f_rich = fmt(STYLES['rich'])
+    f_cen = fmt(STYLES['cen'])
+    f_money = fmt(STYLES['money'])
     
-    rag_red = wb.add_format({'bg_color': '#FFC7CE', 'font_color': '#9C0006', 'bold': True, 'align': 'center', 'border': 1})
-    rag_grn = wb.add_format({'bg_color': '#C6EFCE', 'font_color': '#006100', 'bold': True, 'align': 'center', 'border': 1})
-    rag_amb = wb.add_format({'bg_color': '#FFEB9C', 'font_color': '#9C5700', 'bold': True, 'align': 'center', 'border': 1})
+    rag_red = fmt(rag_style('Red'))
+    rag_grn = fmt(rag_style('Green'))
+    rag_amb = fmt(rag_style('Amber'))
     
     # --- 0. NAVIGATION / HOME TAB ---
     ws_nav = wb.add_worksheet(">> HOME <<")
     ws_nav.hide_gridlines(2)
-    ws_nav.write('B2', "PORTFOLIO MANAGEMENT SYSTEM v4.0", wb.add_format({'bold': True, 'font_size': 20, 'font_color': '#0F2C4C'}))
+    ws_nav.write('B2', "PORTFOLIO MANAGEMENT SYSTEM v4.0", fmt(STYLES['title']))
     
     nav_buttons = [
         ('>> DASHBOARD <<', 'View Executive Report'),
@@ -299,98 +1385,107 @@ def create_workbook_v4():
     row = 4
     for sheet, desc in nav_buttons:
         # Create "Button" look with hyperlink
-        ws_nav.write_url(row, 1, f"internal:'{sheet}'!A1", string=sheet, cell_format=wb.add_format({'bold': True, 'font_color': 'blue', 'underline': True, 'font_size': 12}))
+        ws_nav.write_url(row, 1, f"internal:'{sheet}'!A1", string=sheet, cell_format=fmt(STYLES['link']))
         ws_nav.write(row, 2, desc)
         row += 1
 
     # --- 1. DASHBOARD ---
-    # Aggregate Data
-    dash_rows = []
-    total_budget = 0
-    total_spent = 0
-    
-    for _, p in df_p.iterrows():
-        pid = p['Project_ID']
-        upd = df_u[df_u['Project_ID'] == pid].iloc[0]
-        fin = df_fin[df_fin['Project_ID'] == pid].iloc[0]
-        
-        total_budget += fin['Total_Budget']
-        total_spent += fin['Actuals_To_Date']
-        
-        # Roadmap Logic
-        m_rows = df_m[df_m['Project_ID'] == pid]
-        m_lines = []
-        for _, m in m_rows.iterrows():
-            d = (m['Forecast_Date'] - m['Baseline_Date']).days
-            icon = "✅" if m['Status'] == 'Completed' else ("⚠️" if d > 0 else "🔵")
-            m_lines.append(f"{icon} {m['Milestone']} ({int(m['Progress_Pct']*100)}%)")
-        
-        # Resource Logic
-        allocs = df_a[df_a['Project_ID'] == pid].merge(df_r, on='Resource_ID').merge(df_s, on='Skill_ID')
-        t_lines = [f"• {r['Full_Name']} ({r['Skill_Name']})" for _, r in allocs.iterrows()]
-        
-        dash_rows.append({
-            'Project': p['Project_Name'], 'Portfolio': p['Portfolio'], 'Team': p['Team'], 'Goal': p['Goal'],
-            'Status': upd['RAG'], 'Budget_Status': fin['Budget_Status'], 
-            'Roadmap': "\n".join(m_lines), 'Resources': "\n".join(t_lines),
-            'Narrative': f"GOAL: {upd['Goal']}\nRISK: {upd['Risks']}"
-        })
-        
-    df_dash = pd.DataFrame(dash_rows).sort_values(['Portfolio', 'Team'])
+    if precomputed:
+        n_projects, dash_rows = len(df_dash), df_dash.itertuples(index=False)
+    elif streaming:
+        total_budget, total_spent = budget_totals(df_p, df_fin)
+        n_projects, dash_rows = len(df_p), iter_dashboard_rows(dfs)
+    else:
+        with stage('compile_dashboard_data', len(df_p)):
+            df_dash, total_budget, total_spent = compile_dashboard_data(dfs)
+        n_projects, dash_rows = len(df_dash), df_dash.itertuples(index=False)
     
-    ws_dash = wb.add_worksheet(">> DASHBOARD <<")
+    dash_rows = dashboard_blanks(dash_rows)
+    with stage('sheet:DASHBOARD', n_projects):
+        ws_dash = wb.add_worksheet(">> DASHBOARD <<")
     
-    # EXECUTIVE SUMMARY HEADER
-    ws_dash.merge_range('A1:C1', "EXECUTIVE SUMMARY", f_navy)
-    ws_dash.write('A2', "Total Projects:", f_cen)
-    ws_dash.write('B2', len(df_dash), f_rich)
-    ws_dash.write('A3', "Total Budget:", f_cen)
-    ws_dash.write('B3', total_budget, f_money)
-    ws_dash.write('A4', "Budget Utilized:", f_cen)
-    ws_dash.write('B4', total_spent / total_budget if total_budget else 0, wb.add_format({'num_format': '0%', 'border': 1}))
+        # EXECUTIVE SUMMARY HEADER
+        ws_dash.merge_range('A1:C1', "EXECUTIVE SUMMARY", f_navy)
+        ws_dash.write('A2', "Total Projects:", f_cen)
+        ws_dash.write('B2', n_projects, f_rich)
+        ws_dash.write('A3', "Total Budget:", f_cen)
+        ws_dash.write('B3', total_budget, f_money)
+        ws_dash.write('A4', "Budget Utilized:", f_cen)
+        ws_dash.write('B4', total_spent / total_budget if total_budget else 0, fmt(STYLES['share']))
     
-    # Table Header
-    start_row = 6
-    cols = ['Project', 'Portfolio', 'Team', 'Goal', 'Status', 'Budget_Status', 'Roadmap', 'Resources', 'Narrative']
-    ws_dash.write_row(start_row, 0, cols, f_navy)
+        # Table Header
+        start_row = 6
+        cols = ['Project', 'Portfolio', 'Team', 'Goal', 'Status', 'Budget_Status', 'Roadmap', 'Resources', 'Narrative']
+        ws_dash.write_row(start_row, 0, cols, f_navy)
     
-    for idx, row in enumerate(df_dash.itertuples(index=False), start_row + 1):
-        ws_dash.write(idx, 0, row.Project, f_rich)
-        ws_dash.write(idx, 1, row.Portfolio, f_cen)
-        ws_dash.write(idx, 2, row.Team, f_cen)
-        ws_dash.write(idx, 3, row.Goal, f_cen)
+        if range_formats:
+            # Column formats carry alignment / wrapping; borders and RAG colours are range rules
+            ws_dash.set_column('A:A', 25, fmt(STYLES['rich_col']))
+            ws_dash.set_column('B:F', None, fmt(STYLES['cen_col']))
+            ws_dash.set_column('G:I', 30, fmt(STYLES['rich_col']))
+            write = ws_dash.write_string  # Every dashboard column is text
+            for idx, row in enumerate(dash_rows, start_row + 1):
+                for col, value in enumerate(row):
+                    write(idx, col, value)
+            last_row = start_row + n_projects
+            if n_projects:
+                ws_dash.conditional_format(start_row + 1, 0, last_row, len(cols) - 1,
+                                           {'type': 'formula', 'criteria': 'TRUE', 'format': fmt(STYLES['grid'])})
+            add_rag_rules(ws_dash, start_row + 1, 4, last_row, fmt, ['Red', 'Green'], 'Amber')
+            add_rag_rules(ws_dash, start_row + 1, 5, last_row, fmt, ['Green'], 'Amber')
+        else:
+            for idx, row in enumerate(dash_rows, start_row + 1):
+                ws_dash.write(idx, 0, row.Project, f_rich)
+                ws_dash.write(idx, 1, row.Portfolio, f_cen)
+                ws_dash.write(idx, 2, row.Team, f_cen)
+                ws_dash.write(idx, 3, row.Goal, f_cen)
         
-        ws_dash.write(idx, 4, row.Status, rag_grn if row.Status=='Green' else (rag_red if row.Status=='Red' else rag_amb))
-        ws_dash.write(idx, 5, row.Budget_Status, rag_grn if row.Budget_Status=='Green' else rag_amb)
+                ws_dash.write(idx, 4, row.Status, rag_grn if row.Status=='Green' else (rag_red if row.Status=='Red' else rag_amb if row.Status else f_cen))
+                ws_dash.write(idx, 5, row.Budget_Status, rag_grn if row.Budget_Status=='Green' else rag_amb if row.Budget_Status else f_cen)
         
-        ws_dash.write(idx, 6, row.Roadmap, f_rich)
-        ws_dash.write(idx, 7, row.Resources, f_rich)
-        ws_dash.write(idx, 8, row.Narrative, f_rich)
+                ws_dash.write(idx, 6, row.Roadmap, f_rich)
+                ws_dash.write(idx, 7, row.Resources, f_rich)
+                ws_dash.write(idx, 8, row.Narrative, f_rich)
         
-    ws_dash.set_column('A:A', 25)
-    ws_dash.set_column('G:I', 30)
+            ws_dash.set_column('A:A', 25)
+            ws_dash.set_column('G:I', 30)
 
     # --- 2. DEMAND PLAN & HEATMAP (Standard) ---
-    ws_dem = wb.add_worksheet(">> DEMAND_PLAN <<")
-    df_demand.to_excel(writer, sheet_name=">> DEMAND_PLAN <<", index=False) # Simplified for brevity, add formatting as needed
-    
-    ws_heat = wb.add_worksheet(">> RES_HEATMAP <<")
-    df_heat.to_excel(writer, sheet_name=">> RES_HEATMAP <<", index=False)
+    if streaming:
+        with stage('sheet:DEMAND_PLAN', len(df_demand)):
+            write_stream_sheet(wb, ">> DEMAND_PLAN <<", df_demand.columns, df_demand.itertuples(index=False, name=None), f_db['date'])
+        heat_cols = ['Resource Name', 'Primary Skill', 'Manager'] + get_month_columns(datetime.date.today(), 12)
+        if precomputed:
+            heat_rows = df_heat.itertuples(index=False, name=None)
+        else:
+            heat_rows = iter_heatmap_rows(df_r, df_a, df_s, prorate=HEATMAP_PRORATE)
+        with stage('sheet:RES_HEATMAP', len(df_r)):
+            n_months = len(heat_cols) - 3
+            setup = (lambda ws: set_heat_columns(ws, fmt, 3, n_months)) if range_formats else None
+            ws_heat = write_stream_sheet(wb, ">> RES_HEATMAP <<", heat_cols, heat_rows, f_db['date'], setup)
+            if range_formats:
+                add_heat_rules(ws_heat, fmt, 3, n_months)
+    else:
+        with stage('sheet:DEMAND_PLAN', len(df_demand)):
+            ws_dem = wb.add_worksheet(">> DEMAND_PLAN <<")
+            df_demand.to_excel(writer, sheet_name=">> DEMAND_PLAN <<", index=False) # Simplified for brevity, add formatting as needed
+        
+        with stage('sheet:RES_HEATMAP', len(df_heat)):
+            ws_heat = wb.add_worksheet(">> RES_HEATMAP <<")
+            df_heat.to_excel(writer, sheet_name=">> RES_HEATMAP <<", index=False)
+            if range_formats:
+                set_heat_columns(ws_heat, fmt, 3, df_heat.shape[1] - 3)
+                add_heat_rules(ws_heat, fmt, 3, df_heat.shape[1] - 3)
 
     # --- 3. DB TABS (With Tables & Validation) ---
     
     # Helper to add table
-    def add_db_sheet(df, name):
-        df.to_excel(writer, sheet_name=name, index=False)
-        ws = writer.sheets[name]
-        (max_row, max_col) = df.shape
-        options = {'columns': [{'header': col} for col in df.columns]}
-        ws.add_table(0, 0, max_row, max_col - 1, options)
-        return ws
+    def add_db_sheet(df, name, table=True):
+        with stage(f'sheet:{name}', len(df)):
+            return write_db_sheet(wb, df, name, f_db, table=table, formulas=(formulas or {}).get(name))
         
     # Config (Hidden)
-    df_config.to_excel(writer, sheet_name="DB_Config", index=False)
-    writer.sheets['DB_Config'].hide()
+    add_db_sheet(df_config, "DB_Config", table=False).hide()
     # Define Named Ranges for Validation
     wb.define_name('List_Goals', '=DB_Config!$A$2:$A$33')
     
@@ -419,8 +1514,170 @@ def create_workbook_v4():
     add_db_sheet(df_u, "DB_Updates")
     add_db_sheet(df_sla, "DB_SLA")
 
-    writer.close()
-    print(f"✅ Generated v4 System: {OUTPUT_FILE}")
+    with stage('writer.close'):
+        writer.close()
+    peak = peak_rss_mb()
+    print(f"✅ Generated v4 System: {output_file}" + (f" (peak RSS {peak:,.0f} MB)" if peak else ""))
+
+# ==========================================
+# 4b. HEADLESS REFRESH (GenerateFullReport_v4 without Excel)
+# ==========================================
+DERIVED_SHEETS = ['>> HOME <<', '>> DASHBOARD <<', '>> DEMAND_PLAN <<', '>> RES_HEATMAP <<']
+
+def refresh_output_name(path):
+    """Edited.xlsx -> Edited_refreshed.xlsx, next to it"""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}_refreshed{ext}"
+
+def refresh_workbook(path, output_file=None, streaming=False, range_formats=False, force=False):
+    """Reads the (edited) DB_* tabs of a v4 workbook, recomputes the dashboard, demand plan
+    and heatmap on the compact model and writes them next to the DB tabs as the user left them,
+    formula cells included (written back as formulas, Excel recalculates them on open).
+    output_file defaults to refresh_output_name(path), so the edited workbook is kept. Writing
+    over `path` itself is refused when tabs outside the v4 layout would be lost, unless force=True."""
+    start = time.perf_counter()
+    target = output_file or refresh_output_name(path)
+    wb = openpyxl.load_workbook(path, read_only=True)
+    dropped = [name for name in wb.sheetnames if name not in DB_SCHEMA and name not in DERIVED_SHEETS]
+    wb.close()
+    in_place = os.path.exists(target) and os.path.samefile(target, path)
+    if dropped and in_place and not force:
+        raise ValueError(f"Refreshing {path} in place would delete tabs outside the v4 layout: "
+                         f"{', '.join(dropped)}. Write to another file or pass --force.")
+
+    with stage('read_workbook_tables') as rec:
+        dfs, formulas = read_workbook_tables(path, keep_formulas=True)
+        rec['rows'] = sum(len(df) for df in dfs)
+    core = tuple(df[DB_SCHEMA[table][0]] for table, df in zip(DB_SCHEMA, dfs))  # Engines see schema columns only
+    with stage('build_model', rec['rows']):
+        model = build_model(core)
+    with stage('compute_frames_from_model', len(core[0])):
+        frames = compute_frames_from_model(model)
+
+    stem, ext = os.path.splitext(target)
+    staging = f"{stem}.refresh{ext}"
+    create_workbook_v4(dfs=dfs, output_file=staging, frames=frames, streaming=streaming,
+                       range_formats=range_formats, formulas=formulas)
+    os.replace(staging, target)
+    if dropped:
+        print(f"⚠️  Not carried over (not a v4 tab): {', '.join(dropped)}" + ("" if in_place else f" - still in {path}"))
+    n_formulas = sum(len(cells) for rows in formulas.values() for cells in rows.values())
+    if n_formulas:
+        print(f"🧮 Kept {n_formulas} formula cell(s) in {', '.join(formulas)}")
+    print(f"🔄 Refreshed {target} from {path} in {time.perf_counter() - start:.1f}s")
+    return target
+
+# ==========================================
+# 5. BATCH BUILD (one workbook per Portfolio / Team)
+# ==========================================
+_SHARED = {}
+
+def partition_file_name(key, base=OUTPUT_FILE, taken=None):
+    """'Data & AI' -> Dynamic_Portfolio_Master_v4_Data_AI.xlsx. Names already in `taken`
+    ('Data & AI' and 'Data AI' both map to _Data_AI) get a _2, _3 ... suffix; taken is updated."""
+    stem, ext = os.path.splitext(base)
+    name = f"{stem}_{re.sub(r'[^A-Za-z0-9]+', '_', str(key)).strip('_')}"
+    path, n = name + ext, 1
+    while taken is not None and path.lower() in taken:  # lower(): case-insensitive file systems
+        n += 1
+        path = f"{name}_{n}{ext}"
+    if taken is not None:
+        taken.add(path.lower())
+    return path
+
+def partition_database(dfs, by='Portfolio'):
+    """Splits the tables into one set per Portfolio / Team value, grouping each table once.
+    Project tables follow DB_Projects, DB_Pipeline uses its own column and DB_Resources keeps
+    the resources allocated in the partition. DB_Skills / DB_Config are shared and left out.
+    resource_allocations holds every allocation of those resources, in any partition, so the
+    heatmap shows their full load rather than only this partition's share.
+    Yields (key, (projects, resources, allocations, pipeline, milestones, updates, sla, financials,
+    resource_allocations))."""
+    df_p, df_r, df_a, df_pipe, df_s, df_m, df_u, df_sla, df_fin, df_config = dfs
+    key_of = df_p.drop_duplicates('Project_ID').set_index('Project_ID')[by].astype(object)
+    p_groups = df_p.groupby(by, observed=True).indices
+    pipe_groups = df_pipe.groupby(by, observed=True).indices
+    linked = [(df, df.groupby(df['Project_ID'].map(key_of)).indices) for df in (df_a, df_m, df_u, df_sla, df_fin)]
+    none = np.array([], dtype=np.int64)
+
+    for key in sorted(set(p_groups) | set(pipe_groups)):
+        a, m, u, sla, fin = (df.iloc[g.get(key, none)] for df, g in linked)
+        ids = a['Resource_ID'].unique()
+        res, res_alloc = df_r[df_r['Resource_ID'].isin(ids)], df_a[df_a['Resource_ID'].isin(ids)]
+        yield key, (df_p.iloc[p_groups.get(key, none)], res, a, df_pipe.iloc[pipe_groups.get(key, none)], m, u, sla, fin, res_alloc)
+
+def _init_worker(df_skills, df_config):
+    """Shared tables arrive once per worker process, not once per workbook"""
+    stop_profiling()
+    _SHARED.update(skills=df_skills, config=df_config)
+
+def _build_partition(key, tables, output_file, streaming, range_formats=False):
+    df_p, df_r, df_a, df_pipe, df_m, df_u, df_sla, df_fin, res_alloc = tables
+    df_s = _SHARED['skills']
+    dfs = (df_p, df_r, df_a, df_pipe, df_s, df_m, df_u, df_sla, df_fin, _SHARED['config'])
+    # The heatmap counts the resources' allocations everywhere, so the frames are computed here
+    df_dash, total_budget, total_spent = compile_dashboard_data(dfs)
+    df_demand, _ = generate_demand_plan(df_pipe, df_s)
+    df_heat, _ = generate_heatmap_data(df_r, res_alloc, df_s, prorate=HEATMAP_PRORATE)
+    create_workbook_v4(dfs=dfs, output_file=output_file, streaming=streaming, range_formats=range_formats,
+                       frames=(df_dash, total_budget, total_spent, df_demand, df_heat))
+    return key, output_file
+
+def create_workbooks_by(by='Portfolio', source=None, workers=None, streaming=False, range_formats=False, base=OUTPUT_FILE):
+    """Builds one v4 workbook per Portfolio or Team value in a process pool, named after `base`"""
+    start = time.perf_counter()
+    dfs = _load_tables(source)
+    df_s, df_config = dfs[4], dfs[9]
+    with stage('partitions') as rec, ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(df_s, df_config)) as pool:
+        taken = set()
+        futures = [pool.submit(_build_partition, key, tables, partition_file_name(key, base, taken), streaming, range_formats)
+                   for key, tables in partition_database(dfs, by)]
+        outputs = [f.result() for f in as_completed(futures)]
+        rec['rows'] = len(outputs)
+    print(f"✅ Generated {len(outputs)} workbooks by {by} in {time.perf_counter() - start:.1f}s")
+    return sorted(outputs)
 
 if __name__ == "__main__":
-    create_workbook_v4()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate the v4 portfolio workbook")
+    parser.add_argument('--source', help="Folder of DB_*.csv/.parquet files or a v4 .xlsx (default: mock data)")
+    parser.add_argument('--stream', action='store_true', help="Write in constant_memory streaming mode")
+    frames_mode = parser.add_mutually_exclusive_group()
+    frames_mode.add_argument('--incremental', action='store_true', help=f"Only recompute what changed since the last run ({STATE_FILE})")
+    frames_mode.add_argument('--cache', action='store_true', help=f"Reuse computed frames from {CACHE_DIR}")
+    frames_mode.add_argument('--compact', action='store_true', help="Compute the frames on the compact columnar model")
+    parser.add_argument('--refresh', metavar='WORKBOOK', help="Recompute the derived tabs of an edited v4 workbook, keeping its DB tabs")
+    parser.add_argument('--output', help=f"Workbook to write (default: {OUTPUT_FILE}; --refresh default: <WORKBOOK>_refreshed.xlsx)")
+    parser.add_argument('--force', action='store_true', help="--refresh: allow writing over WORKBOOK even if non-v4 tabs would be lost")
+    parser.add_argument('--range-formats', action='store_true', help="Colour RAG / utilization with conditional-format ranges instead of per-cell formats")
+    parser.add_argument('--by', choices=['Portfolio', 'Team'], help="Build one workbook per Portfolio / Team in parallel (named after --output)")
+    parser.add_argument('--workers', type=int, help="Process pool size for --by (default: CPU count)")
+    parser.add_argument('--profile', nargs='?', const='', metavar='OUT.json',
+                        help=f"Print per-stage wall / CPU / memory / rows; with a path also write JSON + Chrome trace (or set {PROFILE_ENV})")
+    parser.add_argument('--cprofile', metavar='STAGE', help=f"Run one stage (e.g. generate_heatmap_data, sheet:DB_Allocations, writer.close) under cProfile (or set {PROFILE_STAGE_ENV})")
+    parser.add_argument('--profile-no-memory', action='store_true', help="Skip tracemalloc peaks (closer to un-instrumented timings)")
+    args = parser.parse_args()
+    if args.profile is not None or args.cprofile:
+        start_profiling(args.profile or None, args.cprofile, memory=not args.profile_no_memory)
+    else:
+        profiling_from_env()
+    if args.refresh and openpyxl is None:
+        parser.error("--refresh needs openpyxl (pip install openpyxl)")
+    if args.by:
+        # Each partition computes its own frames (the heatmap needs the resources' allocations everywhere)
+        ignored = [flag for flag, on in [('--refresh', args.refresh), ('--incremental', args.incremental),
+                                         ('--cache', args.cache), ('--compact', args.compact)] if on]
+        if ignored:
+            parser.error(f"--by can't be combined with {', '.join(ignored)}")
+    with stage('refresh_workbook' if args.refresh else 'create_workbooks_by' if args.by else 'create_workbook_v4'):
+        if args.refresh:
+            try:
+                refresh_workbook(args.refresh, args.output, streaming=args.stream, range_formats=args.range_formats, force=args.force)
+            except ValueError as e:
+                parser.error(str(e))
+        elif args.by:
+            create_workbooks_by(args.by, source=args.source, workers=args.workers, streaming=args.stream,
+                                range_formats=args.range_formats, base=args.output or OUTPUT_FILE)
+        else:
+            create_workbook_v4(source=args.source, streaming=args.stream, incremental=args.incremental, cached=args.cache,
+                               compact=args.compact, range_formats=args.range_formats, output_file=args.output)
+    finish_profiling()
\ No newline at end of file
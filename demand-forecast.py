@@ -0,0 +1,246 @@
+import argparse
+import datetime
+import importlib.util
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+HERE = os.path.dirname(os.path.abspath(__file__))
+FORECAST_WINDOWS = [30, 60, 90, 180]   # Days ahead reported (month 1, 2, 3 and 6)
+SEASON = 12                            # Months per season for seasonal naive
+ALPHAS = np.array([0.1, 0.2, 0.3, 0.5, 0.7, 0.9])   # Smoothing grid, best per series by in-sample SSE
+BETAS = np.array([0.05, 0.1, 0.2, 0.3])
+DAMPING = 0.9
+Z = {80: 1.2816, 95: 1.96}             # Normal quantiles for the prediction intervals
+BACKTEST_ORIGINS = 6
+
+def load_v4():
+    """Imports dashboard-3.py (hyphenated file name, so not a plain import)"""
+    spec = importlib.util.spec_from_file_location('dashboard_v4', os.path.join(HERE, 'dashboard-3.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+v4 = load_v4()
+
+# ==========================================
+# 1. HISTORY: monthly pipeline heads per (Skill, Portfolio / Team)
+# ==========================================
+# There are no stored demand snapshots behind this: a month's "demand" is the number of
+# DB_Pipeline rows whose dates overlap it (the demand plan's rule), as the pipeline stands
+# today. Those overlap counts stand in for the demand history; rows reaching into the
+# current and later months are demand already booked, returned separately as `known`.
+def _month_numbers(dates):
+    return dates.astype('datetime64[M]').astype(np.int64) + 1970 * 12
+
+def _window_steps(windows):
+    """Days ahead -> months after the current month (30d -> 1, 180d -> 6)"""
+    return [max(1, int(np.ceil(d / 30))) for d in windows]
+
+def demand_history(model, by='Portfolio', end=None, ahead=0):
+    """Heads per (Skill_ID, by) per month from DB_Pipeline, using the demand plan's overlap
+    rule, from the first pipeline month up to (not including) end's month (default: today).
+    Returns (keys frame, n_series x n_months array, month labels, known) where known is the
+    n_series x `ahead` array of heads already in the pipeline for end's month onwards."""
+    pipe = model['tables']['DB_Pipeline']
+    skill, group = pipe['Skill_ID'].astype(np.int64), pipe[by]
+    lo, hi = _month_numbers(pipe['Start_Date']), _month_numbers(pipe['End_Date'])
+    valid = (skill >= 0) & (group.codes >= 0) & ~np.isnat(pipe['Start_Date']) & ~np.isnat(pipe['End_Date'])
+    end = end or datetime.date.today()
+    stop = end.year * 12 + end.month - 1
+    first = min(int(lo[valid].min()), stop) if valid.any() else stop
+    n_months = stop - first
+
+    n_groups = len(group.categories)
+    series, inverse = np.unique((skill * n_groups + group.codes)[valid], return_inverse=True)
+    counts = v4._overlap_matrix(inverse, lo[valid] - first, hi[valid] - first, len(series), n_months + ahead).astype(np.float64)
+    skill_rows = v4._follow(model['index']['skill_row'], series // n_groups)
+    keys = pd.DataFrame({'Skill_ID': model['dims']['skill'].take(series // n_groups),
+                         'Skill': v4._values(model['tables']['DB_Skills']['Skill_Name'], skill_rows),
+                         by: np.asarray(group.categories, dtype=object)[series % n_groups]})
+    labels = [f"{m // 12}-{m % 12 + 1:02d}" for m in range(first, first + n_months)]
+    return keys, counts[:, :n_months], labels, counts[:, n_months:]
+
+def synthetic_series(n_series, n_months=36, seed=0):
+    """Seeded Poisson demand with level, trend and yearly seasonality, for benchmarks / backtests"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_months)
+    level = rng.gamma(2.0, 2.0, (n_series, 1))
+    trend = rng.normal(0, 0.03, (n_series, 1)) * level
+    season = 1 + rng.uniform(0, 0.5, (n_series, 1)) * np.sin(2 * np.pi * (t + rng.integers(0, SEASON, (n_series, 1))) / SEASON)
+    return rng.poisson(np.clip((level + trend * t) * season, 0, None)).astype(np.float64)
+
+# ==========================================
+# 2. FORECASTERS (vectorised over every series at once)
+# ==========================================
+# Each returns (point, sigma): n_series x horizon forecasts and the standard deviation of
+# the h-step error, from in-sample one-step residuals.
+def forecast_naive(y, horizon):
+    diffs = np.diff(y, axis=1)
+    sigma = np.sqrt(np.mean(diffs ** 2, axis=1, keepdims=True)) if y.shape[1] > 1 else np.zeros((len(y), 1))
+    steps = np.arange(1, horizon + 1)
+    return np.repeat(y[:, -1:], horizon, axis=1), sigma * np.sqrt(steps)
+
+def forecast_seasonal_naive(y, horizon, season=SEASON):
+    """Same month last season; falls back to naive with less than one season of history"""
+    if y.shape[1] < season:
+        return forecast_naive(y, horizon)
+    steps = np.arange(1, horizon + 1)
+    point = y[:, y.shape[1] - season + (steps - 1) % season]
+    diffs = y[:, season:] - y[:, :-season]
+    sigma = np.sqrt(np.mean(diffs ** 2, axis=1, keepdims=True)) if diffs.shape[1] else np.zeros((len(y), 1))
+    return point, sigma * np.sqrt(np.ceil(steps / season))
+
+def forecast_ses(y, horizon, alphas=ALPHAS):
+    """Simple exponential smoothing; every alpha in the grid is run side by side"""
+    level = np.repeat(y[:, :1], len(alphas), axis=1)
+    sse = np.zeros_like(level)
+    for t in range(1, y.shape[1]):
+        err = y[:, t:t + 1] - level
+        sse += err ** 2
+        level += alphas * err
+    best = sse.argmin(axis=1)
+    rows = np.arange(len(y))
+    alpha = alphas[best][:, None]
+    sigma = np.sqrt(sse[rows, best] / max(y.shape[1] - 1, 1))[:, None]
+    steps = np.arange(1, horizon + 1)
+    return np.repeat(level[rows, best][:, None], horizon, axis=1), sigma * np.sqrt(1 + (steps - 1) * alpha ** 2)
+
+def forecast_holt(y, horizon, alphas=ALPHAS, betas=BETAS, phi=DAMPING):
+    """Damped-trend Holt; the alpha x beta grid is run side by side"""
+    a = np.repeat(alphas, len(betas))
+    b = np.tile(betas, len(alphas))
+    level = np.repeat(y[:, :1], len(a), axis=1)
+    trend = np.repeat(y[:, 1:2] - y[:, :1], len(a), axis=1) if y.shape[1] > 1 else np.zeros_like(level)
+    sse = np.zeros_like(level)
+    for t in range(1, y.shape[1]):
+        fitted = level + phi * trend
+        err = y[:, t:t + 1] - fitted
+        sse += err ** 2
+        new_level = fitted + a * err
+        trend = phi * trend + a * b * err
+        level = new_level
+    best = sse.argmin(axis=1)
+    rows = np.arange(len(y))
+    steps = np.arange(1, horizon + 1)
+    damp = np.cumsum(phi ** steps)
+    point = level[rows, best][:, None] + damp * trend[rows, best][:, None]
+    sigma = np.sqrt(sse[rows, best] / max(y.shape[1] - 2, 1))[:, None]
+    alpha = a[best][:, None]
+    return point, sigma * np.sqrt(1 + (steps - 1) * alpha ** 2 * (1 + b[best][:, None]))
+
+def forecast_ensemble(y, horizon):
+    """Mean of SES, damped Holt and seasonal naive; sigma is the mean of theirs"""
+    parts = [forecast_ses(y, horizon), forecast_holt(y, horizon), forecast_seasonal_naive(y, horizon)]
+    return np.mean([p for p, _ in parts], axis=0), np.mean([s for _, s in parts], axis=0)
+
+METHODS = {'naive': forecast_naive, 'seasonal_naive': forecast_seasonal_naive, 'ses': forecast_ses,
+           'holt': forecast_holt, 'ensemble': forecast_ensemble}
+
+# ==========================================
+# 3. ROLLING FORECAST TABLE
+# ==========================================
+def rolling_forecast(keys, y, months, method='ensemble', windows=FORECAST_WINDOWS, known=None):
+    """Forecast heads for the months 30/60/90/180 days ahead, counted from the current month
+    (the one after the last, complete, history month), with 80% / 95% intervals.
+    known (from demand_history, columns from the current month on) is demand already in the
+    pipeline: forecast and intervals never go below it, nor below zero. One row per series x window."""
+    if not len(y) or not y.shape[1]:
+        raise ValueError("no demand history to forecast from")
+    steps = _window_steps(windows)
+    point, sigma = METHODS[method](y, max(steps) + 1)  # h=1 is the month in progress
+    if known is None:
+        known = np.zeros((len(y), max(steps) + 1))
+    elif known.shape[1] <= max(steps):
+        raise ValueError(f"known demand covers {known.shape[1]} months, windows need {max(steps) + 1}")
+    current = pd.Period(months[-1], freq='M') + 1
+    frames = []
+    for days, step in zip(windows, steps):
+        p, s, floor = point[:, step], sigma[:, step], known[:, step]
+        frame = keys.assign(Window=f'{days}d', Month=str(current + step), Known=floor,
+                            Forecast=np.maximum(p, floor))
+        for level, z in Z.items():
+            frame[f'Lo{level}'] = np.maximum(p - z * s, floor)
+            frame[f'Hi{level}'] = np.maximum(p + z * s, floor)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+# ==========================================
+# 4. BACKTEST (rolling origin)
+# ==========================================
+def backtest(y, methods=None, origins=BACKTEST_ORIGINS, horizon=6):
+    """Refits every method at the last `origins` cut points and scores each step ahead
+    against the actuals: MAE, RMSE, bias, MASE (vs in-sample naive) and 80% / 95% coverage.
+    Also reports seconds per fit (all series at once)."""
+    methods = methods or list(METHODS)
+    n_months = y.shape[1]
+    cuts = [c for c in range(n_months - origins, n_months) if c >= 2]
+    if not cuts:
+        raise ValueError(f"need at least {origins + 2} months of history for a backtest")
+    rows = []
+    for name in methods:
+        errors = [[] for _ in range(horizon)]
+        covered = {level: [[] for _ in range(horizon)] for level in Z}
+        scale, seconds = [], 0.0
+        for cut in cuts:
+            t0 = time.perf_counter()
+            point, sigma = METHODS[name](y[:, :cut], horizon)
+            seconds += time.perf_counter() - t0
+            naive_mae = np.mean(np.abs(np.diff(y[:, :cut], axis=1)), axis=1)
+            for h in range(min(horizon, n_months - cut)):
+                actual = y[:, cut + h]
+                errors[h].append(np.clip(point[:, h], 0, None) - actual)
+                scale.append(naive_mae)
+                for level, z in Z.items():
+                    covered[level][h].append(np.abs(actual - point[:, h]) <= z * sigma[:, h])
+        mean_scale = np.mean(np.concatenate(scale)) or 1.0
+        for h in range(horizon):
+            if not errors[h]:
+                continue
+            e = np.concatenate(errors[h])
+            row = {'method': name, 'step': h + 1, 'n': len(e), 'mae': np.mean(np.abs(e)),
+                   'rmse': np.sqrt(np.mean(e ** 2)), 'bias': np.mean(e), 'mase': np.mean(np.abs(e)) / mean_scale}
+            row.update({f'cover{level}': np.mean(np.concatenate(covered[level][h])) for level in Z})
+            row['fit_s'] = seconds / len(cuts)
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+def backtest_summary(results):
+    """One row per method: metrics averaged over steps, fit time per run"""
+    return results.groupby('method', sort=False).agg(
+        mae=('mae', 'mean'), rmse=('rmse', 'mean'), bias=('bias', 'mean'), mase=('mase', 'mean'),
+        cover80=('cover80', 'mean'), cover95=('cover95', 'mean'), fit_s=('fit_s', 'first')).sort_values('mase')
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="30/60/90/180-day demand forecast from DB_Pipeline history")
+    parser.add_argument('--by', choices=['Portfolio', 'Team'], default='Portfolio', help="Series are Skill x this column")
+    parser.add_argument('--method', choices=list(METHODS), default='ensemble')
+    parser.add_argument('--backtest', action='store_true', help="Score every method on rolling origins instead")
+    parser.add_argument('--synthetic', type=int, metavar='N', help="Use N seeded synthetic series (36 months)")
+    parser.add_argument('--source', help="CSV directory, Parquet directory or workbook (default: synthetic data)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        y, known = synthetic_series(args.synthetic), None
+        keys = pd.DataFrame({'Series': np.arange(len(y))})
+        months = [str(p) for p in pd.period_range(end=pd.Timestamp.today().to_period('M') - 1, periods=y.shape[1], freq='M')]
+    else:
+        dfs = v4.load_database_v4(args.source) if args.source else v4.create_database_v4()
+        keys, y, months, known = demand_history(v4.build_model(dfs), by=args.by,
+                                                ahead=max(_window_steps(FORECAST_WINDOWS)) + 1)
+    print(f"📈 {len(y)} series x {y.shape[1]} months of history")
+    try:
+        if args.backtest:
+            print(backtest_summary(backtest(y)).to_string(float_format=lambda v: f"{v:.3f}"))
+        else:
+            t0 = time.perf_counter()
+            table = rolling_forecast(keys, y, months, args.method, known=known)
+            elapsed = time.perf_counter() - t0
+            print(table.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+            print(f"✅ {args.method}: {len(y)} series in {elapsed:.3f}s")
+    except ValueError as e:
+        parser.error(str(e))
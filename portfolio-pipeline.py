@@ -0,0 +1,201 @@
+import argparse
+import importlib.util
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+HERE = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = 'portfolio_out'
+DECK_FILE = 'Portfolio_Health_Deck.pptx'
+RENDERERS = ['xlsx', 'html', 'pptx']
+EXECUTORS = ['serial', 'thread', 'process']
+
+def load_script(name, file_name):
+    """Imports a repo script by path (hyphenated file names, so not a plain import)"""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, file_name))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+v4 = load_script('dashboard_v4', 'dashboard-3.py')
+web = load_script('squadhtml_1', 'squadhtml-1.py')
+try:
+    ppt = load_script('squadppt_1', 'squadppt-1.py')
+except ImportError:  # python-pptx not installed
+    ppt = None
+
+# ==========================================
+# 1. DAG SCHEDULER
+# ==========================================
+def _timed(fn, args):
+    start = time.time()
+    value = fn(*args)
+    return value, start, time.time()
+
+def _needed(stages, targets):
+    """targets plus every stage they read from, directly or not"""
+    keep, todo = set(), list(targets)
+    while todo:
+        name = todo.pop()
+        if name in stages and name not in keep:
+            keep.add(name)
+            todo.extend(stages[name][1])
+    return {name: stage for name, stage in stages.items() if name in keep}
+
+def run_dag(stages, inputs, executor='thread', workers=None, targets=None):
+    """Runs {name: (fn, [input names])}; each stage gets its inputs' values as positional args.
+    inputs seeds the results (the loaded tables). 'serial' runs stages in declaration order in
+    this process, 'thread' / 'process' submit each stage as soon as its inputs are done.
+    targets limits the run to the stages those names need.
+    Returns (results, {name: (start_s, end_s)}) with times relative to the call."""
+    if targets is not None:
+        stages = _needed(stages, targets)
+    unknown = {dep for _, deps in stages.values() for dep in deps} - set(stages) - set(inputs)
+    if unknown:
+        raise ValueError(f"Stages read undeclared inputs: {', '.join(sorted(unknown))}")
+    results, pending, timings = dict(inputs), dict(stages), {}
+
+    def ready():
+        names = [name for name, (_, deps) in pending.items() if all(dep in results for dep in deps)]
+        return [(name, *pending.pop(name)) for name in names]
+
+    def done(name, value, start, end):
+        results[name] = value
+        timings[name] = (start - t0, end - t0)
+
+    t0 = time.time()
+    if executor == 'serial':
+        while pending:
+            batch = ready()
+            if not batch:
+                raise ValueError(f"Dependency cycle between stages: {', '.join(pending)}")
+            for name, fn, deps in batch:
+                done(name, *_timed(fn, [results[dep] for dep in deps]))
+        return results, timings
+
+    pool_cls = ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor
+    running = {}
+    with pool_cls(max_workers=workers) as pool:
+        while pending or running:
+            for name, fn, deps in ready():
+                running[pool.submit(_timed, fn, [results[dep] for dep in deps])] = name
+            if not running:
+                raise ValueError(f"Dependency cycle between stages: {', '.join(pending)}")
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                done(running.pop(future), *future.result())
+    return results, timings
+
+# ==========================================
+# 2. STAGES (engines + renderers over one dataset)
+# ==========================================
+# Module-level functions so the process pool can pickle them
+def dashboard_stage(*tables):
+    return v4.compile_dashboard_data(tables)
+
+def demand_stage(df_pipe, df_skills):
+    return v4.generate_demand_plan(df_pipe, df_skills)[0]
+
+def heatmap_stage(df_res, df_alloc, df_skills):
+    return v4.generate_heatmap_data(df_res, df_alloc, df_skills, prorate=v4.HEATMAP_PRORATE)[0]
+
+def render_xlsx(path, dashboard, demand, heatmap, *tables):
+    v4.create_workbook_v4(dfs=tables, output_file=path, frames=(*dashboard, demand, heatmap))
+    return path
+
+def render_html(output_dir, dashboard):
+    return web.build_dashboard(*dashboard, output_dir=output_dir)
+
+def render_pptx(path, dashboard):
+    ppt.build_deck(ppt.portfolio_slide_specs(dashboard[0]), path)
+    return path
+
+def pipeline_stages(output_dir=OUTPUT_DIR):
+    """The three engines read disjoint tables (the dashboard reads them all); renderers read engine results"""
+    tables = list(v4.DB_SCHEMA)
+    return {
+        'dashboard': (dashboard_stage, tables),
+        'demand': (demand_stage, ['DB_Pipeline', 'DB_Skills']),
+        'heatmap': (heatmap_stage, ['DB_Resources', 'DB_Allocations', 'DB_Skills']),
+        'xlsx': (partial(render_xlsx, os.path.join(output_dir, v4.OUTPUT_FILE)), ['dashboard', 'demand', 'heatmap'] + tables),
+        'html': (partial(render_html, output_dir), ['dashboard']),
+        'pptx': (partial(render_pptx, os.path.join(output_dir, DECK_FILE)), ['dashboard']),
+    }
+
+def run_pipeline(dfs, renderers=RENDERERS, executor='thread', workers=None, output_dir=OUTPUT_DIR):
+    """Computes the frames once and renders every requested output; returns ({renderer: path}, timings)"""
+    os.makedirs(output_dir, exist_ok=True)
+    results, timings = run_dag(pipeline_stages(output_dir), dict(zip(v4.DB_SCHEMA, dfs)),
+                               executor, workers, targets=renderers)
+    return {name: results[name] for name in renderers}, timings
+
+# ==========================================
+# 3. SERIAL PATH (one run per output, as the scripts work today)
+# ==========================================
+def serial_path(dfs, renderers=RENDERERS, output_dir=OUTPUT_DIR):
+    """The workbook computes its own frames; the HTML and PPTX builds each recompile the dashboard"""
+    os.makedirs(output_dir, exist_ok=True)
+    if 'xlsx' in renderers:
+        v4.create_workbook_v4(dfs=dfs, output_file=os.path.join(output_dir, v4.OUTPUT_FILE))
+    if 'html' in renderers:
+        web.build_dashboard(*v4.compile_dashboard_data(dfs), output_dir=output_dir)
+    if 'pptx' in renderers:
+        ppt.build_deck(ppt.portfolio_slide_specs(v4.compile_dashboard_data(dfs)[0]), os.path.join(output_dir, DECK_FILE))
+
+# ==========================================
+# 4. REPORTING & LATENCY COMPARISON
+# ==========================================
+def print_timeline(timings):
+    """Stage start / end relative to the run; overlapping rows ran concurrently"""
+    print(f"{'stage':<10} {'start s':>8} {'end s':>8} {'wall s':>8}")
+    for name, (start, end) in sorted(timings.items(), key=lambda kv: kv[1]):
+        print(f"{name:<10} {start:>8.3f} {end:>8.3f} {end - start:>8.3f}")
+
+def compare_latency(dfs, renderers=RENDERERS, workers=None, output_dir=OUTPUT_DIR, executors=EXECUTORS):
+    """End-to-end seconds for the serial path and the DAG under each executor.
+    Speedups are against dag/serial (every stage once, one after another), so they show what
+    concurrency buys; the serial path's extra time is its duplicate dashboard compiles."""
+    executors = ['serial'] + [name for name in executors if name != 'serial']
+    runs = [('serial path', partial(serial_path, dfs, renderers, output_dir))]
+    runs += [(f"dag/{name}", partial(run_pipeline, dfs, renderers, name, workers, output_dir)) for name in executors]
+    rows = []
+    for label, run in runs:
+        t0 = time.perf_counter()
+        run()
+        rows.append((label, time.perf_counter() - t0))
+    base = rows[1][1]
+    print(f"\n{'mode':<14} {'seconds':>9} {'speedup':>8}   ({os.cpu_count()} CPUs, outputs: {', '.join(renderers)})")
+    for label, elapsed in rows:
+        print(f"{label:<14} {elapsed:>9.2f} {base / elapsed:>7.2f}x")
+    print(f"Speedup is against dag/serial (concurrency only); serial path vs dag/serial is the "
+          f"duplicate dashboard work the DAG removes ({rows[0][1] - base:+.2f}s).")
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute the v4 frames once and render xlsx / html / pptx from them concurrently")
+    parser.add_argument('--source', help="Folder of DB_*.csv/.parquet files or a v4 .xlsx (default: mock data)")
+    parser.add_argument('--outputs', default=','.join(RENDERERS), help=f"Comma-separated renderers ({', '.join(RENDERERS)})")
+    parser.add_argument('--executor', choices=EXECUTORS, default='thread', help="How independent stages run")
+    parser.add_argument('--workers', type=int, help="Pool size (default: CPU count)")
+    parser.add_argument('--out', default=OUTPUT_DIR, help="Output directory")
+    parser.add_argument('--compare', action='store_true', help="Time the serial path against the DAG under every executor")
+    args = parser.parse_args()
+    renderers = [name.strip() for name in args.outputs.split(',') if name.strip()]
+    unknown = set(renderers) - set(RENDERERS)
+    if unknown:
+        parser.error(f"unknown output(s): {', '.join(sorted(unknown))}")
+    if 'pptx' in renderers and ppt is None:
+        parser.error("pptx output needs python-pptx (pip install python-pptx)")
+
+    dfs = v4.load_database_v4(args.source) if args.source else v4.create_database_v4()
+    if args.compare:
+        compare_latency(dfs, renderers, args.workers, args.out)
+    else:
+        t0 = time.perf_counter()
+        paths, timings = run_pipeline(dfs, renderers, args.executor, args.workers, args.out)
+        print_timeline(timings)
+        print(f"✅ Rendered {', '.join(paths)} in {time.perf_counter() - t0:.2f}s ({args.executor})")
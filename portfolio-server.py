@@ -0,0 +1,299 @@
+import argparse
+import asyncio
+import datetime
+import glob
+import hashlib
+import importlib.util
+import json
+import os
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+HERE = os.path.dirname(os.path.abspath(__file__))
+HOST = '127.0.0.1'
+PORT = 8765
+WATCH_INTERVAL = 2.0      # Seconds between checks of the source files
+CACHE_MAX_ENTRIES = 512   # Rendered JSON responses kept per data version
+
+def load_v4():
+    """Imports dashboard-3.py (hyphenated file name, so not a plain import)"""
+    spec = importlib.util.spec_from_file_location('dashboard_v4', os.path.join(HERE, 'dashboard-3.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+v4 = load_v4()
+
+# ==========================================
+# 1. DATA: tables loaded once, reloaded when the source changes
+# ==========================================
+def source_signature(source):
+    """(file, mtime, size) for the workbook or every DB_* file in the folder; None for synthetic data"""
+    if not source:
+        return None
+    paths = [source] if os.path.isfile(source) else sorted(glob.glob(os.path.join(source, 'DB_*')))
+    return tuple((os.path.basename(p), os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in paths)
+
+def _month_keys(months):
+    """{date: 'YYYY-MM'} for renaming the month columns"""
+    return {m: m.strftime('%Y-%m') for m in months}
+
+def load_state(source=None):
+    """Tables plus the unfiltered engine outputs for one data version"""
+    t0 = time.perf_counter()
+    signature = source_signature(source)
+    dfs = v4.load_database_v4(source) if source else v4.create_database_v4()
+    df_p, df_r, df_a, df_pipe, df_s = dfs[:5]
+
+    df_dash, total_budget, total_spent = v4.compile_dashboard_data(dfs)
+    df_dash = df_dash.assign(Project_ID=df_p['Project_ID'].to_numpy()[df_dash.index])
+    df_demand, demand_months = v4.generate_demand_plan(df_pipe, df_s)
+    df_heat, heat_months = v4.generate_heatmap_data(df_r, df_a, df_s, v4.HEATMAP_PRORATE)
+
+    version = hashlib.sha1(repr(signature or time.time_ns()).encode()).hexdigest()[:12]
+    print(f"📥 Loaded data version {version} ({len(df_p)} projects, {len(df_r)} resources) "
+          f"in {time.perf_counter() - t0:.2f}s")
+    return {
+        'source': source, 'signature': signature, 'version': version, 'dfs': dfs,
+        'dash': df_dash, 'total_budget': float(total_budget), 'total_spent': float(total_spent),
+        'demand': df_demand.rename(columns=_month_keys(demand_months)),
+        'demand_months': list(_month_keys(demand_months).values()),
+        'heat': df_heat.rename(columns=_month_keys(heat_months)), 'heat_months': list(_month_keys(heat_months).values()),
+        'cache': OrderedDict(), 'loaded_at': datetime.datetime.now().isoformat(timespec='seconds')
+    }
+
+# ==========================================
+# 2. QUERIES (Portfolio, Team, Skill, month range)
+# ==========================================
+class BadRequest(ValueError):
+    pass
+
+def _values(query, name):
+    """Repeated and comma-separated values: ?team=A&team=B or ?team=A,B"""
+    return [v.strip() for raw in query.get(name, []) for v in raw.split(',') if v.strip()]
+
+def _month_range(query, months):
+    lo, hi = query.get('from', [months[0]])[-1], query.get('to', [months[-1]])[-1]
+    for value in (lo, hi):
+        try:
+            datetime.datetime.strptime(value, '%Y-%m')
+        except ValueError:
+            raise BadRequest(f"months must be YYYY-MM, got {value!r}")
+    return [m for m in months if lo <= m <= hi]
+
+def _skill_rows(dfs, skills):
+    """DB_Skills rows named by ?skill=, which takes Skill_Names or Skill_IDs on every route"""
+    df_s = dfs[4]
+    return df_s[df_s['Skill_Name'].isin(skills) | df_s['Skill_ID'].isin(skills)]
+
+def _skill_resources(dfs, skills):
+    """Resource_IDs whose primary skill is in skills"""
+    df_r = dfs[1]
+    return df_r.loc[df_r['Skill_ID'].isin(_skill_rows(dfs, skills)['Skill_ID']), 'Resource_ID']
+
+def _skill_names(dfs, skills):
+    """Skill names as the heatmap / demand frames show them"""
+    return _skill_rows(dfs, skills)['Skill_Name']
+
+def _project_filter(state, query):
+    """Project_IDs matching portfolio/team, or None when neither filter is given"""
+    portfolios, teams = _values(query, 'portfolio'), _values(query, 'team')
+    if not portfolios and not teams:
+        return None
+    df_p = state['dfs'][0]
+    keep = df_p['Project_ID'].notna()
+    if portfolios:
+        keep &= df_p['Portfolio'].isin(portfolios)
+    if teams:
+        keep &= df_p['Team'].isin(teams)
+    return df_p.loc[keep, 'Project_ID']
+
+def query_dashboard(state, query):
+    df = state['dash']
+    projects = _project_filter(state, query)
+    if projects is not None:
+        df = df[df['Project_ID'].isin(projects)]
+    skills = _values(query, 'skill')
+    if skills:
+        df_a = state['dfs'][2]
+        staffed = df_a.loc[df_a['Resource_ID'].isin(_skill_resources(state['dfs'], skills)), 'Project_ID']
+        df = df[df['Project_ID'].isin(staffed)]
+    return df, {'total_budget': state['total_budget'], 'total_spent': state['total_spent']}
+
+def query_heatmap(state, query):
+    months = _month_range(query, state['heat_months'])
+    projects = _project_filter(state, query)
+    if projects is None:
+        df = state['heat']
+    else:
+        # Load coming only from the selected portfolios / teams
+        df_r, df_a, df_s = state['dfs'][1], state['dfs'][2], state['dfs'][4]
+        df_a = df_a[df_a['Project_ID'].isin(projects)]
+        df_r = df_r[df_r['Resource_ID'].isin(df_a['Resource_ID'])].reset_index(drop=True)
+        df, heat_months = v4.generate_heatmap_data(df_r, df_a, df_s, v4.HEATMAP_PRORATE)
+        df = df.rename(columns=_month_keys(heat_months))
+    skills = _values(query, 'skill')
+    if skills and not df.empty:
+        df = df[df['Primary Skill'].isin(_skill_names(state['dfs'], skills))]
+    if df.empty:
+        return df, {'months': months}
+    return df[['Resource Name', 'Primary Skill', 'Manager'] + months], {'months': months}
+
+def query_demand(state, query):
+    months = _month_range(query, state['demand_months'])
+    df = state['demand']
+    if df.empty:
+        return df, {'months': months}
+    for param, col in [('portfolio', 'Portfolio'), ('team', 'Team'), ('skill', 'Skill Required')]:
+        values = _values(query, param)
+        if values:
+            df = df[df[col].isin(_skill_names(state['dfs'], values) if param == 'skill' else values)]
+    return df[['Portfolio', 'Team', 'Goal', 'Skill Required', 'Level'] + months], {'months': months}
+
+ROUTES = {'/api/dashboard': query_dashboard, '/api/heatmap': query_heatmap, '/api/demand': query_demand}
+
+# ==========================================
+# 3. RESPONSE CACHE (per data version, LRU)
+# ==========================================
+def cache_key(path, query):
+    return path + '?' + '&'.join(f"{k}={','.join(sorted(_values(query, k)))}" for k in sorted(query))
+
+def render_json(state, path, query):
+    """(etag, body) for a GET. Runs the pandas query, so it is called off the event loop;
+    it only reads state (the cache is updated by cached_json on the loop)."""
+    key = cache_key(path, query)
+    df, extra = ROUTES[path](state, query)
+    meta = json.dumps(dict(version=state['version'], count=len(df), **extra), separators=(',', ':'))
+    rows = df.to_json(orient='records', force_ascii=False) if len(df) else '[]'
+    body = (meta[:-1] + ',"rows":' + rows + '}').encode('utf-8')
+    etag = '"' + hashlib.sha1(f"{state['version']}|{key}".encode()).hexdigest()[:20] + '"'
+    return etag, body
+
+async def cached_json(state, path, query):
+    """render_json through the per-version cache; a miss runs in the default executor (as
+    load_state does) so one slow query doesn't stall every other connection"""
+    key = cache_key(path, query)
+    cache = state['cache']
+    hit = cache.get(key)
+    if hit is not None:
+        cache.move_to_end(key)
+        return hit
+    hit = await asyncio.get_running_loop().run_in_executor(None, render_json, state, path, query)
+    cache[key] = hit
+    if len(cache) > CACHE_MAX_ENTRIES:
+        cache.popitem(last=False)
+    return hit
+
+# ==========================================
+# 4. HTTP (asyncio streams, keep-alive, GET/HEAD only)
+# ==========================================
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           500: 'Internal Server Error'}
+
+def _response(status, body=b'', etag=None, keep_alive=True, head=False):
+    headers = [f"HTTP/1.1 {status} {REASONS[status]}", "Content-Type: application/json; charset=utf-8",
+               f"Content-Length: {len(body) if status != 304 else 0}", "Cache-Control: no-cache",
+               f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    if etag:
+        headers.append(f"ETag: {etag}")
+    payload = b'' if head or status == 304 else body
+    return ('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + payload
+
+def _error(message):
+    return json.dumps({'error': message}).encode('utf-8')
+
+async def handle_request(service, method, target, headers):
+    """(status, body, etag) for one request"""
+    if method not in ('GET', 'HEAD'):
+        return 405, _error("read-only service: GET and HEAD only"), None
+    url = urlsplit(target)
+    state = service['state']
+    if url.path == '/api/health':
+        body = json.dumps({'version': state['version'], 'loaded_at': state['loaded_at'],
+                           'cached_responses': len(state['cache'])}).encode('utf-8')
+        return 200, body, None
+    if url.path not in ROUTES:
+        return 404, _error(f"unknown path {url.path}; try {', '.join(sorted(ROUTES))}"), None
+    try:
+        etag, body = await cached_json(state, url.path, parse_qs(url.query))
+    except BadRequest as e:
+        return 400, _error(str(e)), None
+    except Exception as e:
+        print(f"⚠️ {target} failed: {e!r}")
+        return 500, _error(f"internal error: {type(e).__name__}"), None
+    if etag in headers.get('if-none-match', ''):
+        return 304, b'', etag
+    return 200, body, etag
+
+async def handle_client(service, reader, writer):
+    try:
+        while True:
+            try:
+                raw = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                break
+            lines = raw.decode('latin-1').split('\r\n')
+            try:
+                method, target, version = lines[0].split(' ', 2)
+            except ValueError:
+                writer.write(_response(400, _error("malformed request line"), keep_alive=False))
+                break
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(':')
+                if name:
+                    headers[name.strip().lower()] = value.strip()
+            keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+            status, body, etag = await handle_request(service, method, target, headers)
+            writer.write(_response(status, body, etag, keep_alive, head=(method == 'HEAD')))
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+async def watch_source(service, interval=WATCH_INTERVAL):
+    """Reloads the tables when the source files change; the old version keeps serving meanwhile"""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        state = service['state']
+        try:
+            changed = source_signature(state['source']) != state['signature']
+        except FileNotFoundError:
+            continue  # mid-write; check again next tick
+        if changed:
+            try:
+                service['state'] = await loop.run_in_executor(None, load_state, state['source'])
+            except Exception as e:
+                print(f"⚠️ Reload failed, still serving {state['version']}: {e}")
+
+async def start_service(source=None, host=HOST, port=PORT, watch=True):
+    """Loads the tables once and starts listening. Returns (server, service)"""
+    loop = asyncio.get_running_loop()
+    service = {'state': await loop.run_in_executor(None, load_state, source)}
+    server = await asyncio.start_server(lambda r, w: handle_client(service, r, w), host, port)
+    if watch and source:
+        service['watcher'] = asyncio.create_task(watch_source(service))
+    return server, service
+
+async def serve(source=None, host=HOST, port=PORT):
+    server, _ = await start_service(source, host, port)
+    print(f"🌐 Serving {', '.join(sorted(ROUTES))} on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read-only JSON service over the v4 portfolio tables")
+    parser.add_argument('--source', help="CSV directory, Parquet directory or workbook (default: synthetic data, no reloads)")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.source, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
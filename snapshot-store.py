@@ -0,0 +1,266 @@
+import argparse
+import datetime
+import importlib.util
+import os
+import time
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+HERE = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = 'portfolio_snapshots'   # <table>/week=YYYY-Www/data.parquet (hive-style, readable by other tools)
+PART_FILE = 'data.parquet'
+COMPRESSION = 'zstd'
+RAG_ORDER = ['Green', 'Amber', 'Red']
+
+def load_v4():
+    """Imports dashboard-3.py (hyphenated file name, so not a plain import)"""
+    spec = importlib.util.spec_from_file_location('dashboard_v4', os.path.join(HERE, 'dashboard-3.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+v4 = load_v4()
+
+# ==========================================
+# 1. WEEK KEYS
+# ==========================================
+# ISO weeks as 'YYYY-Www' strings: they sort in time order and name the partition folders
+def week_key(date=None):
+    year, week, _ = (date or datetime.date.today()).isocalendar()
+    return f"{year}-W{week:02d}"
+
+def week_start(key):
+    """'2026-W42' -> Monday of that week"""
+    year, week = key.split('-W')
+    return datetime.date.fromisocalendar(int(year), int(week), 1)
+
+def partition_path(root, table, week):
+    return os.path.join(root, table, f"week={week}", PART_FILE)
+
+def list_weeks(table='DB_Projects', root=SNAPSHOT_DIR):
+    """Snapshot weeks stored for a table, oldest first"""
+    folder = os.path.join(root, table)
+    if not os.path.isdir(folder):
+        return []
+    return sorted(name[5:] for name in os.listdir(folder)
+                  if name.startswith('week=') and os.path.exists(os.path.join(folder, name, PART_FILE)))
+
+def select_weeks(table, last=None, root=SNAPSHOT_DIR):
+    weeks = list_weeks(table, root)
+    return weeks[-last:] if last else weeks
+
+# ==========================================
+# 2. WRITING SNAPSHOTS (append-only, one partition per table per week)
+# ==========================================
+def _snapshot_frame(table, df):
+    """Stable column types across weeks: dates as datetime64[ms], categoricals back to plain values
+    (Parquet dictionary-encodes the strings on disk either way)"""
+    df = df.reset_index(drop=True)
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(df[col].cat.categories.dtype)
+    for col in v4.DB_SCHEMA[table][1]:
+        df[col] = pd.to_datetime(df[col]).astype('datetime64[ms]')
+    return df
+
+def write_snapshot(dfs, week=None, root=SNAPSHOT_DIR, replace=False):
+    """Stores the ten tables as this week's partitions. Existing weeks are never rewritten
+    unless replace=True (re-running a week); each file is written aside and then moved in."""
+    week = week or week_key()
+    existing = [table for table in v4.DB_SCHEMA if os.path.exists(partition_path(root, table, week))]
+    if existing and not replace:
+        raise FileExistsError(f"Snapshot {week} already exists in {root} (append-only; use --replace to rewrite it)")
+    total = 0
+    for table, df in zip(v4.DB_SCHEMA, dfs):
+        path = partition_path(root, table, week)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        arrow = pa.Table.from_pandas(_snapshot_frame(table, df), preserve_index=False)
+        pq.write_table(arrow, path + '.tmp', compression=COMPRESSION, use_dictionary=True)
+        os.replace(path + '.tmp', path)
+        total += os.path.getsize(path)
+    return week, total
+
+# ==========================================
+# 3. READING HISTORY (only the partitions and columns asked for)
+# ==========================================
+def read_history(table, columns, weeks=None, root=SNAPSHOT_DIR):
+    """One table over `weeks` (default: all) plus a categorical Week_Key column.
+    Strings come back dictionary-encoded (pandas categoricals).
+    Raises FileNotFoundError when there is nothing to read (empty or missing store)."""
+    weeks = list_weeks(table, root) if weeks is None else list(weeks)
+    if not weeks:
+        raise FileNotFoundError(f"No {table} snapshots in {root} (store one with: write)")
+    schema = pq.read_schema(partition_path(root, table, weeks[-1]))
+    strings = [c for c in columns if pa.types.is_string(schema.field(c).type) or pa.types.is_large_string(schema.field(c).type)]
+    # ParquetFile.read skips the dataset layer; read_dictionary keeps the on-disk dictionaries instead of decoding
+    parts = [pq.ParquetFile(partition_path(root, table, week), read_dictionary=strings).read(columns=list(columns), use_threads=False)
+             for week in weeks]
+    df = pa.concat_tables(parts, promote_options='permissive').to_pandas()
+    sizes = [part.num_rows for part in parts]
+    df['Week_Key'] = pd.Categorical.from_codes(np.repeat(np.arange(len(weeks)), sizes), categories=weeks, ordered=True)
+    return df
+
+# ==========================================
+# 4. TREND QUERIES
+# ==========================================
+def rag_history(last=None, root=SNAPSHOT_DIR):
+    """Project x week RAG grid (last status reported in each week)"""
+    df = read_history('DB_Updates', ['Project_ID', 'RAG'], select_weeks('DB_Updates', last, root), root)
+    return df.pivot_table(index='Project_ID', columns='Week_Key', values='RAG', aggfunc='last', observed=True)
+
+def rag_transitions(last=None, root=SNAPSHOT_DIR):
+    """Every RAG change between consecutive snapshots: Project_ID, Week_Key, From, To"""
+    df = read_history('DB_Updates', ['Project_ID', 'RAG'], select_weeks('DB_Updates', last, root), root)
+    project, week, rag = (df[c].cat.codes.to_numpy() for c in ('Project_ID', 'Week_Key', 'RAG'))
+    known = (project >= 0) & (rag >= 0)  # Blank Project_ID / RAG (code -1) is no status, not a change
+    project, week, rag = project[known], week[known], rag[known]
+    order = np.lexsort((week, project))
+    project, week, rag = project[order], week[order], rag[order]
+    last = np.ones(len(order), dtype=bool)  # Several updates in one week: keep the last one
+    last[:-1] = (project[1:] != project[:-1]) | (week[1:] != week[:-1])
+    project, week, rag = project[last], week[last], rag[last]
+    changed = np.flatnonzero((project[1:] == project[:-1]) & (rag[1:] != rag[:-1])) + 1
+    labels = df['RAG'].cat.categories.astype(str).to_numpy()
+    return pd.DataFrame({'Project_ID': df['Project_ID'].cat.categories[project[changed]],
+                         'Week_Key': df['Week_Key'].cat.categories[week[changed]],
+                         'From': labels[rag[changed - 1]], 'To': labels[rag[changed]]})
+
+def transition_matrix(moves):
+    """From x To counts of rag_transitions()"""
+    order = [rag for rag in RAG_ORDER if rag in set(moves['From']) | set(moves['To'])]
+    return pd.crosstab(moves['From'], moves['To']).reindex(index=order, columns=order, fill_value=0)
+
+def milestone_drift(last=None, root=SNAPSHOT_DIR):
+    """Forecast-date movement per milestone over the window: first / latest forecast, total drift,
+    number of weeks it slipped, and the latest variance against baseline (days; + = late)"""
+    df = read_history('DB_Milestones', ['Project_ID', 'Milestone', 'Baseline_Date', 'Forecast_Date'],
+                      select_weeks('DB_Milestones', last, root), root)
+    df = df[df['Project_ID'].notna() & df['Milestone'].notna()]
+    project, milestone = df['Project_ID'].cat.codes.to_numpy(), df['Milestone'].cat.codes.to_numpy()
+    key = project.astype(np.int64) * len(df['Milestone'].cat.categories) + milestone
+    order = np.lexsort((df['Week_Key'].cat.codes.to_numpy(), key))
+    key, forecast = key[order], df['Forecast_Date'].to_numpy()[order]
+    first = np.ones(len(key), dtype=bool)
+    first[1:] = key[1:] != key[:-1]
+    starts = np.flatnonzero(first)
+    ends = np.append(starts[1:], len(key)) - 1
+    slipped = np.zeros(len(key), dtype=np.int64)
+    slipped[1:] = (forecast[1:] > forecast[:-1]) & ~first[1:]  # NaT compares False
+    out = pd.DataFrame({
+        'Project_ID': df['Project_ID'].cat.categories[project[order][starts]],
+        'Milestone': df['Milestone'].cat.categories[milestone[order][starts]],
+        'Weeks': ends - starts + 1, 'First_Forecast': forecast[starts], 'Latest_Forecast': forecast[ends],
+        'Baseline': df['Baseline_Date'].to_numpy()[order][ends],
+        'Slips': np.add.reduceat(slipped, starts) if len(starts) else slipped[:0]})
+    out['Drift_Days'] = (out['Latest_Forecast'] - out['First_Forecast']).dt.days
+    out['Variance_Days'] = (out['Latest_Forecast'] - out['Baseline']).dt.days
+    return out.sort_values(['Drift_Days', 'Variance_Days'], ascending=False, ignore_index=True)
+
+def budget_burn(last=None, by=None, root=SNAPSHOT_DIR):
+    """Actuals burned per month: the last snapshot of each project in a month, summed (per `by`
+    group from the latest DB_Projects), with the month-on-month burn and its share of budget"""
+    weeks = select_weeks('DB_Financials', last, root)
+    df = read_history('DB_Financials', ['Project_ID', 'Total_Budget', 'Actuals_To_Date'], weeks, root)
+    df = df[df['Project_ID'].notna()].copy()
+    # Month of each week as an integer; partitions are read oldest first, so keep='last' is the month's last snapshot
+    month_of_week = np.array([(d.year * 12 + d.month - 1) for d in map(week_start, weeks)])
+    df['Month'] = month_of_week[df['Week_Key'].cat.codes.to_numpy()]
+    df['Project'] = df['Project_ID'].cat.codes
+    df = df.drop_duplicates(['Project', 'Month'], keep='last')
+    keys = ['Month']
+    if by:
+        latest = list_weeks('DB_Projects', root)[-1:]
+        groups = read_history('DB_Projects', ['Project_ID', by], latest, root).drop_duplicates('Project_ID')
+        lookup = groups.set_index('Project_ID')[by].astype(str)
+        names = pd.Series(df['Project_ID'].cat.categories).map(lookup).fillna('(unknown)').to_numpy()
+        df[by] = names[df['Project'].to_numpy()]
+        keys = [by, 'Month']
+    out = df.groupby(keys)[['Total_Budget', 'Actuals_To_Date']].sum().reset_index()
+    out['Burn'] = out.groupby(by)['Actuals_To_Date'].diff() if by else out['Actuals_To_Date'].diff()
+    out['Burn_%'] = out['Burn'] / out['Total_Budget']
+    out['Month'] = [f"{m // 12}-{m % 12 + 1:02d}" for m in out['Month']]
+    return out
+
+# ==========================================
+# 5. SIMULATED HISTORY (demo / benchmark)
+# ==========================================
+def simulate_history(dfs, weeks=52, end=None, seed=0):
+    """Yields (week_key, tables) for `weeks` consecutive weeks ending at `end`: RAG drifts,
+    some forecasts slip and actuals grow. The other tables are carried over unchanged."""
+    rng = np.random.default_rng(seed)
+    df_p, df_r, df_a, df_pipe, df_s, df_m, df_u, df_sla, df_fin, df_config = dfs
+    df_m = df_m.assign(Forecast_Date=pd.to_datetime(df_m['Forecast_Date']))
+    rag = df_u['RAG'].astype(str).to_numpy()
+    actuals = np.zeros(len(df_fin))
+    burn = df_fin['Total_Budget'].to_numpy() / rng.uniform(52, 156, len(df_fin))
+    last = end or datetime.date.today()
+    for k in range(weeks):
+        date = last - datetime.timedelta(weeks=weeks - 1 - k)
+        flip = rng.random(len(rag)) < 0.1
+        rag = np.where(flip, rng.choice(RAG_ORDER, len(rag), p=[0.5, 0.3, 0.2]), rag)
+        slip = np.where(rng.random(len(df_m)) < 0.05, rng.integers(3, 22, len(df_m)), 0)
+        df_m = df_m.assign(Forecast_Date=df_m['Forecast_Date'] + pd.to_timedelta(slip, unit='D'))
+        actuals = actuals + burn * rng.uniform(0.5, 1.5, len(burn))
+        week = week_key(date)
+        updates = df_u.assign(RAG=rag, Week=f"Wk {week[-2:]}")
+        fin = df_fin.assign(Actuals_To_Date=actuals.round().astype(np.int64))
+        yield week, (df_p, df_r, df_a, df_pipe, df_s, df_m, updates, df_sla, fin, df_config)
+
+def _timed_ms(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - t0) * 1000
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Weekly Parquet snapshots of the v4 tables and trend queries over them")
+    parser.add_argument('command', choices=['write', 'weeks', 'rag', 'drift', 'burn', 'demo'])
+    parser.add_argument('--root', default=SNAPSHOT_DIR, help="Snapshot store directory")
+    parser.add_argument('--source', help="Folder of DB_*.csv/.parquet files or a v4 .xlsx (default: mock data)")
+    parser.add_argument('--week', help="Snapshot week for write, e.g. 2026-W42 (default: this week)")
+    parser.add_argument('--replace', action='store_true', help="Rewrite an existing week")
+    parser.add_argument('--last', type=int, help="Only the last N weeks")
+    parser.add_argument('--by', choices=['Portfolio', 'Team'], help="Group the budget burn")
+    parser.add_argument('--top', type=int, default=20, help="Rows shown")
+    parser.add_argument('--weeks', type=int, default=52, help="Weeks of simulated history for demo")
+    args = parser.parse_args()
+
+    if args.command in ('write', 'demo'):
+        dfs = v4.load_database_v4(args.source) if args.source else v4.create_database_v4()
+        history = simulate_history(dfs, args.weeks) if args.command == 'demo' else [(args.week or week_key(), dfs)]
+        t0 = time.perf_counter()
+        try:
+            written = [write_snapshot(tables, week, args.root, args.replace) for week, tables in history]
+        except FileExistsError as e:
+            parser.error(str(e))
+        print(f"💾 Stored {len(written)} week(s) {written[0][0]}..{written[-1][0]} in {args.root}/ "
+              f"({sum(size for _, size in written) / 1024:,.0f} KB, {time.perf_counter() - t0:.2f}s)")
+    elif args.command == 'weeks':
+        weeks = list_weeks(root=args.root)
+        print(f"{len(weeks)} snapshot(s): {', '.join(weeks) if weeks else '-'}")
+    elif args.command == 'rag':
+        try:
+            moves, ms = _timed_ms(rag_transitions, args.last, args.root)
+        except FileNotFoundError as e:
+            parser.error(str(e))
+        print(f"🚦 {len(moves)} RAG transitions ({ms:.1f} ms)")
+        print(transition_matrix(moves).to_string())
+        print(moves.tail(args.top).to_string(index=False))
+    elif args.command == 'drift':
+        try:
+            drift, ms = _timed_ms(milestone_drift, args.last, args.root)
+        except FileNotFoundError as e:
+            parser.error(str(e))
+        print(f"📅 Forecast drift for {len(drift)} milestones ({ms:.1f} ms)")
+        print(drift.head(args.top).to_string(index=False))
+    else:
+        try:
+            burn, ms = _timed_ms(budget_burn, args.last, args.by, args.root)
+        except FileNotFoundError as e:
+            parser.error(str(e))
+        print(f"💰 Actuals burn per month ({ms:.1f} ms)")
+        print(burn.tail(args.top).to_string(index=False, formatters={'Burn_%': '{:.1%}'.format}))
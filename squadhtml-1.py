@@ -0,0 +1,1090 @@
+import argparse
+import glob
+import hashlib
+import html
+import importlib.util
+import json
+import os
+import re
+import time
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+HERE = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = 'slides'
+STYLESHEET = 'deck.css'
+BUNDLE_FILE = 'deck.html'
+DASHBOARD_FILE = 'dashboard.html'
+DASH_PAGE_SIZE = 50   # Dashboard rows in the DOM at once
+SQUAD_TABLE_ROWS = 8   # Projects listed per squad slide before "+N more"
+
+# ==========================================
+# 1. SHARED STYLESHEET (one file for every slide)
+# ==========================================
+SLIDE_CSS = """
+:root {
+    --mck-navy: #0F355C;
+    --mck-blue: #0070C0;
+    --mck-light-blue: #E1F0FA;
+    --mck-grey: #F2F2F2;
+    --mck-text: #404040;
+    --white: #FFFFFF;
+    --success: #6CAE75;
+    --warning: #ED7D31;
+    --danger: #E84562;
+    --neutral: #A5A5A5;
+}
+
+/* TONES: components colour themselves from var(--tone) */
+.tone-navy { --tone: var(--mck-navy); }
+.tone-blue { --tone: var(--mck-blue); }
+.tone-success { --tone: var(--success); }
+.tone-warning { --tone: var(--warning); }
+.tone-danger { --tone: var(--danger); }
+.tone-neutral { --tone: var(--neutral); }
+.tone-grey { --tone: #888; }
+.tone-teal { --tone: #00695c; }
+.tone-orange { --tone: #ef6c00; }
+
+body {
+    margin: 0; padding: 20px; background-color: #333;
+    font-family: 'Arial', sans-serif;
+    display: flex; justify-content: center; align-items: center; height: 100vh;
+}
+
+.slide-container {
+    width: 1280px; height: 720px; background-color: var(--white);
+    position: relative; box-shadow: 0 0 50px rgba(0,0,0,0.5);
+    display: grid; grid-template-rows: 100px 1fr 50px; overflow: hidden;
+}
+
+/* HEADER */
+.header { padding: 30px 50px 0 50px; }
+.header h1 { color: var(--mck-navy); font-size: 28px; margin: 0; text-transform: uppercase; }
+.header-line { height: 3px; background: linear-gradient(90deg, var(--mck-navy) 0%, var(--mck-blue) 100%); width: 100%; margin: 10px 0; }
+.header h2 { color: var(--mck-blue); font-size: 16px; margin: 0; font-weight: 400; }
+
+/* CONTENT GRID: card + pane (default), diagram + sidebar (wide), single column (full) */
+.content { display: grid; grid-template-columns: 25% 72%; padding: 10px 50px; gap: 30px; min-height: 0; }
+.content.wide { grid-template-columns: 70% 28%; padding: 20px 50px; }
+.content.full { display: flex; flex-direction: column; }
+
+/* --- LEFT COLUMN: METRIC CARD --- */
+.metric-card { display: flex; flex-direction: column; height: 100%; box-shadow: 0 4px 15px rgba(0,0,0,0.1); }
+.card-header { background-color: var(--mck-navy); color: var(--white); padding: 12px; font-size: 13px; font-weight: bold; letter-spacing: 0.5px; }
+.card-body { background-color: #EBF1F5; flex-grow: 1; padding: 20px; display: flex; flex-direction: column; gap: 20px; }
+.sow-group.owner { margin-top: auto; }
+.sow-label { color: var(--mck-navy); font-size: 11px; font-weight: bold; text-transform: uppercase; border-bottom: 1px solid #ccc; margin-bottom: 5px; padding-bottom: 2px; }
+.sow-text { font-size: 13px; color: #444; line-height: 1.4; }
+.owner .sow-text { font-weight: bold; color: var(--mck-navy); }
+.metrics-list { list-style: none; padding: 0; margin: 0; }
+.metrics-list li { margin-bottom: 10px; font-size: 12px; color: #333; display: flex; justify-content: space-between; gap: 8px; border-bottom: 1px dashed #ccc; padding-bottom: 2px; }
+.highlight { color: var(--mck-blue); font-weight: bold; text-align: right; }
+
+/* --- RIGHT COLUMN: PANELS --- */
+.right-pane { display: flex; flex-direction: column; gap: 20px; height: 100%; min-height: 0; }
+.panel {
+    border: 1px dashed #ccc; padding: 20px 15px 15px; background: #fafafa; border-radius: 4px; position: relative;
+    display: flex; flex-direction: column; justify-content: center; gap: 12px;
+}
+.panel.grow { flex-grow: 1; }
+.panel.solid { background: white; border: 1px solid #ddd; }
+.panel.bare { border: none; background: none; padding: 0; }
+.section-label { position: absolute; top: -10px; left: 15px; background: white; padding: 0 5px; color: var(--mck-navy); font-weight: bold; font-size: 11px; }
+.panel-row { display: flex; align-items: center; justify-content: center; gap: 15px; }
+.panel-row > * { flex: 1; }
+.panel-note { font-size: 10px; color: #666; font-style: italic; text-align: right; }
+.callout { text-align: center; padding: 10px; background: var(--mck-light-blue); border: 1px dashed var(--mck-blue); border-radius: 4px; font-size: 11px; color: var(--mck-navy); font-weight: bold; }
+
+/* FLOW: steps joined by arrows */
+.flow { display: flex; align-items: stretch; justify-content: center; position: relative; }
+.arrow { font-size: 24px; color: #ccc; margin: 0 12px; align-self: center; }
+.step { flex: 1; display: flex; flex-direction: column; align-items: center; text-align: center; gap: 4px; position: relative; }
+.step-icon { font-size: 20px; }
+.step-title { font-size: 11px; font-weight: bold; color: var(--mck-navy); text-transform: uppercase; }
+.step-desc { font-size: 10px; color: #666; line-height: 1.3; }
+.style-step .step { background: white; border: 1px solid #ddd; border-left: 4px solid var(--tone, var(--mck-blue)); padding: 10px; align-items: flex-start; text-align: left; box-shadow: 2px 2px 5px rgba(0,0,0,0.05); }
+.style-gate .step-title { width: 100%; box-sizing: border-box; padding: 10px; color: white; background: var(--tone, var(--mck-blue)); border-radius: 4px; box-shadow: 2px 2px 5px rgba(0,0,0,0.1); }
+.style-gate .step-desc { font-size: 9px; }
+.style-card .step { background: white; border: 1px solid #ddd; border-top: 3px solid var(--tone, var(--mck-blue)); border-radius: 4px; padding: 12px 10px; }
+.style-node::before { content: ''; position: absolute; top: 17px; left: 12%; right: 12%; height: 2px; background: #ccc; }
+.style-node .step-icon { width: 34px; height: 34px; line-height: 34px; border-radius: 50%; background: var(--tone, var(--mck-blue)); color: white; font-size: 14px; font-weight: bold; z-index: 1; }
+.step.checkpoint { flex: 0 0 auto; justify-content: center; background: none; border: none; box-shadow: none; padding: 0; }
+.step.checkpoint .step-title { width: 50px; height: 50px; line-height: 50px; padding: 0; border-radius: 50%; color: white; background: var(--tone, var(--warning)); text-align: center; }
+
+/* COLUMNS: rolling forecast buckets */
+.columns { display: grid; grid-auto-flow: column; grid-auto-columns: 1fr; gap: 15px; }
+.col-header { font-size: 11px; font-weight: bold; color: var(--mck-navy); text-align: center; border-bottom: 2px solid var(--mck-navy); padding-bottom: 5px; margin-bottom: 8px; }
+.block { font-size: 10px; padding: 5px 8px; margin-bottom: 4px; border-radius: 3px; color: white; background: var(--tone, var(--neutral)); }
+.col-note { text-align: center; font-size: 10px; margin-top: 5px; color: #666; font-weight: bold; }
+.legend { display: flex; justify-content: center; gap: 20px; font-size: 10px; color: #666; }
+.dot { display: inline-block; width: 10px; height: 10px; border-radius: 50%; margin-right: 5px; vertical-align: middle; background: var(--tone); }
+
+/* TABLE */
+table { width: 100%; border-collapse: collapse; font-size: 11px; box-shadow: 0 4px 10px rgba(0,0,0,0.05); }
+thead { background-color: var(--mck-navy); color: white; }
+th { padding: 10px; text-align: left; font-weight: bold; border-right: 1px solid rgba(255,255,255,0.2); text-transform: uppercase; }
+td { padding: 8px 10px; border-bottom: 1px solid #ddd; border-right: 1px solid #eee; color: #333; vertical-align: middle; }
+tr:nth-child(even) { background-color: #f9f9f9; }
+tr:hover { background-color: var(--mck-light-blue); }
+tr.gap td { color: var(--danger); font-weight: bold; }
+tr.shared { background-color: var(--mck-light-blue); }
+.col-key { font-weight: bold; color: var(--mck-navy); }
+.col-metric { font-weight: bold; color: var(--mck-blue); }
+.col-center { text-align: center; }
+.tag { display: inline-block; padding: 2px 5px; border-radius: 3px; margin: 0 4px 2px 0; font-size: 10px; color: var(--tone); border: 1px solid var(--tone); background: white; }
+
+/* BARS: stacked columns with reference lines */
+.bar-chart { position: relative; height: 190px; display: flex; align-items: flex-end; justify-content: space-around; border-bottom: 2px solid #ccc; margin: 10px 0 35px; }
+.bar-col { position: relative; width: 70px; height: 100%; display: flex; flex-direction: column-reverse; }
+.bar-seg { background: var(--tone, var(--mck-blue)); color: white; font-size: 10px; font-weight: bold; display: flex; justify-content: center; padding-top: 3px; box-sizing: border-box; overflow: hidden; }
+.bar-label { position: absolute; top: 100%; left: -25px; right: -25px; margin-top: 5px; text-align: center; font-size: 10px; font-weight: bold; color: var(--mck-navy); }
+.bar-sub { display: block; font-weight: normal; font-size: 9px; color: var(--tone); }
+.ref-line { position: absolute; left: 0; right: 0; border-top: 2px dashed var(--tone, var(--danger)); z-index: 1; }
+.ref-label { position: absolute; right: 0; top: -16px; font-size: 9px; font-weight: bold; color: var(--tone, var(--danger)); }
+
+/* CARDS: KPI / SLA tiles */
+.cards { display: grid; grid-auto-flow: column; grid-auto-columns: 1fr; gap: 15px; }
+.cards.vertical { grid-auto-flow: row; gap: 8px; }
+.card { background: white; border: 1px solid #ddd; border-top: 4px solid var(--tone, var(--mck-blue)); border-radius: 4px; padding: 12px; text-align: center; display: flex; flex-direction: column; gap: 5px; box-shadow: 0 2px 5px rgba(0,0,0,0.05); }
+.cards.vertical .card { text-align: left; padding: 8px 12px; border-top: 1px solid #ddd; border-left: 4px solid var(--tone, var(--mck-blue)); }
+.card-icon { font-size: 20px; }
+.card-title { font-size: 11px; font-weight: bold; color: var(--mck-navy); text-transform: uppercase; }
+.card-value { font-size: 26px; font-weight: bold; color: var(--tone, var(--mck-blue)); }
+.card-target { font-size: 10px; font-weight: bold; color: #666; }
+.card-desc { font-size: 10px; color: #666; line-height: 1.3; }
+
+/* CHECKLIST */
+.checklist { list-style: none; margin: 0; padding: 0; font-size: 11px; color: #333; display: flex; flex-direction: column; gap: 6px; }
+.checklist-title { font-size: 11px; font-weight: bold; color: #666; margin-bottom: 5px; }
+.checklist li { background: white; border: 1px solid #eee; padding: 6px 8px; border-radius: 3px; }
+.checklist li::before { content: '●'; color: var(--mck-blue); margin-right: 6px; }
+
+/* 2x2 MATRIX */
+.matrix-grid { display: grid; grid-template-columns: 40px 1fr 1fr; grid-template-rows: 1fr 1fr 40px; gap: 5px; flex-grow: 1; }
+.y-axis { grid-row: 1 / 3; grid-column: 1; writing-mode: vertical-rl; transform: rotate(180deg); text-align: center; font-weight: bold; color: var(--mck-navy); font-size: 12px; border-right: 2px solid #ccc; padding-left: 10px; }
+.x-axis { grid-row: 3; grid-column: 2 / 4; text-align: center; font-weight: bold; color: var(--mck-navy); font-size: 12px; border-top: 2px solid #ccc; padding-top: 10px; }
+.quadrant { border: 1px solid #eee; padding: 15px; display: flex; flex-direction: column; background: #F9F9F9; }
+.quadrant:nth-of-type(1) { background-color: var(--mck-light-blue); }
+.quadrant:nth-of-type(4) { background-color: #FDECEC; }
+.q-label { font-weight: bold; font-size: 12px; margin-bottom: 5px; text-transform: uppercase; color: var(--tone); }
+.q-desc { font-size: 11px; color: #666; margin-bottom: 10px; }
+.dot-item { font-size: 10px; padding: 3px 6px; border-radius: 10px; color: white; display: inline-block; margin: 2px; background: var(--tone); }
+
+/* TEMPLE DIAGRAM (operating model) */
+.diagram-container { display: flex; flex-direction: column; height: 100%; justify-content: flex-end; }
+.roof { background: var(--mck-navy); color: white; text-align: center; padding: 15px; clip-path: polygon(5% 0%, 95% 0%, 100% 100%, 0% 100%); margin-bottom: 5px; }
+.roof-text { font-size: 16px; font-weight: bold; text-transform: uppercase; letter-spacing: 1px; }
+.roof-sub { font-size: 11px; margin-top: 5px; color: #ccc; }
+.pillars-row { display: flex; justify-content: space-between; height: 350px; width: 98%; margin: 0 auto; }
+.pillar {
+    width: 13%; background: linear-gradient(180deg, #f9f9f9 0%, #e1e1e1 100%);
+    border: 1px solid #ccc; border-top: 4px solid var(--mck-blue); border-bottom: 4px solid var(--mck-navy);
+    display: flex; flex-direction: column; align-items: center; justify-content: center;
+    padding: 10px 5px; text-align: center; position: relative;
+}
+.p-num { font-size: 24px; font-weight: bold; color: #ddd; position: absolute; top: 10px; }
+.p-icon { font-size: 24px; margin-bottom: 10px; }
+.p-title { font-size: 11px; font-weight: bold; color: var(--mck-navy); text-transform: uppercase; margin-bottom: 8px; line-height: 1.2; }
+.p-desc { font-size: 9px; color: #555; line-height: 1.3; }
+.foundation { background: var(--mck-grey); border-top: 2px solid #999; text-align: center; padding: 15px; margin-top: 5px; font-size: 12px; font-weight: bold; color: #666; text-transform: uppercase; }
+
+/* SIDEBAR */
+.sidebar { background: #fafafa; border-left: 1px solid #ddd; padding-left: 30px; display: flex; flex-direction: column; justify-content: center; gap: 25px; }
+.sidebar-title { font-size: 14px; font-weight: bold; color: var(--mck-navy); text-transform: uppercase; border-bottom: 2px solid var(--mck-blue); padding-bottom: 5px; }
+.b-title { font-size: 12px; font-weight: bold; color: var(--mck-blue); text-transform: uppercase; }
+.b-title::before { content: '✔ '; color: var(--success); }
+.b-text { font-size: 11px; color: #444; line-height: 1.4; padding-left: 20px; margin-top: 5px; }
+
+/* FOOTER */
+.footer { background-color: var(--mck-grey); display: flex; align-items: center; justify-content: center; border-top: 1px solid #ccc; }
+.kicker { font-size: 13px; font-style: italic; color: var(--mck-navy); }
+"""
+
+# ==========================================
+# 2. TEMPLATES (format strings bound once at import)
+# ==========================================
+T_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{page_title}</title>
+    <link rel="stylesheet" href="{css_href}">
+</head>
+<body>
+{slide}
+</body>
+</html>
+""".format
+
+T_SLIDE = """    <div class="slide-container">
+        <div class="header">
+            <h1>{title}</h1>
+            <div class="header-line"></div>
+            <h2>{subtitle}</h2>
+        </div>
+        <div class="content{layout}">
+{body}
+        </div>
+        <div class="footer">
+            <div class="kicker">{kicker}</div>
+        </div>
+    </div>""".format
+
+T_CARD = """            <div class="metric-card">
+                <div class="card-header">{header}</div>
+                <div class="card-body">
+{sections}
+                </div>
+            </div>""".format
+T_SECTION = '<div class="sow-group{extra}"><div class="sow-label">{label}</div>{value}</div>'.format
+T_METRIC = '<li><span>{name}</span> <span class="highlight">{value}</span></li>'.format
+
+T_PANE = '            <div class="right-pane">\n{panels}\n            </div>'.format
+T_PANEL = '<div class="panel{extra}">{label}{visuals}{note}</div>'.format
+T_STEP = ('<div class="step{extra}">{icon}<div class="step-title">{title}</div>'
+          '{desc}</div>').format
+T_BLOCK = '<div class="block{tone}">{text}</div>'.format
+T_BAR = ('<div class="bar-col">{segments}<div class="bar-label{tone}">{label}'
+         '{sub}</div></div>').format
+T_SEG = '<div class="bar-seg{tone}" style="height:{height:.1f}%;">{text}</div>'.format
+T_REF = ('<div class="ref-line{tone}" style="bottom:{bottom:.1f}%;">'
+         '<span class="ref-label">{label}</span></div>').format
+T_CARD_TILE = ('<div class="card{tone}">{icon}<div class="card-title">{title}</div>{value}{target}'
+               '{desc}</div>').format
+T_QUADRANT = ('<div class="quadrant{tone}"><div class="q-label">{label}</div>'
+              '<div class="q-desc">{desc}</div><div>{items}</div></div>').format
+T_PILLAR = ('<div class="pillar"><span class="p-num">{num}</span><div class="p-icon">{icon}</div>'
+            '<div class="p-title">{title}</div><div class="p-desc">{desc}</div></div>').format
+T_BENEFIT = '<div><div class="b-title">{title}</div><div class="b-text">{text}</div></div>'.format
+
+def _t(text):
+    """Escapes spec text for HTML; newlines become line breaks"""
+    return html.escape(str(text), quote=False).replace('\n', '<br>')
+
+def _tone(name):
+    return f" tone-{name}" if name else ''
+
+def _opt(template, value):
+    """Renders `template` around value, or nothing when the spec leaves it out"""
+    return template.format(_t(value)) if value not in (None, '') else ''
+
+# ==========================================
+# 3. COMPONENTS
+# ==========================================
+def render_card(card):
+    """Left column: label/text sections, label/metric lists and the owner"""
+    parts = []
+    for sec in card['sections']:
+        if 'metrics' in sec:
+            value = '<ul class="metrics-list">' + ''.join(
+                T_METRIC(name=_t(n), value=_t(v)) for n, v in sec['metrics']) + '</ul>'
+        else:
+            value = f'<div class="sow-text">{_t(sec["text"])}</div>'
+        parts.append(T_SECTION(extra='', label=_t(sec['label']), value=value))
+    if card.get('owner'):
+        label, name = card['owner']
+        parts.append(T_SECTION(extra=' owner', label=_t(label), value=f'<div class="sow-text">{_t(name)}</div>'))
+    return T_CARD(header=_t(card['header']), sections='\n'.join(parts))
+
+def render_flow(v):
+    style = v.get('style', 'step')
+    arrow = '' if style == 'node' else '<div class="arrow">&rarr;</div>'
+    steps = [T_STEP(extra=(' checkpoint' if s.get('checkpoint') else '') + _tone(s.get('tone')),
+                    icon=_opt('<div class="step-icon">{}</div>', s.get('icon')),
+                    title=_t(s['title']),
+                    desc=_opt('<div class="step-desc">{}</div>', s.get('desc')))
+             for s in v['steps']]
+    return f'<div class="flow style-{style}">' + arrow.join(steps) + '</div>'
+
+def render_columns(v):
+    cols = []
+    for c in v['columns']:
+        blocks = ''.join(T_BLOCK(tone=_tone(tone), text=_t(text)) for text, tone in c['blocks'])
+        note = _opt('<div class="col-note">{}</div>', c.get('note'))
+        cols.append(f'<div><div class="col-header">{_t(c["header"])}</div>{blocks}{note}</div>')
+    legend = ''.join(f'<div><span class="dot{_tone(tone)}"></span>{_t(text)}</div>'
+                     for tone, text in v.get('legend', []))
+    return (f'<div class="columns">{"".join(cols)}</div>'
+            + (f'<div class="legend">{legend}</div>' if legend else ''))
+
+def _cell(value, css):
+    if isinstance(value, list):   # [(tone, text), ...] rendered as tags
+        value = ''.join(f'<span class="tag{_tone(tone)}">{_t(text)}</span>' for tone, text in value)
+    else:
+        value = _t(value)
+    return f'<td class="{css}">{value}</td>' if css else f'<td>{value}</td>'
+
+def render_table(v):
+    css = [f"col-{c}" if c else '' for c in v.get('col_classes', [''] * len(v['columns']))]
+    head = ''.join(f'<th class="{c}">{_t(h)}</th>' if c else f'<th>{_t(h)}</th>'
+                   for h, c in zip(v['columns'], css))
+    body = []
+    for row in v['rows']:
+        cells, row_class = (row['cells'], row.get('class')) if isinstance(row, dict) else (row, None)
+        tr = f'<tr class="{row_class}">' if row_class else '<tr>'
+        body.append(tr + ''.join(_cell(value, c) for value, c in zip(cells, css)) + '</tr>')
+    return f'<table><thead><tr>{head}</tr></thead><tbody>{"".join(body)}</tbody></table>'
+
+def render_bars(v):
+    """Stacked bars; segment heights and reference lines are relative to v['scale']"""
+    scale = v.get('scale') or max(sum(seg[0] for seg in b['segments']) for b in v['bars']) or 1
+    lines = ''.join(T_REF(tone=_tone(tone), bottom=100 * at / scale, label=_t(label))
+                    for at, label, tone in v.get('lines', []))
+    bars = ''.join(T_BAR(segments=''.join(T_SEG(tone=_tone(tone), height=100 * value / scale, text=_t(text))
+                                          for value, text, tone in b['segments']),
+                         tone=_tone(b.get('tone')), label=_t(b['label']),
+                         sub=_opt('<span class="bar-sub">{}</span>', b.get('sub')))
+                   for b in v['bars'])
+    legend = ''.join(f'<div><span class="dot{_tone(tone)}"></span>{_t(text)}</div>'
+                     for tone, text in v.get('legend', []))
+    return (f'<div class="bar-chart">{lines}{bars}</div>'
+            + (f'<div class="legend">{legend}</div>' if legend else ''))
+
+def render_cards(v):
+    tiles = ''.join(T_CARD_TILE(tone=_tone(c.get('tone')),
+                                icon=_opt('<div class="card-icon">{}</div>', c.get('icon')),
+                                title=_t(c['title']),
+                                value=_opt('<div class="card-value">{}</div>', c.get('value')),
+                                target=_opt('<div class="card-target">{}</div>', c.get('target')),
+                                desc=_opt('<div class="card-desc">{}</div>', c.get('desc')))
+                    for c in v['cards'])
+    return f'<div class="cards{" vertical" if v.get("vertical") else ""}">{tiles}</div>'
+
+def render_checklist(v):
+    items = ''.join(f'<li>{_t(i)}</li>' for i in v['items'])
+    title = _opt('<div class="checklist-title">{}</div>', v.get('title'))
+    return f'<div>{title}<ul class="checklist">{items}</ul></div>'
+
+def render_matrix(v):
+    quads = ''.join(T_QUADRANT(tone=_tone(q.get('tone')), label=_t(q['label']), desc=_t(q['desc']),
+                               items=''.join(f'<span class="dot-item">{_t(i)}</span>' for i in q.get('items', [])))
+                    for q in v['quadrants'])
+    return (f'<div class="matrix-grid"><div class="y-axis">{_t(v["y_axis"])}</div>{quads}'
+            f'<div class="x-axis">{_t(v["x_axis"])}</div></div>')
+
+def render_temple(v):
+    pillars = ''.join(T_PILLAR(num=f"{i:02d}", icon=_t(p['icon']), title=_t(p['title']), desc=_t(p['desc']))
+                      for i, p in enumerate(v['pillars'], start=1))
+    return (f'<div class="diagram-container"><div class="roof"><div class="roof-text">{_t(v["roof"])}</div>'
+            f'<div class="roof-sub">{_t(v["roof_sub"])}</div></div><div class="pillars-row">{pillars}</div>'
+            f'<div class="foundation">{_t(v["foundation"])}</div></div>')
+
+def render_callout(v):
+    return f'<div class="callout">{_t(v["text"])}</div>'
+
+VISUALS = {
+    'flow': render_flow, 'columns': render_columns, 'table': render_table, 'bars': render_bars,
+    'cards': render_cards, 'checklist': render_checklist, 'matrix': render_matrix,
+    'temple': render_temple, 'callout': render_callout
+}
+
+def render_panel(panel):
+    """A labelled box holding one or more visuals (several visuals sit side by side in a row)"""
+    visuals = [VISUALS[v['kind']](v) for v in panel['visuals']]
+    body = visuals[0] if len(visuals) == 1 else '<div class="panel-row">' + ''.join(visuals) + '</div>'
+    extra = ''.join(f' {flag}' for flag in ('grow', 'solid', 'bare') if panel.get(flag))
+    return T_PANEL(extra=extra,
+                   label=_opt('<div class="section-label">{}</div>', panel.get('label')),
+                   visuals=body + ''.join(render_callout(c) for c in panel.get('callouts', [])),
+                   note=_opt('<div class="panel-note">{}</div>', panel.get('note')))
+
+def render_sidebar(side):
+    items = ''.join(T_BENEFIT(title=_t(t), text=_t(x)) for t, x in side['items'])
+    return f'            <div class="sidebar"><div class="sidebar-title">{_t(side["title"])}</div>{items}</div>'
+
+def render_slide_markup(spec):
+    """The .slide-container block for one slide spec"""
+    pane = T_PANE(panels='\n'.join(render_panel(p) for p in spec['panels']))
+    if spec.get('card'):
+        layout, body = '', render_card(spec['card']) + '\n' + pane
+    elif spec.get('sidebar'):
+        layout, body = ' wide', pane + '\n' + render_sidebar(spec['sidebar'])
+    else:
+        layout, body = ' full', pane
+    return T_SLIDE(title=_t(spec['title']), subtitle=_t(spec['subtitle']), layout=layout,
+                   body=body, kicker=_t(spec['kicker']))
+
+def render_slide(spec, css_href=STYLESHEET):
+    """Full HTML page for one slide spec"""
+    return T_PAGE(page_title=_t(spec.get('page_title', spec['title'])), css_href=css_href,
+                  slide=render_slide_markup(spec))
+
+# ==========================================
+# 4. SLIDE SPECS (the governance deck)
+# ==========================================
+def _sow_card(activity, metrics, owner, header="SOW METRICS & FOCUS AREA",
+              activity_label="Key SOW Activity", metrics_label="Measurable Metrics"):
+    return {'header': header,
+            'sections': [{'label': activity_label, 'text': activity},
+                         {'label': metrics_label, 'metrics': metrics}],
+            'owner': ("Primary Owner", owner)}
+
+INTAKE_STEPS = [
+    {'title': "Asana Goals", 'tone': 'danger'},
+    {'title': "Gap Analysis", 'tone': 'navy'},
+    {'title': "Fulfillment", 'tone': 'blue'}
+]
+
+def _intake_flow(label, descs):
+    return {'label': label,
+            'visuals': [{'kind': 'flow', 'style': 'step',
+                         'steps': [dict(s, desc=d) for s, d in zip(INTAKE_STEPS, descs)]}]}
+
+PILLAR1_CARD = _sow_card(
+    "Review strategic roadmap & predict rolling forecast to prevent bench/gap issues.",
+    [("Forecast Accuracy:", "+/- 10%"), ("Rolling Window:", "30 / 60 / 90 Days"),
+     ("Trend Data:", "Ticket Vol. & Backlog")],
+    "Supplier Portfolio Lead")
+
+ROLLING_FORECAST = {'kind': 'columns', 'columns': [
+    {'header': "30 DAYS (Firm)", 'note': "100% Named",
+     'blocks': [("Dev: John Doe (Named)", 'success'), ("QA: Sarah Smith (Named)", 'success'),
+                ("SM: Mike R. (Named)", 'success'), ("DE: Jane Doe (Named)", 'success')]},
+    {'header': "60 DAYS (Soft Lock)", 'note': "Active Hiring",
+     'blocks': [("Dev: John Doe", 'success'), ("QA: Sarah Smith", 'success'),
+                ("Role: Scrum Master", 'warning'), ("Role: Data Eng", 'warning')]},
+    {'header': "90 DAYS (Outlook)", 'note': "Budget Placeholder",
+     'blocks': [("Dev: John Doe", 'success'), ("Capacity Bucket: QA", 'neutral'),
+                ("Capacity Bucket: SM", 'neutral'), ("Capacity Bucket: DE", 'neutral')]}],
+    'legend': [('success', "Named (Billable)"), ('warning', "Role (Recruiting)"), ('neutral', "Placeholder")]}
+
+def _skill_forecast(buckets):
+    rows = [["Data & AI", "Squad Alpha", "Q1-2026", "AXIA-123", "Data Engineering", "Senior", 1, 1, 1, 1],
+            ["Legacy Mod", "Squad Beta", "Q2-2026", "AXIA-345", "Cloud/DevOps", "Senior", 1, 1, 1, 1],
+            {'class': 'gap', 'cells': ["Legacy Mod", "Core Ops", "Q2-2026", "AXIA-345", "SAP ABAP", "Standard", 0, 1, 1, 1]},
+            ["Cloud Infra", "Squad Alpha", "Q3-2026", "AXIA-345", "Python/AI", "Standard", 0, 0, 0, 1],
+            {'class': 'shared', 'cells': ["Shared Pool", "Support Grp", "BAU", "N/A", "Full Stack Java", "Standard", 2, 2, 2, 2]}]
+    return {'kind': 'table', 'rows': rows,
+            'columns': ["Portfolio", "Team", "Goal", "Project", "Skill Required", "Level"] + buckets,
+            'col_classes': [''] * 6 + ['center'] * len(buckets)}
+
+SLIDES = [
+    {'file': 's0-1.html', 'page_title': "SquadOps Governance Model - Executive Summary",
+     'title': "SquadOps Governance Model",
+     'subtitle': "A unified operating framework to synchronize 140+ resources from Demand to Delivery",
+     'panels': [{'bare': True, 'grow': True, 'visuals': [{
+         'kind': 'temple', 'roof': "Predictive Delivery Outcome", 'roof_sub': "On-Time • On-Budget • High Quality",
+         'pillars': [
+             {'icon': "📡", 'title': "Demand Forecast", 'desc': "Proactive roadmap planning & gap analysis"},
+             {'icon': "📥", 'title': "Work Intake", 'desc': "Standardized prioritization & DoR Gating"},
+             {'icon': "👥", 'title': "Squad Formation", 'desc': "Balanced role ratios & rapid staffing"},
+             {'icon': "⚡", 'title': "Flex Mgmt", 'desc': "Elastic scaling for demand spikes"},
+             {'icon': "📊", 'title': "Capacity Util.", 'desc': "Real-time bandwidth monitoring"},
+             {'icon': "🏗️", 'title': "Project Gov.", 'desc': "SDLC standards & PMI rigor"},
+             {'icon': "🎯", 'title': "Execution", 'desc': "SLA tracking & Quality Gates"}],
+         'foundation': "Foundational Enablers: Automated Dashboards | Continuous Improvement Loop | SOW Compliance"}]}],
+     'sidebar': {'title': "Why This Model?", 'items': [
+         ("1. Predictive Delivery", 'Moves from "Best Effort" to "Guaranteed Outcome" by linking capacity directly to demand signals.'),
+         ("2. Cost Optimization", "Flex Hour & Utilization pillars ensure you only pay for productive output, eliminating bench leakage."),
+         ("3. Quality Assurance", 'Embedded "DoD" gates in the Execution pillar reduce defect leakage by ~40% vs. industry avg.'),
+         ("4. Strategic Alignment", "Ensures every Squad Hour burned is directly mapped to a prioritized Asana Business Goal.")]},
+     'kicker': '"Structure drives Behavior. This governance model aligns daily Squad behaviors with Strategic Outcomes."'},
+
+    {'file': 's1.html', 'page_title': "SquadOps Governance - Pillar 1",
+     'title': "Pillar 1: Demand Forecasting",
+     'subtitle': "Predictive 30/60/90-day forecasts drive skill readiness vs. reactive hiring",
+     'card': _sow_card("Review strategic roadmap & predict rolling forecast to prevent bench/gap issues.",
+                       [("Forecast Accuracy:", "+/- 10%"), ("Rolling Window:", "30 / 60 / 90 Days"),
+                        ("Trend Data:", "Ticket Volume & Backlog")],
+                       "Supplier Portfolio Lead"),
+     'panels': [{'label': "DATA COLLECTION PHASE MAP (ALIGNED TO PROJECT LIFECYCLE)", 'grow': True, 'visuals': [{
+         'kind': 'flow', 'style': 'gate', 'steps': [
+             {'title': "Phase 1: Continuous", 'desc': "Historical Trend\nAnalysis", 'tone': 'blue'},
+             {'title': "Phase 2: Planning", 'desc': "Strategic Roadmap\nReview", 'tone': 'blue'},
+             {'title': "Phase 3: Initiation", 'desc': "30/60/90 Day\nRolling Forecast", 'tone': 'navy'}]}]}],
+     'kicker': "\"Accurate forecasting reduces 'panic hiring' and ensures the right skills are available on Day 1.\""},
+
+    {'file': 's1-1.html', 'page_title': "SquadOps - Goal-Based Forecasting",
+     'title': "Pillar 1: Demand Forecasting & Quarterly Planning",
+     'subtitle': "Proactive resource orchestration ensures Asana goals are accepted only when fully staffed",
+     'card': {'header': "QUARTERLY PLANNING PROCESS", 'sections': [
+         {'label': "Trigger Event", 'text': 'Customer "Next Quarter Planning" meeting to review & accept Asana Goals.'},
+         {'label': "Supplier Value Add", 'metrics': [("Pre-meeting", "Gap Analysis"), ("Checking", "Support Group availability"),
+                                                     ("Identifying", "Cross-skilling candidates")]},
+         {'label': "Key Success Metric", 'metrics': [("Goal Acceptance:", "100%"), ("Goals rejected for lack of resources:", "Zero")]}]},
+     'panels': [{'label': "RESOURCE FULFILLMENT DECISION FLOW", 'grow': True, 'visuals': [
+         {'kind': 'flow', 'style': 'card', 'steps': [
+             {'title': "Asana Goals", 'desc': "Quarterly Goal Definitions\n(Draft Status)", 'tone': 'danger'},
+             {'title': "Planning\nMeeting", 'desc': "Is Resource Available?", 'tone': 'navy'}]},
+         {'kind': 'cards', 'vertical': True, 'cards': [
+             {'icon': "⚡", 'title': "Lever 1: Support Share", 'desc': "Borrow from Support Group"},
+             {'icon': "🔄", 'title': "Lever 2: Cross-Skill", 'desc': "Train existing Squad Member"},
+             {'icon': "➕", 'title': "Lever 3: Onboard New", 'desc': "Trigger Hiring (Lead Time)", 'tone': 'grey'}]}],
+         'note': "Internal fulfillment: optimized utilization across Support & Squads",
+         'callouts': [{'text': 'OUTCOME: Goals are "Accepted" in Asana only after a Fulfilment Lever is confirmed.'}]}],
+     'kicker': "\"We don't just track demand; we actively solve for it by leveraging the synergy between Support and Squads.\""},
+
+    {'file': 's1-2.html', 'page_title': "SquadOps - Integrated Demand Forecasting",
+     'title': "Pillar 1: Demand Forecasting & SOW Alignment",
+     'subtitle': "Operationalizing Core FTE Forecasting to meet variable business demand (SOW Exhibit C)",
+     'card': {'header': "SOW COMMITMENTS & METRICS", 'sections': [
+         {'label': "SOW Requirement (General Mgmt)",
+          'text': '"Operationalize Core FTE Forecasting... to meet variable business demand, onboard niche skills, and optimize cost."'},
+         {'label': "SOW Requirement (Squad Formation)",
+          'text': '"Recommend role ratios and structure (e.g., Sr:Dev:Jr) to ensure balanced delivery capacity."'},
+         {'label': "Success Metrics", 'metrics': [("Forecast Accuracy:", "+/- 10%"), ("Goal Acceptance Rate:", "100%"),
+                                                  ("Bench Cost Variance:", "< 5%")]}],
+         'owner': ("Owner", "Supplier Portfolio Lead")},
+     'panels': [_intake_flow("THE INPUT PROCESS", ["Customer Input (Quarterly)", "Compare vs. Capacity",
+                                                   "Share / Cross-Skill / Hire"]),
+                {'label': "THE OUTPUT: 30 / 60 / 90 ROLLING FORECAST VIEW", 'grow': True, 'visuals': [ROLLING_FORECAST]}],
+     'kicker': "\"Moving from 'Role-based' to 'Name-based' locking creates a predictable financial baseline for the quarter.\""},
+
+    {'file': 's1-4.html', 'page_title': "Pillar 1: Demand Forecasting",
+     'title': "Pillar 1: Demand Forecasting & SOW Alignment",
+     'subtitle': "Operationalizing Core FTE Forecasting to meet variable business demand (Exhibit C)",
+     'card': PILLAR1_CARD,
+     'panels': [_intake_flow('INPUT: THE "GOAL ACCEPTANCE" HANDSHAKE', ["Next Quarter Input", "Match vs. Capacity",
+                                                                       "New Hire / Cross-Skill"]),
+                {'label': "OUTPUT: 30 / 60 / 90 ROLLING FORECAST VIEW", 'grow': True, 'visuals': [ROLLING_FORECAST]}],
+     'kicker': "\"Moving from 'Role-based' to 'Name-based' locking creates a predictable financial baseline for the quarter.\""},
+
+    {'file': 's1-5.html', 'page_title': "Pillar 1: Demand Forecasting - Detailed View",
+     'title': "Pillar 1: Demand Forecasting & SOW Alignment",
+     'subtitle': "Operationalizing Core FTE Forecasting to meet variable business demand (Exhibit C)",
+     'card': PILLAR1_CARD,
+     'panels': [_intake_flow("INPUT: THE QUARTERLY PLANNING HANDSHAKE", ["Customer Input", "Capacity Check",
+                                                                         "Share / Hire / Train"]),
+                {'label': "OUTPUT: 4-MONTH ROLLING RESOURCE FORECAST", 'grow': True, 'solid': True,
+                 'visuals': [_skill_forecast(["Jan", "Feb", "Mar", "Apr"])],
+                 'note': "* Red text indicates identified capacity gap requiring hiring trigger."}],
+     'kicker': "\"Granular skill-level forecasting ensures we solve for 'Senior Data Engineer' gaps, not just generic 'Headcount' numbers.\""},
+
+    {'file': 's1-6.html', 'page_title': "Pillar 1: Demand Forecasting - Combined View",
+     'title': "Pillar 1: Demand Forecasting & SOW Alignment",
+     'subtitle': "Operationalizing Core FTE Forecasting to meet variable business demand (Exhibit C)",
+     'card': PILLAR1_CARD,
+     'panels': [_intake_flow("INPUT: THE QUARTERLY PLANNING HANDSHAKE", ["Customer Input", "Capacity Check",
+                                                                         "Share / Hire / Train"]),
+                {'label': "THE OUTPUT: 30 / 60 / 90 ROLLING FORECAST VIEW", 'grow': True, 'solid': True,
+                 'visuals': [_skill_forecast(["30d", "60d", "90d", "120d"])],
+                 'note': "* Red text indicates identified capacity gap requiring hiring trigger."}],
+     'kicker': "\"Granular skill-level forecasting, actively solve for it by leveraging the synergy between Support and Squads.\""},
+
+    {'file': 's2-1.html', 'page_title': "Pillar 2: Work Intake & Prioritization",
+     'title': "Pillar 2: Work Intake & Prioritization",
+     'subtitle': 'Standardized gating ensures zero "ambiguous requirements" enter the Squad Backlog',
+     'card': _sow_card("Validate scope, estimate effort, and prioritize backlog items based on business value.",
+                       [("Intake Cycle Time:", "< 5 Days"), ("Ready Compliance:", "100% (DoR Met)"),
+                        ("Backlog Health:", "2 Sprints Ready")],
+                       "Demand Manager / Scrum Master"),
+     'panels': [{'label': 'THE "DEFINITION OF READY" (DoR) GATE', 'visuals': [{
+         'kind': 'flow', 'style': 'gate', 'steps': [
+             {'title': "Raw Demand", 'desc': "Source: Asana Goals\n(Unfiltered)", 'tone': 'grey'},
+             {'title': "Triage & Scoring", 'desc': "Check: Technical Feasibility\n& Business Value", 'tone': 'warning'},
+             {'title': "Estimation", 'desc': "Output: Story Points\n& Dependency Map", 'tone': 'blue'},
+             {'title': "Sprint Ready", 'desc': "Status: Approved\n(DoR Checklist Met)", 'tone': 'success'}]}]},
+                {'label': "OUTPUT: PRIORITIZATION SCORING MATRIX", 'grow': True, 'solid': True, 'visuals': [{
+                    'kind': 'matrix', 'y_axis': "BUSINESS VALUE (ROI)", 'x_axis': "COMPLEXITY / EFFORT",
+                    'quadrants': [
+                        {'label': "Quick Wins (P1)", 'desc': "High Value / Low Effort", 'tone': 'blue',
+                         'items': ["Asana Goal #42", "API Fix"]},
+                        {'label': "Strategic (P2)", 'desc': "High Value / High Effort", 'tone': 'grey',
+                         'items': ["Cloud Migration", "New UX"]},
+                        {'label': "Fillers (P3)", 'desc': "Low Value / Low Effort", 'tone': 'neutral',
+                         'items': ["Minor UI Tweaks"]},
+                        {'label': "Avoid / Defer", 'desc': "Low Value / High Effort", 'tone': 'danger',
+                         'items': ["Legacy Report"]}]}]}],
+     'kicker': "\"We do not start work that isn't ready. The 'DoR Gate' protects the Squad from churn and blocking issues.\""},
+
+    {'file': 's2-2.html', 'page_title': "Pillar 2: Work Intake & PM Lite",
+     'title': "Pillar 2: Work Intake & Project Initiation",
+     'subtitle': 'Standardized "PM Lite" governance ensures structured entry from Asana to Execution',
+     'card': _sow_card("Collaborate with Product Owner & SA to convert prioritized Asana goals into a ready, estimated squad backlog.",
+                       [("Intake Cycle Time:", "< 5 Days"), ("Initiation Package:", "100% Complete"),
+                        ("Estimate Turnaround:", "< 48 Hours")],
+                       "Squad Lead / Demand Manager"),
+     'panels': [{'label': "THE ASANA INTAKE PIPELINE", 'visuals': [{
+         'kind': 'flow', 'style': 'card', 'steps': [
+             {'title': "SA Review", 'desc': "Customer Priority Set", 'tone': 'neutral'},
+             {'title': "Squad Backlog", 'desc': "PM Lite Activities", 'tone': 'navy'},
+             {'title': "Execution", 'desc': "Sprint Delivery", 'tone': 'blue'}]}]},
+                {'label': 'THE "PM LITE" INITIATION PACKAGE', 'grow': True, 'visuals': [
+                    {'kind': 'checklist', 'title': "SQUAD LEAD ACTIONS:",
+                     'items': ["Collaborate with Product Owner & SA", "Check Definition of Ready (DoR)",
+                               "Provide Effort Estimates", "Allocate Squad Resources"]},
+                    {'kind': 'cards', 'cards': [
+                        {'icon': "📄", 'title': "Project Charter", 'desc': "Scope, Goals, Timeline"},
+                        {'icon': "👥", 'title': "RACI Matrix", 'desc': "Roles & Responsibilities"},
+                        {'icon': "📊", 'title': "Estimates", 'desc': "Story Points / Hours"},
+                        {'icon': "🚀", 'title': "Kickoff", 'desc': "Approval to Start", 'tone': 'success'}]}],
+                 'note': "Output: see Office artifacts"}],
+     'kicker': '"We transform a simple Asana ticket into a structured project with clear ownership (RACI) and defined scope (Charter)."'},
+
+    {'file': 's3-1.html', 'page_title': "Pillar 3: Squad Formation",
+     'title': "Pillar 3: Squad Formation & Structure",
+     'subtitle': "Dynamically assembling balanced, right-sized teams to optimize delivery capacity & cost",
+     'card': _sow_card('"Recommend role ratios and Squad structures (e.g., Sr:Dev:Jr = 40:45:15)... Develop squad charter and ramp up plans."',
+                       [("Role Ratio Target:", "40:45:15 Compliance"), ("Time-to-Staff:", "< 5 Business Days"),
+                        ("Skill Match Rate:", "100% vs. PM Lite")],
+                       "Resource Manager / Squad Lead"),
+     'panels': [{'label': "SOW MANDATED SQUAD STRUCTURE RATIOS", 'visuals': [{'kind': 'cards', 'cards': [
+         {'value': "40%", 'title': "Senior / Lead", 'desc': "Architecture & Governance", 'tone': 'navy'},
+         {'value': "45%", 'title': "Core Developer", 'desc': "Execution Velocity", 'tone': 'blue'},
+         {'value': "15%", 'title': "Junior / Trainee", 'desc': "Support & Pipeline", 'tone': 'neutral'}]}]},
+                {'label': "THE SQUAD RAMP-UP & MOBILIZATION PLAN", 'grow': True, 'visuals': [{
+                    'kind': 'flow', 'style': 'node', 'steps': [
+                        {'icon': "1", 'title': "Demand Trigger", 'desc': "PM Lite Charter approved; skill profile sent to Resource Mgmt."},
+                        {'icon': "2", 'title': "Resource Mapping", 'desc': "Identify internal bench, shared support pool, or cross-skill options."},
+                        {'icon': "3", 'title': "Ratio Balancing", 'desc': "Apply 40:45:15 logic to ensure cost and delivery efficiency."},
+                        {'icon': "✓", 'title': "Onboarding", 'desc': "Access provisioning, KT, and integration into Agile ceremonies.", 'tone': 'success'}]}],
+                 'callouts': [{'text': "* Customer Gate: Customer must approve all final adjustments to Squad Team compositions (per SOW)."}]}],
+     'kicker': '"Maintaining strict structural ratios ensures we do not over-index on expensive resources for standard execution work."'},
+
+    {'file': 's4-1.html', 'page_title': "Pillar 4: Flex Hour Management",
+     'title': "Pillar 4: Flex Hour Management",
+     'subtitle': "Executing dynamic ramp-up/down to absorb demand fluctuations while optimizing cost",
+     'card': _sow_card('"Execute ramp-up/down to support demand fluctuations... Manage resource bench, rotation and re-skilling of resources."',
+                       [("Flex Activation SLA:", "< 48 Hours"), ("Core vs. Flex Ratio:", "80% / 20% Target"),
+                        ("Bench Utilization:", "> 85% Active")],
+                       "Operations Lead / Resource Manager"),
+     'panels': [{'label': "CORE VS. FLEX CAPACITY VISUALIZATION", 'grow': True, 'visuals': [{
+         'kind': 'bars', 'scale': 100,
+         'bars': [{'label': m, 'segments': [(50, "Core", 'navy')] + ([(flex, "+Flex", 'blue')] if flex else [])}
+                  for m, flex in [("Jan", 0), ("Feb", 25), ("Mar", 45), ("Apr", 15), ("May", 0)]],
+         'lines': [(85, "Total Business Demand (Forecasted)", 'warning')],
+         'legend': [('navy', "Baseline FTEs (Fixed)"), ('blue', "Flex Hours (Variable/Burst)"),
+                    ('warning', "Total Demand Curve")]}]},
+                {'label': "THE RESOURCE BENCH & ROTATION ENGINE", 'visuals': [{
+                    'kind': 'flow', 'style': 'card', 'steps': [
+                        {'icon': "👥", 'title': "Active Bench Management", 'desc': "Identify resources rotating off projects. Map to upcoming demand forecasts."},
+                        {'icon': "🔄", 'title': "Re-Skilling & Rotation", 'desc': "Upskill bench resources (e.g., Support to Squad) to match specific niche skill gaps."},
+                        {'icon': "⚡", 'title': "Flex Deployment", 'desc': "Rapidly deploy internal, cross-trained talent within 48 hours to handle spikes."}]}]}],
+     'kicker': "\"Flex capacity prevents the 'ratchet effect'—we scale up for peaks, but quickly scale down to protect the bottom line.\""},
+
+    {'file': 's5-1.html', 'page_title': "Pillar 5: Capacity & Utilization",
+     'title': "Pillar 5: Capacity & Utilization Reporting",
+     'subtitle': "Real-time tracking of squad-level bandwidth to optimize delivery and prevent burnout",
+     'card': _sow_card('"Monitor squad and tower-level utilization weekly and report back to CPChem... Identify over/under-utilized resources."',
+                       [("Utilization Target:", "80% - 85% Optimal"), ("Reporting Cadence:", "Weekly to CPChem"),
+                        ("Variance Action:", "< 48 Hrs to Rebalance")],
+                       "Resource Manager / Delivery Lead"),
+     'panels': [{'label': "TOWER & SQUAD LEVEL HEATMAP (WEEKLY VIEW)", 'grow': True, 'visuals': [{
+         'kind': 'bars', 'scale': 130,
+         'bars': [{'label': name, 'sub': status, 'tone': tone, 'segments': [(pct, f"{pct}%", tone)]}
+                  for name, pct, status, tone in [("Squad Alpha", 85, "Optimal", 'success'),
+                                                  ("Squad Beta", 115, "Over-Utilized", 'danger'),
+                                                  ("Core Ops", 82, "Optimal", 'success'),
+                                                  ("Support Group", 60, "Under-Utilized", 'warning')]],
+         'lines': [(85, "85% Target", 'success'), (100, "100% Max", 'danger')]}]},
+                {'label': "OVER/UNDER UTILIZATION ACTION WORKFLOW", 'visuals': [{
+                    'kind': 'flow', 'style': 'card', 'steps': [
+                        {'icon': "📊", 'title': "1. Identify Variance", 'desc': "Weekly dashboard flags Squad Beta (>100%) and Support (<70%)."},
+                        {'icon': "🔍", 'title': "2. Root Cause", 'desc': "Delivery Lead assesses if spike is temporary (sprint end) or structural."},
+                        {'icon': "⚖️", 'title': "3. Rebalance Work", 'desc': "Shift backlog items or temporarily assign Support resources to Squad Beta."},
+                        {'icon': "📝", 'title': "4. CPChem Report", 'desc': "Present findings and rebalancing actions in the weekly CPChem sync.", 'tone': 'success'}]}]}],
+     'kicker': '"We manage utilization proactively to ensure CPChem gets maximum ROI without compromising the quality of the deliverables."'},
+
+    {'file': 's6-1.html', 'page_title': "Pillar 6: Project Management",
+     'title': "Pillar 6: Project Management & Governance",
+     'subtitle': "Driving consistent execution through PMI best practices and rigorous SDLC governance",
+     'card': _sow_card('"Own/maintain the enterprise SDLC framework... Monitor all projects to ensure delivery on-time, on-budget in alignment with Appendix B-1... Drive continual improvement of estimates."',
+                       [("Schedule Perf. Index (SPI):", "≥ 0.95 (On-Time)"), ("Cost Perf. Index (CPI):", "≥ 0.95 (On-Budget)"),
+                        ("Estimate Variance:", "Target < 10% Error")],
+                       "PMO / Delivery Manager"),
+     'panels': [{'label': "ENTERPRISE SDLC GOVERNANCE FRAMEWORK", 'visuals': [
+         {'kind': 'callout', 'text': "PMI BEST PRACTICES & CPCHEM STANDARDS GOVERNANCE OVERLAY"}]},
+                {'label': "", 'bare': True, 'visuals': [{
+                    'kind': 'flow', 'style': 'card', 'steps': [
+                        {'title': "Initiation", 'desc': "Charter & RACI Approval\n(PM Lite Gate)"},
+                        {'title': "Planning", 'desc': "Dependencies & Schedule\n(Baselining)"},
+                        {'title': "Execution", 'desc': "Sprint Delivery & Risk\nMitigation"},
+                        {'title': "Closure", 'desc': "Retrospective & Benefit\nRealization"}]}]},
+                {'label': "PERFORMANCE TRACKING & DOUBLE-LOOP LEARNING", 'grow': True, 'visuals': [{
+                    'kind': 'cards', 'cards': [
+                        {'title': "Schedule Performance", 'value': "1.02 SPI", 'target': "Target: ≥ 0.95 (On-Time)"},
+                        {'title': "Cost Performance", 'value': "0.98 CPI", 'target': "Target: ≥ 0.95 (On-Budget)"},
+                        {'title': "Estimation Accuracy", 'value': "8.5% Var", 'target': "Target: < 10% Variance", 'tone': 'warning'}]}],
+                 'callouts': [{'text': "Continual Improvement Loop: Execution Data refines future Demand Estimates"}]}],
+     'kicker': "\"Governance is not just tracking status—it’s a closed-loop system where today's execution data improves tomorrow's estimates.\""},
+
+    {'file': 's7-1.html', 'page_title': "Pillar 7: Project Execution & SLAs",
+     'title': "Pillar 7: Project Execution & Delivery SLAs",
+     'subtitle': "Driving execution excellence through automated quality gates and rigorous SLA tracking",
+     'card': _sow_card('Execute sprint deliverables in strict adherence to the "Definition of Done" and defined IT Service Levels (SLAs).',
+                       [("Sprint Predictability:", "> 90%"), ("Defect Leakage (Prod):", "< 2%"),
+                        ("First Time Right (QA):", "> 95%"), ("Critical Defects:", "Zero at Go-Live")],
+                       "Technical Lead / QA Lead", header="SQUAD SLA METRICS & FOCUS AREA",
+                       activity_label="Key Execution Activity", metrics_label="Squad SLA Targets"),
+     'panels': [{'label': 'EXECUTION PIPELINE & "DEFINITION OF DONE" GATES', 'visuals': [{
+         'kind': 'flow', 'style': 'card', 'steps': [
+             {'title': "Development", 'desc': "Code & Unit Test\n(Peer Review)"},
+             {'title': "DoD", 'checkpoint': True, 'tone': 'blue'},
+             {'title': "QA / Testing", 'desc': "System & Integration\nTest (SIT)"},
+             {'title': "UAT", 'checkpoint': True},
+             {'title': "Release", 'desc': "Production Deploy\n& Benefit Realized", 'tone': 'success'}]}],
+         'note': "* Work cannot progress to the next stage unless the specific Quality Gate criteria are fully satisfied."},
+                {'label': "SQUAD PERFORMANCE DASHBOARD (SLA TRACKING)", 'grow': True, 'visuals': [{
+                    'kind': 'cards', 'cards': [
+                        {'title': "Say/Do Ratio", 'value': "94%", 'target': "Target: > 90%",
+                         'desc': "Measures Sprint predictability (Story Points committed vs. actually delivered).", 'tone': 'blue'},
+                        {'title': "First Time Right", 'value': "96%", 'target': "Target: > 95%",
+                         'desc': "Percentage of code that passes initial QA testing without requiring rework.", 'tone': 'success'},
+                        {'title': "Defect Leakage", 'value': "1.2%", 'target': "Target: < 2%",
+                         'desc': "Percentage of total defects that bypass QA and are found in UAT or Production.", 'tone': 'warning'}]}]}],
+     'kicker': '"High velocity is irrelevant without high quality. Our execution SLAs ensure that speed never compromises system stability."'},
+
+    {'file': 's-summary.html', 'page_title': "SquadOps Governance Matrix",
+     'title': "Operational Governance Matrix",
+     'subtitle': "Summary of Key Metrics, Roles, and Cadence for the SquadOps Framework",
+     'panels': [{'bare': True, 'visuals': [{
+         'kind': 'table',
+         'columns': ["Governance Pillar", "Objective", "Key Metric (SLA)", "Collection Phase", "RACI (Owner / Consulted)", "Frequency"],
+         'col_classes': ['key', '', 'metric', '', '', 'center'],
+         'rows': [[pillar, objective, metric, phase, [('teal', f"R: {owner}"), ('orange', f"C: {consulted}")], freq]
+                  for pillar, objective, metric, phase, owner, consulted, freq in [
+                      ("1. Demand Forecasting", "Predict rolling resource needs", "Forecast Accuracy (+/- 10%)", "Planning", "Portfolio Lead", "Customer", "Monthly"),
+                      ("2. Work Intake", "Validate & prioritize backlog", "Intake Cycle Time (< 5 Days)", "Analysis", "Demand Mgr", "Product Owner", "Weekly"),
+                      ("3. Squad Formation", "Right-sized staffing (Ratio)", "Time-to-Fill (< 5 Days)", "Initiation", "Resource Mgr", "Squad Lead", "Ad-Hoc"),
+                      ("4. Flex Mgmt", "Elastic scaling for peaks", "Flex vs Core Ratio (20:80)", "Execution", "Ops Lead", "Finance", "Weekly"),
+                      ("5. Capacity & Util.", "Monitor bandwidth efficiency", "Utilization % (Target 85%)", "Execution", "Delivery Lead", "PMO", "Weekly"),
+                      ("6. Project Gov.", "SDLC & PMI Compliance", "SPI / CPI (≥ 0.95)", "Monitoring", "PMO Lead", "Scrum Master", "Bi-Weekly"),
+                      ("7. Project Execution", "Deliver quality product", "Defect Leakage (< 2%)", "Closing", "Tech Lead", "QA Lead", "Per Sprint")]]}],
+         'note': '* "R" = Responsible (Who does the work), "C" = Consulted (Who provides input). All metrics are reported in the Monthly Business Review (MBR).'}],
+     'kicker': '"Accountability is key. This matrix defines exactly who owns the number, ensuring no metric goes unmanaged."'}
+]
+
+# ==========================================
+# 5. PER-SQUAD SLIDES FROM THE LIVE DASHBOARD FRAME
+# ==========================================
+RAG_TONES = {'Red': 'danger', 'Amber': 'warning', 'Green': 'success'}
+
+def slide_file_name(*parts, taken=None):
+    """('Data & AI', 'Squad Beta') -> squad-data-ai-squad-beta.html. Names already in `taken`
+    ('Data & AI' and 'Data AI' both map to data-ai) get a -2, -3 ... suffix; taken is updated."""
+    name = 'squad-' + re.sub(r'[^A-Za-z0-9]+', '-', '-'.join(parts)).strip('-').lower()
+    path, n = name + '.html', 1
+    while taken is not None and path in taken:
+        n += 1
+        path = f"{name}-{n}.html"
+    if taken is not None:
+        taken.add(path)
+    return path
+
+def _rag_tag(rag):
+    """Table cell tag for a RAG value; no tag for projects without a DB_Updates row"""
+    return [(RAG_TONES.get(rag), rag)] if isinstance(rag, str) else []
+
+def squad_slide_specs(df_dash):
+    """One slide spec per Portfolio/Team from the compile_dashboard_data frame"""
+    keys = ['Portfolio', 'Team']
+    sizes = df_dash.groupby(keys, sort=True, observed=True).size()
+    counts = {col: df_dash.groupby(keys + [col], observed=True).size().unstack(fill_value=0).to_dict('index')
+              for col in ['Status', 'Budget_Status']}
+    rows_by_group = {}
+    top = df_dash.groupby(keys, sort=False, observed=True).head(SQUAD_TABLE_ROWS)
+    cols = keys + ['Project', 'Goal', 'Status', 'Budget_Status', 'Narrative']
+    for portfolio, team, project, goal, rag, budget_rag, narrative in top[cols].itertuples(index=False):
+        rows_by_group.setdefault((portfolio, team), []).append(
+            [project, goal, _rag_tag(rag), _rag_tag(budget_rag),
+             narrative.split('\n')[0] if isinstance(narrative, str) else ''])
+
+    specs, taken = [], set()
+    for (portfolio, team), n in sizes.items():
+        status = counts['Status'].get((portfolio, team), {})  # Missing when no project in it has an update
+        budget = counts['Budget_Status'].get((portfolio, team), {})
+        rows = rows_by_group[(portfolio, team)]
+        more = n - len(rows)
+        specs.append({
+            'file': slide_file_name(portfolio, team, taken=taken),
+            'title': f"{team}: Delivery Snapshot",
+            'subtitle': f"{portfolio} portfolio • {n} active project{'s' if n != 1 else ''}",
+            'card': {'header': "SQUAD HEALTH METRICS", 'sections': [
+                {'label': "Portfolio", 'text': portfolio},
+                {'label': "Delivery Status", 'metrics': [(f"{rag}:", int(status.get(rag, 0))) for rag in RAG_TONES]},
+                {'label': "Budget Status", 'metrics': [(f"{rag}:", int(budget.get(rag, 0))) for rag in RAG_TONES]}],
+                'owner': ("Squad", team)},
+            'panels': [
+                {'label': "PROJECT STATUS MIX", 'visuals': [{
+                    'kind': 'bars', 'scale': n,
+                    'bars': [{'label': rag, 'tone': tone,
+                              'segments': [(int(status.get(rag, 0)), str(int(status.get(rag, 0))), tone)]}
+                             for rag, tone in RAG_TONES.items()]}]},
+                {'label': "PROJECT RAG REGISTER", 'grow': True, 'solid': True, 'visuals': [{
+                    'kind': 'table', 'rows': rows,
+                    'columns': ["Project", "Goal", "Status", "Budget", "Narrative"],
+                    'col_classes': ['key', '', 'center', 'center', '']}],
+                 'note': f"+{more} more project{'s' if more != 1 else ''} in the dashboard workbook" if more > 0 else None}],
+            'kicker': f"\"{int(status.get('Red', 0))} of {n} {team} projects are Red; budgets at risk: {int(budget.get('Amber', 0) + budget.get('Red', 0))}.\""
+        })
+    return specs
+
+def load_v4():
+    """Imports dashboard-3.py (hyphenated file name, so not a plain import)"""
+    spec = importlib.util.spec_from_file_location('dashboard_v4', os.path.join(HERE, 'dashboard-3.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# ==========================================
+# 6. DECK OUTPUT
+# ==========================================
+def render_deck(specs, output_dir=OUTPUT_DIR):
+    """Writes the shared stylesheet once and one HTML page per slide spec"""
+    t0 = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, STYLESHEET), 'w', encoding='utf-8') as f:
+        f.write(SLIDE_CSS)
+    paths = []
+    for spec in specs:
+        path = os.path.join(output_dir, spec['file'])
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(render_slide(spec))
+        paths.append(path)
+    print(f"✅ Rendered {len(specs)} slides → {output_dir}/ ({(time.perf_counter() - t0) * 1000:.0f} ms)")
+    return paths
+
+# ==========================================
+# 7. BUNDLE: hashed stylesheet, minified pages, single-page lazy deck
+# ==========================================
+T_BUNDLE = """<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0"><title>{page_title}</title>
+<link rel="stylesheet" href="{css_href}"></head><body class="deck">
+{first}{slots}
+<script>{script}</script></body></html>
+""".format
+DECK_CSS = """
+body.deck { display: block; height: auto; }
+.deck-slot { width: 1280px; height: 720px; margin: 0 auto 20px; }
+"""
+# Slides after the first live in inert <template>s and are stamped into their slot near the viewport
+LAZY_SCRIPT = ("const io=new IntersectionObserver(es=>es.forEach(e=>{if(!e.isIntersecting)return;"
+               "const s=e.target;s.replaceChildren(s.firstElementChild.content.cloneNode(true));io.unobserve(s);}),"
+               "{rootMargin:'720px'});document.querySelectorAll('.deck-slot[data-lazy]').forEach(s=>io.observe(s));")
+
+def minify_css(css):
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};:,>])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+def minify_html(markup):
+    """Drops indentation and line breaks between tags; inline spacing inside a line is kept"""
+    markup = re.sub(r'>\s*\n\s*<', '><', markup)
+    return re.sub(r'\n\s*', ' ', markup).strip()
+
+def site_css():
+    """Minified stylesheet shared by the slides, deck.html and dashboard.html"""
+    return minify_css(SLIDE_CSS + DECK_CSS + DASH_CSS)
+
+def write_hashed_css(css, output_dir):
+    """deck.<hash>.css: the name changes only when the content does, so it can be cached forever"""
+    name = f"deck.{hashlib.sha256(css.encode('utf-8')).hexdigest()[:10]}.css"
+    path = os.path.join(output_dir, name)
+    if not os.path.exists(path):
+        for stale in glob.glob(os.path.join(output_dir, 'deck.*.css')):
+            os.remove(stale)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(css)
+    return name
+
+def build_bundle(specs, output_dir=OUTPUT_DIR):
+    """Minified per-slide pages plus deck.html, all linking one hashed stylesheet"""
+    t0 = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    css_href = write_hashed_css(site_css(), output_dir)
+    slides = [minify_html(render_slide_markup(spec)) for spec in specs]
+    for spec, slide in zip(specs, slides):
+        page = T_PAGE(page_title=_t(spec.get('page_title', spec['title'])), css_href=css_href, slide=slide)
+        with open(os.path.join(output_dir, spec['file']), 'w', encoding='utf-8') as f:
+            f.write(minify_html(page))
+
+    first = f'<div class="deck-slot">{slides[0]}</div>' if slides else ''
+    slots = ''.join(f'<div class="deck-slot" data-lazy><template>{slide}</template></div>' for slide in slides[1:])
+    with open(os.path.join(output_dir, BUNDLE_FILE), 'w', encoding='utf-8') as f:
+        f.write(T_BUNDLE(page_title="SquadOps Governance Deck", css_href=css_href, first=first, slots=slots,
+                         script=LAZY_SCRIPT))
+    print(f"📦 Bundled {len(specs)} slides → {output_dir}/{BUNDLE_FILE} + {css_href} "
+          f"({(time.perf_counter() - t0) * 1000:.0f} ms)")
+    return css_href
+
+# ==========================================
+# 8. SIZE / FIRST-RENDER REPORT
+# ==========================================
+def _read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+def _elements(markup, lazy=True):
+    """Elements the parser builds; with lazy=True template content is skipped (inert until stamped)"""
+    if lazy:
+        markup = re.sub(r'<template>.*?</template>', '', markup, flags=re.S)
+    return len(re.findall(r'<(?!template)[a-zA-Z]', markup))
+
+def _nbytes(text):
+    return len(text.encode('utf-8'))
+
+def deck_stats(pages, css=''):
+    """pages: markup of the pages a reader opens, first slide first; css: the linked stylesheet"""
+    inline_css = sum(_nbytes(m) for page in pages for m in re.findall(r'<style>.*?</style>', page, flags=re.S))
+    return {'files': len(pages) + (1 if css else 0),
+            'total_bytes': sum(_nbytes(p) for p in pages) + _nbytes(css),
+            'first_render_bytes': (_nbytes(pages[0]) + _nbytes(css)) if pages else 0,
+            'first_render_elements': _elements(pages[0]) if pages else 0,
+            'elements': sum(_elements(p, lazy=False) for p in pages),
+            'css_bytes_downloaded': inline_css + _nbytes(css)}
+
+def report_bundle(specs, output_dir=OUTPUT_DIR, css_href=None):
+    """Bytes and first-render cost: hand-written pages vs rendered pages vs the bundle"""
+    rows = []
+    hand = [os.path.join(HERE, spec['file']) for spec in specs if os.path.exists(os.path.join(HERE, spec['file']))]
+    if hand:
+        rows.append(('hand-written s*.html', deck_stats([_read(p) for p in hand])))
+    rows.append(('rendered pages', deck_stats([render_slide(spec) for spec in specs], SLIDE_CSS)))
+    if css_href:
+        css = _read(os.path.join(output_dir, css_href))
+        rows.append(('minified pages', deck_stats([_read(os.path.join(output_dir, spec['file'])) for spec in specs], css)))
+        rows.append(('single-page bundle', deck_stats([_read(os.path.join(output_dir, BUNDLE_FILE))], css)))
+
+    print(f"{'build':<22} {'files':>6} {'total KB':>9} {'1st-render KB':>14} {'1st-render elems':>17} "
+          f"{'all elems':>10} {'CSS KB':>8}")
+    for label, st in rows:
+        print(f"{label:<22} {st['files']:>6} {st['total_bytes'] / 1024:>9.1f} {st['first_render_bytes'] / 1024:>14.1f} "
+              f"{st['first_render_elements']:>17} {st['elements']:>10} {st['css_bytes_downloaded'] / 1024:>8.1f}")
+    return rows
+
+# ==========================================
+# 9. LIVE PORTFOLIO DASHBOARD (df_dash as HTML)
+# ==========================================
+DASH_COLUMNS = ['Project', 'Portfolio', 'Team', 'Goal', 'Status', 'Budget_Status', 'Roadmap', 'Resources', 'Narrative']
+DASH_FILTERS = ['Portfolio', 'Team']
+DASH_CSS = """
+body.dash { display: block; height: auto; padding: 0; background-color: var(--mck-grey); }
+.dash-container { max-width: 1400px; margin: 0 auto; min-height: 100vh; background: var(--white); box-shadow: 0 0 20px rgba(0,0,0,0.1); }
+.dash-body { padding: 10px 50px 30px; display: flex; flex-direction: column; gap: 20px; }
+.filter-bar { display: flex; align-items: center; gap: 10px; font-size: 12px; font-weight: bold; color: var(--mck-navy); }
+.filter-bar select { font-size: 12px; padding: 4px 8px; margin-right: 15px; border: 1px solid #ccc; border-radius: 3px; }
+.dash-table td { vertical-align: top; }
+.pager { display: flex; justify-content: flex-end; align-items: center; gap: 10px; font-size: 11px; color: #666; }
+.pager button { border: 1px solid var(--mck-navy); background: white; color: var(--mck-navy); padding: 4px 12px; border-radius: 3px; cursor: pointer; }
+.pager button:disabled { opacity: 0.4; cursor: default; }
+"""
+
+T_DASHBOARD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <link rel="stylesheet" href="{css_href}">
+</head>
+<body class="dash">
+    <div class="dash-container">
+        <div class="header">
+            <h1>{title}</h1>
+            <div class="header-line"></div>
+            <h2>{subtitle}</h2>
+        </div>
+        <div class="dash-body">
+            <div class="cards">{kpis}</div>
+            <div class="filter-bar">{filters}</div>
+            <table class="dash-table"><thead><tr>{head}</tr></thead><tbody id="dash-rows"></tbody></table>
+            <div class="pager"><span id="pager-info"></span><button id="prev">&lsaquo; Prev</button><button id="next">Next &rsaquo;</button></div>
+        </div>
+    </div>
+    <script type="application/json" id="dash-data">{data}</script>
+    <script>{script}</script>
+</body>
+</html>
+""".format
+DASH_KPIS = [('k-total', "Projects", 'navy'), ('k-Red', "Red", 'danger'),
+             ('k-Amber', "Amber", 'warning'), ('k-Green', "Green", 'success')]
+
+# Filters intersect the precomputed row-id lists; only one page of rows is ever in the DOM
+DASH_SCRIPT = """
+const D = JSON.parse(document.getElementById('dash-data').textContent);
+const $ = id => document.getElementById(id);
+const TONES = {Red: 'danger', Amber: 'warning', Green: 'success'};
+const STATUS = D.columns.indexOf('Status'), TAGGED = new Set([STATUS, D.columns.indexOf('Budget_Status')]);
+const ALL = D.rows.map((_, i) => i);
+let ids = ALL, page = 0;
+for (const f of D.filters) Object.keys(D.index[f]).forEach(k => $('f-' + f).add(new Option(k, k)));
+const cell = (v, j) => TAGGED.has(j) ? `<td class="col-center"><span class="tag tone-${TONES[v] || 'neutral'}">${v}</span></td>`
+                                     : (j === 0 ? `<td class="col-key">${v}</td>` : `<td>${v}</td>`);
+function apply() {
+    const lists = D.filters.map(f => $('f-' + f).value && D.index[f][$('f-' + f).value]).filter(Boolean);
+    if (!lists.length) { ids = ALL; }
+    else {
+        lists.sort((a, b) => a.length - b.length);
+        const rest = lists.slice(1).map(l => new Set(l));
+        ids = lists[0].filter(i => rest.every(s => s.has(i)));
+    }
+    page = 0; render();
+}
+function render() {
+    const n = ids.length, pages = Math.max(1, Math.ceil(n / D.page_size));
+    page = Math.min(page, pages - 1);
+    $('dash-rows').innerHTML = ids.slice(page * D.page_size, (page + 1) * D.page_size)
+        .map(i => '<tr>' + D.rows[i].map(cell).join('') + '</tr>').join('');
+    const counts = {Red: 0, Amber: 0, Green: 0};
+    for (const i of ids) counts[D.rows[i][STATUS]] = (counts[D.rows[i][STATUS]] || 0) + 1;
+    $('k-total').textContent = n;
+    for (const rag in TONES) $('k-' + rag).textContent = counts[rag];
+    $('pager-info').textContent = n ? `${page * D.page_size + 1}-${Math.min(n, (page + 1) * D.page_size)} of ${n}` : 'No projects';
+    $('prev').disabled = page === 0; $('next').disabled = page >= pages - 1;
+}
+D.filters.forEach(f => $('f-' + f).addEventListener('change', apply));
+$('prev').addEventListener('click', () => { page--; render(); });
+$('next').addEventListener('click', () => { page++; render(); });
+render();
+"""
+
+def dashboard_payload(df_dash):
+    """Pre-escaped rows plus {filter column: {value: [row positions]}} for client-side filtering"""
+    rows = df_dash[DASH_COLUMNS].reset_index(drop=True)
+    index = {col: {str(k): v.tolist() for k, v in rows.groupby(col, sort=True, observed=True).indices.items()}
+             for col in DASH_FILTERS}
+    cells = rows.astype(object).where(rows.notna(), '')  # blank cells, not "nan"
+    return {'columns': DASH_COLUMNS, 'filters': DASH_FILTERS, 'page_size': DASH_PAGE_SIZE, 'index': index,
+            'rows': [[_t(v) for v in rec] for rec in cells.itertuples(index=False)]}
+
+def render_dashboard(df_dash, total_budget=None, total_spent=None, css_href=STYLESHEET):
+    payload = json.dumps(dashboard_payload(df_dash), ensure_ascii=False, separators=(',', ':'))
+    subtitle = f"{len(df_dash):,} projects"
+    if total_budget is not None:
+        subtitle += f" • Budget ${total_budget:,.0f} • Spent ${total_spent:,.0f}"
+    return T_DASHBOARD(
+        title="Portfolio Executive Dashboard", subtitle=_t(subtitle), css_href=css_href,
+        kpis=''.join(T_CARD_TILE(tone=_tone(tone), icon='', title=_t(label), desc='', target='',
+                                 value=f'<div class="card-value" id="{kid}">0</div>') for kid, label, tone in DASH_KPIS),
+        filters=''.join(f'{_t(f)} <select id="f-{f}"><option value="">All</option></select>' for f in DASH_FILTERS),
+        head=''.join(f'<th>{_t(c.replace("_", " "))}</th>' for c in DASH_COLUMNS),
+        data=payload.replace('</', '<\\/'), script=DASH_SCRIPT)
+
+def build_dashboard(df_dash, total_budget=None, total_spent=None, output_dir=OUTPUT_DIR):
+    """dashboard.html linking the shared hashed stylesheet"""
+    t0 = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    css_href = write_hashed_css(site_css(), output_dir)
+    path = os.path.join(output_dir, DASHBOARD_FILE)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(render_dashboard(df_dash, total_budget, total_spent, css_href))
+    print(f"📊 Dashboard: {len(df_dash):,} projects → {path} ({os.path.getsize(path) / 1024:.0f} KB, "
+          f"{(time.perf_counter() - t0) * 1000:.0f} ms)")
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the SquadOps HTML slide deck")
+    parser.add_argument('--out', default=OUTPUT_DIR, help="Output directory")
+    parser.add_argument('--squads', action='store_true', help="Add one slide per Portfolio/Team from the live dashboard frame")
+    parser.add_argument('--source', help="Tables for --squads/--dashboard: CSV directory, Parquet directory or workbook (default: synthetic data)")
+    parser.add_argument('--bundle', action='store_true', help="Minified pages + hashed stylesheet + single-page deck.html, with a size report")
+    parser.add_argument('--dashboard', action='store_true', help="Also write dashboard.html from the live dashboard frame")
+    args = parser.parse_args()
+
+    specs = list(SLIDES)
+    if args.squads or args.dashboard:
+        v4 = load_v4()
+        dfs = v4.load_database_v4(args.source) if args.source else v4.create_database_v4()
+        df_dash, total_budget, total_spent = v4.compile_dashboard_data(dfs)
+        if args.squads:
+            specs += squad_slide_specs(df_dash)
+        if args.dashboard:
+            build_dashboard(df_dash, total_budget, total_spent, args.out)
+    if args.bundle:
+        report_bundle(specs, args.out, build_bundle(specs, args.out))
+    else:
+        render_deck(specs, args.out)
@@ -1,3 +1,4 @@
+import copy
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN
@@ -11,84 +12,174 @@ MCK_CARD_BG = RGBColor(242, 242, 242)
 WHITE = RGBColor(255, 255, 255)
 DARK_TEXT = RGBColor(64, 64, 64)
 
-def create_sow_slide():
+# --- SLIDE SPECS ---
+# One dict per slide: header, metric card, phase map and kicker
+DEFAULT_PHASES = [
+    {"name": "Continuous / BAU", "data": "Historical Ticket Trends\n& Workload Data"},
+    {"name": "Strategic Planning", "data": "Roadmap Review\n& Project Pipeline"},
+    {"name": "Project Initiation", "data": "30/60/90 Day\nRolling Forecast"}
+]
+
+PILLAR1_SPEC = {
+    # The SOW emphasizes establishing workload trends and rolling forecasts
+    "title": "Pillar 1: Demand Forecasting",
+    "subtitle": "Predictive 30/60/90-day forecasts drive skill readiness vs. reactive hiring.",
+    # SOW Ref: "Collect and maintain historical data... predict 30/60/90/180 day rolling forecast"
+    "focus": "Trend Analysis & Roadmap Review",
+    "metrics": ["• 30/60/90/180 Day Rolling Forecast",
+                "• Ticket Trend Volume (BAU)",
+                "• Skill-wise Gap Analysis"],
+    "role": "Supplier Portfolio Lead",
+    # "Map on what phases of project this data will be collected"
+    "phase_title": "Data Collection Phase Map (Aligned to SDLC)",
+    "phases": DEFAULT_PHASES,
+    "phase_note": "* Historical data establishes baseline; Roadmap review predicts peaks.",
+    "kicker": "Data-driven forecasting ensures the right skills are available before the project kick-off."
+}
+
+def new_presentation():
     prs = Presentation()
     prs.slide_width = Inches(13.33)
     prs.slide_height = Inches(7.5)
-    
+    return prs
+
+def render_slide(prs, spec, styles=None):
+    """styles: shape cache shared by the slides of one deck (see _styled)"""
     slide = prs.slides.add_slide(prs.slide_layouts[6]) # Blank Layout
 
-    # 1. ACTION TITLE & HEADER (SOW Summary)
-    # The SOW emphasizes establishing workload trends and rolling forecasts
-    draw_header(slide, 
-                "Pillar 1: Demand Forecasting", 
-                "Predictive 30/60/90-day forecasts drive skill readiness vs. reactive hiring.")
+    # 1. ACTION TITLE & HEADER
+    draw_header(slide, spec["title"], spec["subtitle"], styles)
 
-    # 2. LEFT COLUMN: METRICS CARD (SOW Specifics)
-    # SOW Ref: "Collect and maintain historical data... predict 30/60/90/180 day rolling forecast"
-    draw_metric_card(slide, 
-                     focus="Trend Analysis & Roadmap Review", 
-                     metrics=["• 30/60/90/180 Day Rolling Forecast", 
-                              "• Ticket Trend Volume (BAU)", 
-                              "• Skill-wise Gap Analysis"],
-                     role="Supplier Portfolio Lead")
+    # 2. LEFT COLUMN: METRICS CARD
+    draw_metric_card(slide, focus=spec["focus"], metrics=spec["metrics"], role=spec["role"], styles=styles)
 
     # 3. RIGHT COLUMN: PHASE MAP VISUAL
-    # "Map on what phases of project this data will be collected"
-    # We map the SOW inputs (Historical Data, Roadmap, Forecast) to phases.
-    draw_phase_map(slide)
+    draw_phase_map(slide, spec.get("phases", DEFAULT_PHASES),
+                   spec.get("phase_title", PILLAR1_SPEC["phase_title"]), spec.get("phase_note", PILLAR1_SPEC["phase_note"]), styles)
 
     # 4. KICKER
-    draw_kicker(slide, "Data-driven forecasting ensures the right skills are available before the project kick-off.")
+    draw_kicker(slide, spec["kicker"], styles)
+    return slide
+
+def build_deck(specs, output_file):
+    """Renders every slide spec into one Presentation and saves it once"""
+    prs = new_presentation()
+    styles = {}  # Per deck: nothing carries over between build_deck calls
+    for spec in specs:
+        render_slide(prs, spec, styles)
+    prs.save(output_file)
+    print(f"Deck Generated: {output_file} ({len(specs)} slides)")
+    return prs
+
+def create_sow_slide():
+    build_deck([PILLAR1_SPEC], 'Pillar1_SOW_Aligned.pptx')
+
+# --- PORTFOLIO SLIDES FROM THE LIVE DASHBOARD FRAME ---
+RAG_ORDER = ["Green", "Amber", "Red"]
+PHASE_SLOTS = 3  # Chevrons that fit across the slide
+
+def portfolio_slide_specs(df_dash):
+    """One spec per Portfolio from the compile_dashboard_data frame; the phase map shows its largest teams"""
+    status = df_dash.groupby(["Portfolio", "Status"], observed=True).size().unstack(fill_value=0)
+    budget = df_dash.groupby(["Portfolio", "Budget_Status"], observed=True).size().unstack(fill_value=0)
+    teams = df_dash.groupby(["Portfolio", "Team", "Status"], observed=True).size().unstack(fill_value=0)
+    specs = []
+    for portfolio, counts in status.iterrows():
+        n = int(counts.sum())
+        at_risk = int(budget.loc[portfolio].drop("Green", errors="ignore").sum())
+        top = teams.loc[portfolio].assign(n=lambda t: t.sum(axis=1)).nlargest(PHASE_SLOTS, "n")
+        specs.append({
+            "title": f"{portfolio}: Portfolio Health",
+            "subtitle": f"{n} active projects • {int(counts.get('Red', 0))} Red • {at_risk} budgets at risk",
+            "focus": "Delivery & Budget RAG",
+            "metrics": [f"• {rag}: {int(counts.get(rag, 0))} projects" for rag in RAG_ORDER],
+            "role": f"{portfolio} Portfolio Lead",
+            "phase_title": "Largest Teams: Delivery Status",
+            "phases": [{"name": str(team), "data": f"{int(row['n'])} projects\n"
+                        + " / ".join(f"{int(row.get(rag, 0))} {rag}" for rag in RAG_ORDER)}
+                       for team, row in top.iterrows()],
+            "phase_note": "* Full RAG register per project in the dashboard workbook.",
+            "kicker": f"{int(counts.get('Red', 0))} of {n} {portfolio} projects need intervention this cycle."
+        })
+    return specs
+
+# --- SHARED SHAPE STYLES ---
+# Within one deck each styled shape is built through the API once; later slides get a
+# copy of its XML (fill, line, fonts included) and only have their text / position set.
+# python-pptx has no shape-copy call, so this goes through the public .element proxies
+# (the shape's <p:sp> and the slide's <p:spTree>) with plain lxml, and gives the copy
+# the next free shape id on the slide as add_shape would.
+def _styled(slide, key, build, styles=None):
+    if styles is None:
+        return build(slide)
+    proto = styles.get(key)
+    if proto is None:
+        shape = build(slide)
+        styles[key] = copy.deepcopy(shape.element)
+        return shape
+    tree = slide.shapes.element
+    el = copy.deepcopy(proto)
+    el.xpath('./p:nvSpPr/p:cNvPr')[0].set('id', str(max(map(int, tree.xpath('//p:cNvPr/@id')), default=0) + 1))
+    ext = tree.xpath('./p:extLst')
+    if ext:
+        ext[0].addprevious(el)  # extLst stays the last child
+    else:
+        tree.append(el)
+    return slide.shapes[-1]
 
-    prs.save('Pillar1_SOW_Aligned.pptx')
-    print("Slide Generated: Pillar1_SOW_Aligned.pptx")
+def _set_lines(tf, lines):
+    """First paragraph keeps its formatting; the rest become plain paragraphs"""
+    tf.clear()  # drops all but the first paragraph, whose paragraph properties survive
+    tf.paragraphs[0].text = lines[0]
+    for line in lines[1:]:
+        tf.add_paragraph().text = line
 
 # --- DRAWING FUNCTIONS ---
 
-def draw_header(slide, title, sub):
+def draw_header(slide, title, sub, styles=None):
     # Main Title
+    tb = _styled(slide, "title", _build_title, styles)
+    tb.text_frame.paragraphs[0].text = title
+    
+    # Blue Separator
+    _styled(slide, "separator", _build_separator, styles)
+    
+    # Subtitle (Summary from SOW)
+    tb_sub = _styled(slide, "subtitle", _build_subtitle, styles)
+    tb_sub.text_frame.paragraphs[0].text = sub
+
+def _build_title(slide):
     tb = slide.shapes.add_textbox(Inches(0.5), Inches(0.4), Inches(12), Inches(0.6))
     p = tb.text_frame.paragraphs[0]
-    p.text = title
     p.font.name = "Arial"
     p.font.size = Pt(28)
     p.font.bold = True
     p.font.color.rgb = MCK_NAVY
-    
-    # Blue Separator
+    return tb
+
+def _build_separator(slide):
     line = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(0.5), Inches(1.1), Inches(12.33), Inches(0.03))
     line.fill.solid()
     line.fill.fore_color.rgb = MCK_BLUE
     line.line.fill.background()
-    
-    # Subtitle (Summary from SOW)
+    return line
+
+def _build_subtitle(slide):
     tb_sub = slide.shapes.add_textbox(Inches(0.5), Inches(1.2), Inches(12), Inches(0.5))
     p_sub = tb_sub.text_frame.paragraphs[0]
-    p_sub.text = sub
     p_sub.font.name = "Arial"
     p_sub.font.size = Pt(16)
     p_sub.font.color.rgb = MCK_NAVY
+    return tb_sub
 
-def draw_metric_card(slide, focus, metrics, role):
+def draw_metric_card(slide, focus, metrics, role, styles=None):
     # Dark Header
-    header = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(0.5), Inches(2.2), Inches(3.5), Inches(0.6))
-    header.fill.solid()
-    header.fill.fore_color.rgb = MCK_NAVY
-    header.line.color.rgb = MCK_NAVY
-    header.text_frame.text = "Focus Area / SOW Metrics"
-    header.text_frame.paragraphs[0].font.color.rgb = WHITE
-    header.text_frame.paragraphs[0].font.bold = True
+    _styled(slide, "card_header", _build_card_header, styles)
     
     # Light Body
-    body = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(0.5), Inches(2.8), Inches(3.5), Inches(3.5))
-    body.fill.solid()
-    body.fill.fore_color.rgb = MCK_CARD_BG
-    body.line.color.rgb = MCK_CARD_BG
-    
+    body = _styled(slide, "card_body", _build_card_body, styles)
     tf = body.text_frame
-    tf.margin_left = Inches(0.2)
-    tf.margin_top = Inches(0.2)
+    tf.clear()
     
     # Content
     add_text(tf, "KEY ACTIVITY:", focus, True)
@@ -112,6 +203,25 @@ def draw_metric_card(slide, focus, metrics, role):
 
     add_text(tf, "PRIMARY OWNER:", role, True)
 
+def _build_card_header(slide):
+    header = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(0.5), Inches(2.2), Inches(3.5), Inches(0.6))
+    header.fill.solid()
+    header.fill.fore_color.rgb = MCK_NAVY
+    header.line.color.rgb = MCK_NAVY
+    header.text_frame.text = "Focus Area / SOW Metrics"
+    header.text_frame.paragraphs[0].font.color.rgb = WHITE
+    header.text_frame.paragraphs[0].font.bold = True
+    return header
+
+def _build_card_body(slide):
+    body = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(0.5), Inches(2.8), Inches(3.5), Inches(3.5))
+    body.fill.solid()
+    body.fill.fore_color.rgb = MCK_CARD_BG
+    body.line.color.rgb = MCK_CARD_BG
+    body.text_frame.margin_left = Inches(0.2)
+    body.text_frame.margin_top = Inches(0.2)
+    return body
+
 def add_text(tf, label, value, bold_label=False):
     p = tf.add_paragraph()
     p.text = label
@@ -125,65 +235,81 @@ def add_text(tf, label, value, bold_label=False):
     p2.font.color.rgb = DARK_TEXT
     p2.space_after = Pt(14)
 
-def draw_phase_map(slide):
+def draw_phase_map(slide, phases=DEFAULT_PHASES, title=PILLAR1_SPEC["phase_title"], note=PILLAR1_SPEC["phase_note"], styles=None):
     # Header for the Visual
-    lbl = slide.shapes.add_textbox(Inches(4.5), Inches(1.8), Inches(6), Inches(0.5))
-    lbl.text_frame.text = "Data Collection Phase Map (Aligned to SDLC)"
-    lbl.text_frame.paragraphs[0].font.bold = True
-    lbl.text_frame.paragraphs[0].font.color.rgb = MCK_NAVY
-    lbl.text_frame.paragraphs[0].font.size = Pt(14)
+    lbl = _styled(slide, "phase_title", _build_phase_title, styles)
+    lbl.text_frame.paragraphs[0].text = title
 
-    # 3 Phases: Continuous -> Planning -> Initiation
-    phases = [
-        {"name": "Continuous / BAU", "data": "Historical Ticket Trends\n& Workload Data"},
-        {"name": "Strategic Planning", "data": "Roadmap Review\n& Project Pipeline"},
-        {"name": "Project Initiation", "data": "30/60/90 Day\nRolling Forecast"}
-    ]
-    
+    # Phases, e.g. Continuous -> Planning -> Initiation
     left_x = Inches(4.5)
     top_y = Inches(2.5)
     
     for i, phase in enumerate(phases):
         # Draw Chevron or Arrow Box
-        shape = slide.shapes.add_shape(MSO_SHAPE.CHEVRON, left_x, top_y, Inches(2.6), Inches(3.0))
-        shape.fill.solid()
-        shape.fill.fore_color.rgb = MCK_BLUE
-        shape.line.color.rgb = WHITE
-        shape.line.width = Pt(2)
+        shape = _styled(slide, "chevron", _build_chevron, styles)
+        shape.left = left_x
         
         # Phase Title (Top of Chevron)
-        tf = shape.text_frame
-        tf.text = phase["name"] + "\n\n\n" + phase["data"]
-        tf.paragraphs[0].font.bold = True
-        tf.paragraphs[0].font.size = Pt(12)
-        tf.paragraphs[0].alignment = PP_ALIGN.CENTER
+        _set_lines(shape.text_frame, [phase["name"], "", ""] + phase["data"].split("\n"))
         
         # Arrow Connector (if not last)
-        if i < 2:
-            conn = slide.shapes.add_shape(MSO_SHAPE.RIGHT_ARROW, left_x + Inches(2.4), top_y + Inches(1.4), Inches(0.5), Inches(0.2))
-            conn.fill.solid()
-            conn.fill.fore_color.rgb = MCK_NAVY
+        if i < len(phases) - 1:
+            conn = _styled(slide, "arrow", _build_arrow, styles)
+            conn.left = left_x + Inches(2.4)
             
         left_x += Inches(2.9)
     
     # Legend/Note
+    lbl_note = _styled(slide, "phase_note", _build_phase_note, styles)
+    lbl_note.text_frame.paragraphs[0].text = note
+
+def _build_phase_title(slide):
+    lbl = slide.shapes.add_textbox(Inches(4.5), Inches(1.8), Inches(6), Inches(0.5))
+    lbl.text_frame.paragraphs[0].font.bold = True
+    lbl.text_frame.paragraphs[0].font.color.rgb = MCK_NAVY
+    lbl.text_frame.paragraphs[0].font.size = Pt(14)
+    return lbl
+
+def _build_chevron(slide):
+    shape = slide.shapes.add_shape(MSO_SHAPE.CHEVRON, Inches(4.5), Inches(2.5), Inches(2.6), Inches(3.0))
+    shape.fill.solid()
+    shape.fill.fore_color.rgb = MCK_BLUE
+    shape.line.color.rgb = WHITE
+    shape.line.width = Pt(2)
+    tf = shape.text_frame
+    tf.paragraphs[0].font.bold = True
+    tf.paragraphs[0].font.size = Pt(12)
+    tf.paragraphs[0].alignment = PP_ALIGN.CENTER
+    return shape
+
+def _build_arrow(slide):
+    conn = slide.shapes.add_shape(MSO_SHAPE.RIGHT_ARROW, Inches(6.9), Inches(3.9), Inches(0.5), Inches(0.2))
+    conn.fill.solid()
+    conn.fill.fore_color.rgb = MCK_NAVY
+    return conn
+
+def _build_phase_note(slide):
     note = slide.shapes.add_textbox(Inches(4.5), Inches(5.8), Inches(8), Inches(0.5))
-    note.text_frame.text = "* Historical data establishes baseline; Roadmap review predicts peaks."
     note.text_frame.paragraphs[0].font.size = Pt(10)
     note.text_frame.paragraphs[0].font.italic = True
+    return note
+
+def draw_kicker(slide, text, styles=None):
+    box = _styled(slide, "kicker", _build_kicker, styles)
+    box.text_frame.paragraphs[0].text = text
 
-def draw_kicker(slide, text):
+def _build_kicker(slide):
     box = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(0), Inches(6.8), Inches(13.33), Inches(0.7))
     box.fill.solid()
     box.fill.fore_color.rgb = MCK_CARD_BG
     box.line.fill.background()
     
     kp = box.text_frame.paragraphs[0]
-    kp.text = text
     kp.font.size = Pt(14)
     kp.font.italic = True
     kp.font.color.rgb = MCK_NAVY
     kp.alignment = PP_ALIGN.CENTER
+    return box
 
 if __name__ == "__main__":
     create_sow_slide()
\ No newline at end of file